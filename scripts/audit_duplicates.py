@@ -0,0 +1,82 @@
+"""Audit puzzle caches for duplicate puzzles within and across books.
+
+Fingerprints every puzzle under books/*/output/puzzles and the portfolio
+directories (transposed grids count as the same puzzle) and reports puzzles
+that appear in more than one book, or more than once in the same file.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.puzzle_generation import DuplicateIndex
+from src.puzzle_generation.corpus import read_puzzle_file
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+BOOK_ROOTS = [Path("books"), Path("portfolio/in_progress"), Path("portfolio/published")]
+
+
+def find_book_puzzle_files(roots):
+    """Yield (book, path) for every puzzle cache below the book roots."""
+    for root in roots:
+        if not root.exists():
+            continue
+        for book_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+            for path in sorted(book_dir.rglob("*.json*")):
+                if path.suffix not in (".json", ".jsonl"):
+                    continue
+                if "puzzles" not in path.parts or ".stats" in path.suffixes:
+                    continue
+                yield book_dir.name, path
+
+
+def main():
+    """Fingerprint all book puzzles and print the duplicates found."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("roots", nargs="*", type=Path, default=BOOK_ROOTS)
+    parser.add_argument(
+        "--index",
+        default=":memory:",
+        help="SQLite file to keep the fingerprint index in (default: memory)",
+    )
+    args = parser.parse_args()
+
+    total = 0
+    with DuplicateIndex(args.index) as index:
+        for book, path in find_book_puzzle_files(args.roots):
+            puzzles = list(read_puzzle_file(path))
+            index.record(puzzles, book=book, source=str(path))
+            total += len(puzzles)
+
+        issues = []
+        for group in index.duplicates():
+            books = {book for book, _ in group.occurrences}
+            sources = [source for _, source in group.occurrences]
+            if len(books) > 1 or len(sources) != len(set(sources)):
+                issues.append(group)
+
+    print("=" * 70)
+    print("PUZZLE DUPLICATE AUDIT")
+    print("=" * 70)
+    print(f"Puzzles scanned: {total}")
+    print(f"Distinct puzzles: {len(index)}")
+
+    if issues:
+        print(f"\n⚠️ {len(issues)} DUPLICATED PUZZLES:")
+        for group in issues:
+            print(f"  {group.fingerprint}")
+            for book, source in group.occurrences:
+                print(f"    - {book}: {source}")
+        sys.exit(1)
+
+    print("\n✓ No duplicate puzzles found!")
+
+
+if __name__ == "__main__":
+    main()
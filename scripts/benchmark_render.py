@@ -0,0 +1,173 @@
+"""Benchmark grid rendering for a book's worth of puzzles.
+
+Renders every puzzle twice (puzzle page and solution page), as a book does,
+once with clues looked up by scanning the run lists per black cell (the old
+renderer) and once with the puzzle's cached clue map (the current renderer).
+Clue lookups are also timed on their own, since drawing dominates the total.
+The size of the written book is reported for the chosen render mode.
+
+Examples:
+    python scripts/benchmark_render.py
+    python scripts/benchmark_render.py --count 250 --repeat 5 caches/*.json
+    python scripts/benchmark_render.py --render-mode forms
+"""
+
+import argparse
+import gc
+import io
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass, replace
+from itertools import cycle, islice
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen.canvas import Canvas
+
+from src.pdf_generation.fonts import get_font_name, register_fonts
+from src.pdf_generation.models import RENDER_MODES, RenderConfig
+from src.pdf_generation.renderer import render_grid
+from src.puzzle_generation.corpus import read_puzzle_file
+from src.puzzle_generation.models import Puzzle
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOURCES = sorted(Path("books/master-kakuro/output/puzzles").glob("*.json"))
+
+
+class ScanLayout:
+    """Clue lookups by scanning the run lists, as the renderer used to."""
+
+    def __init__(self, puzzle: Puzzle):
+        self.puzzle = puzzle
+
+    def clues(self, row: int, col: int):
+        across = next(
+            (
+                run.total
+                for run in self.puzzle.horizontal_runs
+                if run.row == row and run.col == col + 1
+            ),
+            None,
+        )
+        down = next(
+            (
+                run.total
+                for run in self.puzzle.vertical_runs
+                if run.col == col and run.row == row + 1
+            ),
+            None,
+        )
+        return across, down
+
+
+@dataclass
+class ScanPuzzle:
+    """Puzzle stand-in that hands render_grid a scanning layout."""
+
+    grid: object
+    layout: ScanLayout
+
+
+def render_book(puzzles, config: RenderConfig, solution_config: RenderConfig):
+    """
+    Render each puzzle and its solution on its own page.
+
+    Returns:
+        (seconds spent drawing, size of the saved PDF in bytes)
+    """
+    output = io.BytesIO()
+    canvas = Canvas(output, pagesize=letter)
+    gc.collect()
+    start = time.perf_counter()
+    for puzzle in puzzles:
+        for page_config in (config, solution_config):
+            render_grid(canvas, puzzle, 72, 720, page_config)
+            canvas.showPage()
+    elapsed = time.perf_counter() - start
+    canvas.save()
+    return elapsed, len(output.getvalue())
+
+
+def look_up_clues(puzzles):
+    """Resolve the clues of every black cell twice per puzzle; return seconds."""
+    gc.collect()
+    start = time.perf_counter()
+    for puzzle in puzzles:
+        grid, layout = puzzle.grid, puzzle.layout
+        for _ in range(2):
+            for row in range(grid.height):
+                for col in range(grid.width):
+                    if grid.is_black(row, col):
+                        layout.clues(row, col)
+    return time.perf_counter() - start
+
+
+def main():
+    """Time both clue lookup strategies and report the change."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("sources", nargs="*", type=Path, default=DEFAULT_SOURCES)
+    parser.add_argument("--count", type=int, default=250, help="Puzzles per book")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs (best)")
+    parser.add_argument(
+        "--render-mode", choices=RENDER_MODES, default="cells", help="Cell drawing"
+    )
+    args = parser.parse_args()
+
+    data = []
+    for source in args.sources:
+        data.extend(puzzle.to_dict() for puzzle in read_puzzle_file(source))
+    if not data:
+        logger.error("No puzzles found")
+        sys.exit(1)
+    data = list(islice(cycle(data), args.count))
+
+    register_fonts()
+    config = RenderConfig(font_name=get_font_name(), render_mode=args.render_mode)
+    solution_config = replace(config, show_solution=True)
+
+    def fresh():
+        # New puzzles each run so building the clue maps is part of the time
+        puzzles = [Puzzle.from_dict(entry) for entry in data]
+        return {
+            "scan": [ScanPuzzle(p.grid, ScanLayout(p)) for p in puzzles],
+            "clue_map": puzzles,
+        }
+
+    render = {"scan": [], "clue_map": []}
+    lookup = {"scan": [], "clue_map": []}
+    for run in range(args.repeat):
+        # Alternate the order so neither strategy always runs warm
+        order = ["scan", "clue_map"] if run % 2 == 0 else ["clue_map", "scan"]
+        for name in order:
+            lookup[name].append(look_up_clues(fresh()[name]))
+        for name in order:
+            seconds, pdf_bytes = render_book(fresh()[name], config, solution_config)
+            render[name].append(seconds)
+
+    report = {
+        "puzzles": len(data),
+        "pages": 2 * len(data),
+        "render_mode": args.render_mode,
+        "pdf_bytes": pdf_bytes,
+    }
+    for label, timings in (("lookup", lookup), ("render", render)):
+        before, after = min(timings["scan"]), min(timings["clue_map"])
+        report[label] = {
+            "scan_seconds": round(before, 4),
+            "clue_map_seconds": round(after, 4),
+            "speedup": round(before / after, 2),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Convert puzzle caches between JSON and the packed binary format.
+
+Examples:
+    python scripts/convert_puzzle_cache.py to-packed corpus.kkpz caches/*.json
+    python scripts/convert_puzzle_cache.py to-json corpus.kkpz corpus.json
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.puzzle_generation.packed import json_to_packed, packed_to_json
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Run the requested conversion."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    to_packed = subparsers.add_parser("to-packed", help="JSON caches to packed file")
+    to_packed.add_argument("output", type=Path)
+    to_packed.add_argument("sources", nargs="+", type=Path)
+
+    to_json = subparsers.add_parser("to-json", help="Packed file to a JSON cache")
+    to_json.add_argument("packed", type=Path)
+    to_json.add_argument("output", type=Path)
+
+    args = parser.parse_args()
+
+    if args.command == "to-packed":
+        count = json_to_packed(args.sources, args.output)
+        logger.info(f"Wrote {count} puzzles to {args.output}")
+    else:
+        count = packed_to_json(args.packed, args.output)
+        logger.info(f"Wrote {count} puzzles to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Import cached puzzle files into the SQLite puzzle corpus.
+
+Scans the JSON caches and store journals under the known puzzle directories,
+scores each puzzle and inserts it into the corpus, then prints an indexed
+summary by difficulty and size. Puzzles found under books/<book>/ are also
+recorded as used by that book.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.puzzle_generation import PuzzleCorpus
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB = Path("data/puzzle_corpus.db")
+DEFAULT_SOURCES = [
+    Path("books"),
+    Path("data/puzzle_cache"),
+    Path("output/puzzles"),
+]
+
+
+def find_cache_files(sources):
+    """Yield puzzle cache files (JSON lists and JSONL journals) under sources."""
+    for source in sources:
+        if source.is_file():
+            yield source
+            continue
+        if not source.exists():
+            continue
+        for path in sorted(source.rglob("*.json*")):
+            if path.suffix not in (".json", ".jsonl") or ".stats" in path.suffixes:
+                continue
+            if path.suffix == ".json" and "puzzles" not in path.parts:
+                continue
+            yield path
+
+
+def book_for_path(path):
+    """Name of the book a cache file belongs to, or None outside books/."""
+    parts = path.resolve().parts
+    if "books" in parts[:-2]:
+        return parts[parts.index("books") + 1]
+    return None
+
+
+def print_summary(corpus):
+    """Print puzzle counts and score ranges per difficulty and size."""
+    print("=" * 70)
+    print("PUZZLE CORPUS SUMMARY")
+    print("=" * 70)
+    for group in corpus.summary():
+        score = (
+            f"score {group['min_score']:.2f}-{group['max_score']:.2f} "
+            f"(avg {group['avg_score']:.2f})"
+            if group["avg_score"] is not None
+            else "unscored"
+        )
+        print(
+            f"  {group['difficulty'] or '?':<13} {group['height']}x{group['width']}: "
+            f"{group['count']} puzzles, "
+            f"{group['logic_solvable'] or 0} solvable by logic, {score}"
+        )
+
+
+def main():
+    """Import puzzle caches and print the corpus summary."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("sources", nargs="*", type=Path, default=DEFAULT_SOURCES)
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument(
+        "--no-score", action="store_true", help="Skip difficulty scoring"
+    )
+    parser.add_argument(
+        "--summary-only", action="store_true", help="Only print the summary"
+    )
+    args = parser.parse_args()
+
+    with PuzzleCorpus(args.db) as corpus:
+        if not args.summary_only:
+            total = 0
+            for path in find_cache_files(args.sources):
+                logger.info(f"Importing {path}")
+                total += corpus.import_json(
+                    path, score=not args.no_score, book=book_for_path(path)
+                )
+            logger.info(f"Imported {total} new puzzles into {args.db}")
+        print_summary(corpus)
+
+
+if __name__ == "__main__":
+    main()
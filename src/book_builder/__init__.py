@@ -12,12 +12,37 @@ Main exports:
     - ChapterRenderer: Markdown to PDF renderer
 """
 
-from .config import BookConfig, ChapterConfig, PuzzleSectionConfig, LayoutConfig
-from .chapter_renderer import ChapterRenderer
-from .builder import build_book, build_chapters_only, build_puzzles_only
-from .assembler import BookAssembler
-from .document import BookDocument, TOCEntry
-from .puzzle_flowable import PuzzleFlowable, SolutionFlowable
+from importlib import import_module
+
+# Submodule defining each export. Exports are imported on first access, so
+# commands that only read configuration (the CLI's list and validate) do not
+# load ReportLab and the rendering modules.
+_EXPORTS = {
+    "BookConfig": "config",
+    "ChapterConfig": "config",
+    "PuzzleSectionConfig": "config",
+    "LayoutConfig": "config",
+    "ChapterRenderer": "chapter_renderer",
+    "BookAssembler": "assembler",
+    "BookDocument": "document",
+    "TOCEntry": "document",
+    "PuzzleFlowable": "puzzle_flowable",
+    "SolutionFlowable": "puzzle_flowable",
+    "SolutionSheetFlowable": "puzzle_flowable",
+    "build_book": "builder",
+    "build_chapters_only": "builder",
+    "build_puzzles_only": "builder",
+}
+
+
+def __getattr__(name: str):
+    """Import an export from its submodule on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "BookConfig",
@@ -30,6 +55,7 @@ __all__ = [
     "TOCEntry",
     "PuzzleFlowable",
     "SolutionFlowable",
+    "SolutionSheetFlowable",
     "build_book",
     "build_chapters_only",
     "build_puzzles_only",
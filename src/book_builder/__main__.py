@@ -9,6 +9,8 @@ Examples:
     python -m book_builder build beginner-to-expert-250
     python -m book_builder build beginner-to-expert-250 --chapters-only
     python -m book_builder build beginner-to-expert-250 --output custom.pdf
+    python -m book_builder build beginner-to-expert-250 --workers 0
+    python -m book_builder build beginner-to-expert-250 --incremental
 """
 
 import argparse
@@ -16,15 +18,9 @@ import logging
 import sys
 from pathlib import Path
 
-# Configure ReportLab BEFORE any reportlab imports to prevent Helvetica registration
-from .config import DEFAULT_FONTS
-from reportlab import rl_config
-
-rl_config.canvas_basefontname = DEFAULT_FONTS["body"]
-
-from .builder import build_book, build_chapters_only, build_puzzles_only
-from .config import BookConfig
-from src.pdf_generation.fonts import register_fonts
+# Nothing beyond the standard library is imported up front: the
+# configuration models (pydantic) are loaded by validate and build, and
+# ReportLab and the rendering modules by build alone (see setup_rendering)
 
 
 def setup_logging(verbose: bool = False):
@@ -36,6 +32,22 @@ def setup_logging(verbose: bool = False):
     )
 
 
+def setup_rendering():
+    """Configure ReportLab and register fonts before anything is rendered."""
+    # Configure ReportLab BEFORE other reportlab imports to prevent Helvetica
+    # registration
+    from reportlab import rl_config
+
+    from .config import DEFAULT_FONTS
+
+    rl_config.canvas_basefontname = DEFAULT_FONTS["body"]
+
+    # reportlab.lib.styles looks up the base font's family when imported
+    from src.pdf_generation.fonts import register_default_fonts
+
+    register_default_fonts()
+
+
 def find_books_dir() -> Path:
     """Find the books directory relative to the project root."""
     # Try common locations
@@ -50,17 +62,24 @@ def find_books_dir() -> Path:
 
 
 def list_books():
-    """List all available books."""
+    """List all available books.
+
+    Only the metadata is read from each book.yaml, without validating the
+    whole configuration, so listing stays quick.
+    """
+    import yaml
+
     books_dir = find_books_dir()
     print(f"\nAvailable books in {books_dir}:\n")
 
     for book_dir in sorted(books_dir.iterdir()):
         if book_dir.is_dir() and (book_dir / "book.yaml").exists():
             try:
-                config = BookConfig.from_yaml(book_dir / "book.yaml")
+                with open(book_dir / "book.yaml", "r") as f:
+                    metadata = yaml.safe_load(f)["metadata"]
                 print(f"  {book_dir.name}")
-                print(f"    Title: {config.metadata.title}")
-                print(f"    Author: {config.metadata.author}")
+                print(f"    Title: {metadata['title']}")
+                print(f"    Author: {metadata.get('author', '')}")
                 print()
             except Exception as e:
                 print(f"  {book_dir.name} (error loading: {e})")
@@ -82,6 +101,8 @@ def cmd_validate(args):
         logger.error(f"No book.yaml found in {book_dir}")
         return 1
 
+    from .config import BookConfig
+
     try:
         config = BookConfig.from_yaml(config_path)
         print(f"✓ book.yaml is valid")
@@ -134,6 +155,9 @@ def cmd_build(args):
     if args.output:
         output_path = Path(args.output)
 
+    setup_rendering()
+    from .builder import build_book, build_chapters_only, build_puzzles_only
+
     try:
         if args.chapters_only and args.puzzles_only:
             logger.error("Cannot use both --chapters-only and --puzzles-only")
@@ -143,10 +167,12 @@ def cmd_build(args):
             result = build_chapters_only(args.book_id, output_path)
         elif args.puzzles_only:
             logger.info(f"Building puzzles only for: {args.book_id}")
-            result = build_puzzles_only(args.book_id, output_path)
+            result = build_puzzles_only(args.book_id, output_path, args.workers)
         else:
             logger.info(f"Building full book: {args.book_id}")
-            result = build_book(args.book_id, output_path)
+            result = build_book(
+                args.book_id, output_path, args.workers, args.incremental
+            )
 
         print(f"\n✓ Book built successfully: {result}")
         return 0
@@ -193,6 +219,18 @@ def main():
         "-o",
         help="Custom output path for the PDF",
     )
+    build_parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help="Processes drawing puzzle and solution pages (0 = one per core)",
+    )
+    build_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-render only chapters and puzzle sections that changed",
+    )
 
     # list command
     subparsers.add_parser("list", help="List available books")
@@ -206,9 +244,6 @@ def main():
     args = parser.parse_args()
     setup_logging(args.verbose if hasattr(args, "verbose") else False)
 
-    # Register custom fonts
-    register_fonts()
-
     if args.command == "build":
         sys.exit(cmd_build(args))
     elif args.command == "list":
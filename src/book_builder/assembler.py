@@ -7,6 +7,8 @@ solutions, and back matter into a cohesive book document.
 
 import json
 import logging
+import re
+from dataclasses import replace
 from pathlib import Path
 from datetime import datetime
 
@@ -41,6 +43,9 @@ class BookAssembler:
         self.chapter_renderer = ChapterRenderer(config, book_dir)
         self.toc_entries: list[tuple[str, int]] = []  # (title, page_num)
         self._current_page = 1
+        # Sections seen so far per (difficulty, sizes, band), numbering the
+        # streams of sections that would otherwise share them
+        self._section_counts: dict[tuple, int] = {}
 
     def build_title_page(self) -> list:
         """Build the title page flowables."""
@@ -153,72 +158,172 @@ class BookAssembler:
         return flowables
 
     def generate_puzzles_for_section(
-        self, section: PuzzleSectionConfig, cache_dir: Path
+        self, section: PuzzleSectionConfig, cache_dir: Path, duplicates=None
     ) -> list:
         """Generate or load puzzles for a section.
 
+        Loads every puzzle of the section into memory; book builds use
+        ``puzzle_refs_for_section`` instead.
+
         Args:
             section: Puzzle section configuration.
             cache_dir: Directory for caching puzzles.
+            duplicates: Optional DuplicateIndex (see puzzle_refs_for_section).
 
         Returns:
             List of Puzzle objects.
         """
-        from src.puzzle_generation import generate_puzzle, Puzzle
+        from src.puzzle_generation.refs import read_puzzle
+
+        refs = self.puzzle_refs_for_section(section, cache_dir, duplicates)
+        return [read_puzzle(ref) for ref in refs]
+
+    def puzzle_refs_for_section(
+        self, section: PuzzleSectionConfig, cache_dir: Path, duplicates=None
+    ) -> list:
+        """Generate or look up the puzzles for a section.
+
+        Puzzles come from a content-addressed ``PuzzleStore`` in
+        ``cache_dir`` with one stream per grid size, keyed on the section's
+        difficulty, grid sizes and band. Sections alike in all three are
+        numbered in book order and each gets streams of its own, so renaming
+        a section keeps its puzzles. The section takes the first puzzles of
+        each stream in order, so raising ``count`` only generates the extra
+        puzzles and keeps the existing numbering, in this section and in
+        every other.
+        Caches written as ``{difficulty}_{count}_{sizes}.json`` by earlier
+        versions are imported into the store the first time they are seen.
+
+        Only references are returned; puzzle grids stay on disk until a
+        flowable draws them.
+
+        When the section sets ``difficulty_band``, candidates are scored as
+        they are filled and only puzzles inside the band are kept. The
+        band's acceptance statistics are recorded on
+        ``section.generation_stats`` and cached next to the puzzles.
+
+        With a ``DuplicateIndex``, every puzzle the section takes, stored or
+        new, is claimed for this book; puzzles (or their transposes) that
+        another book or section already holds are skipped and replaced.
+
+        Args:
+            section: Puzzle section configuration.
+            cache_dir: Directory for caching puzzles.
+            duplicates: Optional DuplicateIndex shared between books.
 
-        # Create a unique cache key including grid sizes
+        Returns:
+            List of PuzzleRef objects.
+        """
+        from src.puzzle_generation import (
+            GenerationSpec,
+            GenerationStats,
+            PuzzleStore,
+        )
+
+        band = self._resolve_band(section)
         grid_size_str = "_".join(map(str, sorted(set(section.grid_sizes))))
-        cache_file = (
-            cache_dir / f"{section.difficulty}_{section.count}_{grid_size_str}.json"
+        alike = (section.difficulty, grid_size_str, band)
+        ordinal = self._section_counts.get(alike, 0) + 1
+        self._section_counts[alike] = ordinal
+
+        # Adjust density based on difficulty
+        density_map = {
+            "beginner": 0.24,
+            "intermediate": 0.22,
+            "expert": 0.20,
+        }
+        spec = GenerationSpec(
+            difficulty=section.difficulty,
+            count=section.count,
+            grid_sizes=tuple(section.grid_sizes),
+            black_density=density_map.get(section.difficulty, 0.22),
+            band=band,
+            max_attempts=50,  # More attempts for strict enforcement
+            stream=grid_size_str if ordinal == 1 else f"{grid_size_str}#{ordinal}",
+        )
+        store = PuzzleStore(cache_dir)
+
+        band_suffix = ""
+        if band is not None:
+            band_suffix = f"_band{band.min_score:g}-{band.max_score:g}"
+        stats_file = (
+            cache_dir / f"{section.difficulty}_{grid_size_str}{band_suffix}.stats.json"
+        )
+
+        # Import the largest count-keyed cache from earlier versions, whatever
+        # count it was written for, into the first alike section's streams
+        legacy_pattern = re.compile(
+            rf"{section.difficulty}_(\d+)_{grid_size_str}{re.escape(band_suffix)}"
+            r"\.json"
         )
+        legacy_files = [
+            (int(match.group(1)), path)
+            for path in (cache_dir.glob("*.json") if cache_dir.exists() else [])
+            if (match := legacy_pattern.fullmatch(path.name))
+        ]
+        if legacy_files and ordinal == 1:
+            store.import_legacy_cache(max(legacy_files)[1], spec)
+        if stats_file.exists():
+            with open(stats_file, "r") as f:
+                section.generation_stats = json.load(f)
+
+        # Sizes are assigned round-robin; each size draws from its own stream
+        sizes = [spec.size_for(i) for i in range(section.count)]
+        stats = GenerationStats()
+        by_size = {}
+        for size in dict.fromkeys(sizes):
+            size_spec = replace(spec, grid_sizes=(size,))
+            wanted = sizes.count(size)
+            logger.info(
+                f"Taking {wanted} {section.difficulty} {size}x{size} puzzles "
+                f"from store"
+            )
+            refs = store.take_refs(
+                size_spec,
+                wanted,
+                stats=stats,
+                duplicates=duplicates,
+                book=self.book_dir.name,
+            )
+            by_size[size] = iter(refs)
+
+        refs = [next(by_size[size]) for size in sizes]
 
-        # Try to load from cache
-        if cache_file.exists():
+        if band is not None and stats.candidates:
+            section.generation_stats[band.name] = stats.to_dict()
+            with open(stats_file, "w") as f:
+                json.dump(section.generation_stats, f, indent=2)
             logger.info(
-                f"Loading {section.count} {section.difficulty} puzzles from cache"
+                f"Band {band.name}: acceptance rate {stats.acceptance_rate:.1%}, "
+                f"{stats.seconds_per_accepted or 0:.2f}s per accepted puzzle"
             )
-            with open(cache_file, "r") as f:
-                data = json.load(f)
-            return [Puzzle.from_dict(p) for p in data]
-
-        # Generate puzzles
-        logger.info(f"Generating {section.count} {section.difficulty} puzzles...")
-        puzzles = []
-        grid_sizes = section.grid_sizes
-
-        for i in range(section.count):
-            # Distribute puzzles across grid sizes
-            size = grid_sizes[i % len(grid_sizes)]
-
-            # Adjust density based on difficulty
-            density_map = {
-                "beginner": 0.24,
-                "intermediate": 0.22,
-                "expert": 0.20,
-            }
-            density = density_map.get(section.difficulty, 0.22)
-
-            try:
-                puzzle = generate_puzzle(
-                    height=size,
-                    width=size,
-                    black_density=density,
-                    max_attempts=50,  # More attempts for strict enforcement
-                    min_size=(size, size),  # Enforce exact minimum size
-                )
-                puzzles.append(puzzle)
-
-                if (i + 1) % 10 == 0:
-                    logger.info(f"  Generated {i + 1}/{section.count} puzzles")
-
-            except Exception as e:
-                logger.warning(f"Failed to generate puzzle {i + 1}: {e}")
-                continue
-
-        # Cache the puzzles
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        with open(cache_file, "w") as f:
-            json.dump([p.to_dict() for p in puzzles], f)
-
-        logger.info(f"Generated and cached {len(puzzles)} puzzles")
-        return puzzles
+
+        logger.info(f"Loaded {len(refs)} {section.difficulty} puzzles")
+        return refs
+
+    def _resolve_band(self, section: PuzzleSectionConfig):
+        """Resolve a section's difficulty band setting.
+
+        Args:
+            section: Puzzle section configuration.
+
+        Returns:
+            DifficultyBand, or None if the section uses plain generation.
+        """
+        from src.puzzle_generation import DifficultyBand, DEFAULT_BANDS
+
+        if section.difficulty_band is None:
+            return None
+
+        default = DEFAULT_BANDS[section.difficulty]
+        if section.difficulty_band == "default":
+            return default
+
+        band_config = section.difficulty_band
+        return DifficultyBand(
+            name=section.difficulty,
+            min_score=band_config.min_score,
+            max_score=band_config.max_score,
+            allow_guessing=band_config.allow_guessing,
+            black_density=band_config.black_density or default.black_density,
+        )
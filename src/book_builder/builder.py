@@ -11,6 +11,7 @@ import shutil
 from pathlib import Path
 from typing import Optional
 
+from src.pdf_generation.compliance import find_unembedded_fonts
 from .config import BookConfig, PartHeaderConfig, ChapterConfig, PuzzleSectionConfig
 from .document import BookDocument
 
@@ -67,6 +68,28 @@ def embed_fonts(input_pdf: Path) -> Path:
     return input_pdf
 
 
+def ensure_fonts_embedded(pdf_path: Path) -> Path:
+    """Make sure every font in a PDF is embedded, using Ghostscript only if needed.
+
+    Book builds embed subset TrueType fonts as they render, so the
+    Ghostscript pass only runs when the verifier finds a font that slipped
+    through unembedded.
+
+    Args:
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        Path to the PDF (modified in place if Ghostscript ran).
+    """
+    unembedded = find_unembedded_fonts(pdf_path)
+    if not unembedded:
+        logger.info("All fonts embedded")
+        return pdf_path
+
+    logger.warning(f"Unembedded fonts found: {', '.join(unembedded)}")
+    return embed_fonts(pdf_path)
+
+
 def get_book_dir(book_id: str) -> Path:
     """Get the directory for a book.
 
@@ -79,13 +102,20 @@ def get_book_dir(book_id: str) -> Path:
     return BOOKS_DIR / book_id
 
 
-def build_book(book_id: str, output_path: Optional[Path] = None) -> Path:
+def build_book(
+    book_id: str,
+    output_path: Optional[Path] = None,
+    workers: int = 1,
+    incremental: bool = False,
+) -> Path:
     """Build a complete book from configuration.
 
     Args:
         book_id: Book identifier (directory name under books/).
         output_path: Optional output path.
             Defaults to books/{book_id}/output/interior.pdf
+        workers: Processes drawing puzzle and solution pages (0 = all cores).
+        incremental: Reuse parts rendered by earlier builds when unchanged.
 
     Returns:
         Path to the generated PDF.
@@ -102,7 +132,7 @@ def build_book(book_id: str, output_path: Optional[Path] = None) -> Path:
     logger.info(f"Building book: {config.metadata.title}")
 
     # Create document using new BookDocument class
-    doc = BookDocument(config, book_dir)
+    doc = BookDocument(config, book_dir, incremental=incremental)
 
     # Front matter
     doc.add_title_page()
@@ -135,10 +165,10 @@ def build_book(book_id: str, output_path: Optional[Path] = None) -> Path:
 
     # Finalize TOC and save
     doc.finalize_toc()
-    pdf_path = doc.save(output_path)
+    pdf_path = doc.save(output_path, workers=workers)
 
-    # Post-process to embed all fonts for KDP compliance
-    return embed_fonts(pdf_path)
+    # Verify all fonts are embedded for KDP compliance
+    return ensure_fonts_embedded(pdf_path)
 
 
 def build_chapters_only(book_id: str, output_path: Optional[Path] = None) -> Path:
@@ -177,12 +207,15 @@ def build_chapters_only(book_id: str, output_path: Optional[Path] = None) -> Pat
     return doc.save(output_path)
 
 
-def build_puzzles_only(book_id: str, output_path: Optional[Path] = None) -> Path:
+def build_puzzles_only(
+    book_id: str, output_path: Optional[Path] = None, workers: int = 1
+) -> Path:
     """Build only the puzzle sections (no chapters).
 
     Args:
         book_id: Book identifier.
         output_path: Optional output path.
+        workers: Processes drawing puzzle and solution pages (0 = all cores).
 
     Returns:
         Path to the generated PDF.
@@ -214,4 +247,4 @@ def build_puzzles_only(book_id: str, output_path: Optional[Path] = None) -> Path
     # Add solutions
     doc.add_solutions()
 
-    return doc.save(output_path)
+    return doc.save(output_path, workers=workers)
@@ -7,6 +7,8 @@ Platypus flowables for inclusion in PDF documents.
 
 import re
 import logging
+from functools import lru_cache
+from importlib import import_module
 from pathlib import Path
 
 from reportlab.platypus import (
@@ -30,20 +32,33 @@ from .diagram_renderer import DiagramFlowable
 from .reference_table_renderer import ReferenceTableFlowable
 from .progress_tracker_renderer import ProgressTrackerFlowable
 from .diagram_models import ReferenceTableDefinition
-from .diagrams.chapter1 import CHAPTER1_DIAGRAMS
-from .diagrams.chapter2 import CHAPTER2_DIAGRAMS
-from .diagrams.chapter3 import CHAPTER3_DIAGRAMS
+from .graphics_cache import (
+    GRAPHICS_CACHE_DIRNAME,
+    GraphicsCache,
+    freeze_pdf_object,
+    thaw_pdf_object,
+)
 
 logger = logging.getLogger(__name__)
 
-# Registry of all programmatic diagrams by chapter
+# Registry of all programmatic diagrams by chapter: the diagrams module and
+# the dict in it. The modules build their definitions when imported, so each
+# is imported the first time one of its chapter's diagrams is used.
 PROGRAMMATIC_DIAGRAMS = {
-    "chapter1": CHAPTER1_DIAGRAMS,
-    "chapter2": CHAPTER2_DIAGRAMS,
-    "chapter3": CHAPTER3_DIAGRAMS,
+    "chapter1": ("chapter1", "CHAPTER1_DIAGRAMS"),
+    "chapter2": ("chapter2", "CHAPTER2_DIAGRAMS"),
+    "chapter3": ("chapter3", "CHAPTER3_DIAGRAMS"),
 }
 
 
+@lru_cache(maxsize=None)
+def programmatic_diagrams(chapter_key: str) -> dict:
+    """Diagram definitions of a chapter in PROGRAMMATIC_DIAGRAMS, by diagram key."""
+    module_name, attribute = PROGRAMMATIC_DIAGRAMS[chapter_key]
+    module = import_module(f".diagrams.{module_name}", __package__)
+    return getattr(module, attribute)
+
+
 def create_styles(config: BookConfig) -> dict:
     """Create paragraph styles for chapter rendering.
 
@@ -127,6 +142,9 @@ class ChapterRenderer:
         self.config = config
         self.book_dir = book_dir
         self.styles = create_styles(config)
+        self.graphics_cache = GraphicsCache(
+            book_dir / "output" / GRAPHICS_CACHE_DIRNAME
+        )
 
         # Regex patterns for markdown parsing
         self.heading_pattern = re.compile(r"^(#{1,3})\s+(.+)$")
@@ -264,6 +282,31 @@ class ChapterRenderer:
 
         return flowables
 
+    def chapter_dependencies(self, chapter_path: Path) -> list[Path]:
+        """List the files a chapter's rendering reads.
+
+        Args:
+            chapter_path: Path to the markdown file.
+
+        Returns:
+            The markdown file followed by every existing image file it links
+            to, including the SVG and PDF variants _create_image prefers.
+        """
+        dependencies = [chapter_path]
+        with open(chapter_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        for match in self.image_pattern.finditer(content):
+            full_path = chapter_path.parent / match.group(2)
+            for candidate in (
+                full_path.with_suffix(".svg"),
+                full_path.with_suffix(".pdf"),
+                full_path,
+            ):
+                if candidate.is_file():
+                    dependencies.append(candidate)
+        return dependencies
+
     def _format_text(self, text: str) -> str:
         """Format text with inline markup for ReportLab.
 
@@ -292,7 +335,12 @@ class ChapterRenderer:
             ListItem(Paragraph(self._format_text(item), self.styles["list_item"]))
             for item in items
         ]
-        return ListFlowable(list_items, bulletType="bullet", leftIndent=20)
+        return ListFlowable(
+            list_items,
+            bulletType="bullet",
+            bulletFontName=self.config.fonts.body,
+            leftIndent=20,
+        )
 
     def _create_image(self, image_path: str, alt_text: str, chapter_dir: Path) -> list:
         """Create an image flowable.
@@ -368,7 +416,7 @@ class ChapterRenderer:
         if chapter_key not in PROGRAMMATIC_DIAGRAMS:
             return None
 
-        chapter_diagrams = PROGRAMMATIC_DIAGRAMS[chapter_key]
+        chapter_diagrams = programmatic_diagrams(chapter_key)
         if diagram_key not in chapter_diagrams:
             return None
 
@@ -385,7 +433,11 @@ class ChapterRenderer:
         if isinstance(diagram_def, ReferenceTableDefinition):
             flowable = ReferenceTableFlowable(diagram_def, max_width=max_width)
         else:
-            flowable = DiagramFlowable(diagram_def, max_width=max_width)
+            flowable = DiagramFlowable(
+                diagram_def,
+                max_width=max_width,
+                render_mode=self.config.layout.render_mode,
+            )
 
         # Don't wrap in KeepTogether here - caller handles grouping with caption
         return [Spacer(1, 16), flowable, Spacer(1, 8)]
@@ -453,6 +505,7 @@ class ChapterRenderer:
         Returns:
             List containing image and optional spacing.
         """
+        import svglib
         from svglib.svglib import svg2rlg
 
         max_width = (
@@ -466,32 +519,41 @@ class ChapterRenderer:
         max_height = page_height - 72  # Leave room for page elements
 
         try:
-            drawing = svg2rlg(str(svg_path))
+            key = self.graphics_cache.key(
+                svg_path, "svg", svglib.__version__, max_width, max_height
+            )
+            drawing = self.graphics_cache.get(key)
             if drawing is None:
-                logger.warning(f"Could not parse SVG: {svg_path}")
-                return [
-                    Paragraph(f"[SVG parse error: {svg_path}]", self.styles["caption"])
-                ]
+                drawing = svg2rlg(str(svg_path))
+                if drawing is None:
+                    logger.warning(f"Could not parse SVG: {svg_path}")
+                    return [
+                        Paragraph(
+                            f"[SVG parse error: {svg_path}]", self.styles["caption"]
+                        )
+                    ]
 
-            # Get original dimensions
-            orig_width = drawing.width
-            orig_height = drawing.height
+                # Get original dimensions
+                orig_width = drawing.width
+                orig_height = drawing.height
 
-            # Always scale to full width - vector graphics maintain quality
-            scale = max_width / orig_width
-            final_width = max_width
-            final_height = orig_height * scale
+                # Always scale to full width - vector graphics maintain quality
+                scale = max_width / orig_width
+                final_width = max_width
+                final_height = orig_height * scale
 
-            # If scaled height exceeds page, cap it
-            if final_height > max_height:
-                scale = max_height / orig_height
-                final_height = max_height
-                final_width = orig_width * scale
+                # If scaled height exceeds page, cap it
+                if final_height > max_height:
+                    scale = max_height / orig_height
+                    final_height = max_height
+                    final_width = orig_width * scale
 
-            drawing.width = final_width
-            drawing.height = final_height
-            drawing.scale(scale, scale)
+                drawing.width = final_width
+                drawing.height = final_height
+                drawing.scale(scale, scale)
+                self.graphics_cache.put(key, drawing)
 
+            final_width, final_height = drawing.width, drawing.height
             logger.info(
                 f"SVG: {svg_path.name} scaled to "
                 f"{final_width:.0f}x{final_height:.0f}pt"
@@ -513,6 +575,7 @@ class ChapterRenderer:
         Returns:
             List containing image and optional spacing.
         """
+        import pdfrw
         from pdfrw import PdfReader
         from pdfrw.buildxobj import pagexobj
 
@@ -527,31 +590,45 @@ class ChapterRenderer:
         max_height = page_height - 72  # Leave room for page elements
 
         try:
-            # Use pdfrw to read the PDF and convert to a ReportLab-compatible form
-            pdf = PdfReader(str(pdf_path))
-            if not pdf.pages:
-                logger.warning(f"PDF has no pages: {pdf_path}")
-                return [Paragraph(f"[Empty PDF: {pdf_path}]", self.styles["caption"])]
-
-            # Get the first page
-            page = pdf.pages[0]
-            xobj = pagexobj(page)
-
-            # Get original dimensions
-            orig_width = float(xobj.BBox[2]) - float(xobj.BBox[0])
-            orig_height = float(xobj.BBox[3]) - float(xobj.BBox[1])
-
-            # Always scale to full width - vector graphics maintain quality
-            # Height will scale proportionally
-            scale = max_width / orig_width
-            final_width = max_width
-            final_height = orig_height * scale
+            key = self.graphics_cache.key(
+                pdf_path, "pdf", pdfrw.__version__, max_width, max_height
+            )
+            cached = self.graphics_cache.get(key)
+            if cached is not None:
+                nodes, final_width, final_height = cached
+                xobj = thaw_pdf_object(nodes)
+            else:
+                # Use pdfrw to read the PDF and convert to a ReportLab-compatible form
+                pdf = PdfReader(str(pdf_path))
+                if not pdf.pages:
+                    logger.warning(f"PDF has no pages: {pdf_path}")
+                    return [
+                        Paragraph(f"[Empty PDF: {pdf_path}]", self.styles["caption"])
+                    ]
 
-            # If scaled height exceeds page, cap it
-            if final_height > max_height:
-                scale = max_height / orig_height
-                final_height = max_height
-                final_width = orig_width * scale
+                # Get the first page
+                page = pdf.pages[0]
+                xobj = pagexobj(page)
+
+                # Get original dimensions
+                orig_width = float(xobj.BBox[2]) - float(xobj.BBox[0])
+                orig_height = float(xobj.BBox[3]) - float(xobj.BBox[1])
+
+                # Always scale to full width - vector graphics maintain quality
+                # Height will scale proportionally
+                scale = max_width / orig_width
+                final_width = max_width
+                final_height = orig_height * scale
+
+                # If scaled height exceeds page, cap it
+                if final_height > max_height:
+                    scale = max_height / orig_height
+                    final_height = max_height
+                    final_width = orig_width * scale
+
+                self.graphics_cache.put(
+                    key, (freeze_pdf_object(xobj), final_width, final_height)
+                )
 
             logger.info(
                 f"PDF: {pdf_path.name} scaled to "
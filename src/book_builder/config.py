@@ -5,7 +5,6 @@ from typing import Optional, Literal, Union
 import yaml
 from pydantic import BaseModel, Field
 
-
 # Default embeddable fonts
 DEFAULT_FONTS = {
     "body": "NotoSans-Regular",
@@ -41,6 +40,15 @@ class ChapterConfig(BaseModel):
     title: str
 
 
+class DifficultyBandConfig(BaseModel):
+    """Target difficulty score band for a puzzle section."""
+
+    min_score: float
+    max_score: float
+    allow_guessing: bool = True
+    black_density: Optional[float] = None
+
+
 class PuzzleSectionConfig(BaseModel):
     """Puzzle section configuration."""
 
@@ -49,6 +57,10 @@ class PuzzleSectionConfig(BaseModel):
     difficulty: Literal["beginner", "intermediate", "expert"]
     count: int
     grid_sizes: list[int] = Field(default_factory=lambda: [9, 10, 11])
+    # "default" uses the built-in band for the section's difficulty
+    difficulty_band: Optional[Union[Literal["default"], DifficultyBandConfig]] = None
+    # Filled in during generation: acceptance statistics per band
+    generation_stats: dict[str, dict] = Field(default_factory=dict)
 
 
 class FrontMatterItem(BaseModel):
@@ -91,6 +103,8 @@ class LayoutConfig(BaseModel):
     large_print: bool = False
     puzzles_per_page: int = 1
     solutions_per_page: int = 6
+    # How puzzle grids are drawn (see RenderConfig.render_mode)
+    render_mode: Literal["cells", "forms", "batched"] = "cells"
 
 
 class FontsConfig(BaseModel):
@@ -101,6 +115,14 @@ class FontsConfig(BaseModel):
     puzzle: str = DEFAULT_FONTS["puzzle"]
 
 
+class PuzzlesConfig(BaseModel):
+    """Puzzle generation settings shared by all puzzle sections."""
+
+    # Keep puzzles unique across every book in books/, through a shared
+    # fingerprint index; otherwise they are kept unique within the book
+    unique_across_books: bool = False
+
+
 class BookConfig(BaseModel):
     """Complete book configuration."""
 
@@ -108,6 +130,7 @@ class BookConfig(BaseModel):
     content: ContentConfig = Field(default_factory=ContentConfig)
     layout: LayoutConfig = Field(default_factory=LayoutConfig)
     fonts: FontsConfig = Field(default_factory=FontsConfig)
+    puzzles: PuzzlesConfig = Field(default_factory=PuzzlesConfig)
 
     @classmethod
     def from_yaml(cls, path: Path) -> "BookConfig":
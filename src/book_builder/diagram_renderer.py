@@ -11,7 +11,9 @@ from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.colors import black, white, HexColor, Color
 from reportlab.lib.units import inch
 
+from src.pdf_generation.metrics import centered_offset, string_width
 from .config import DEFAULT_FONTS
+from .layout_cache import MEASUREMENTS
 from .diagram_models import (
     DiagramDefinition,
     DiagramGrid,
@@ -42,11 +44,31 @@ class DiagramFlowable(Flowable):
     GRID_BOTTOM_PADDING = 15  # Space below grids
     CAPTION_TOP_PADDING = 10  # Space above caption
 
+    # Attributes _calculate_dimensions sets
+    MEASURED = (
+        "title_height",
+        "grid_heights",
+        "grid_widths",
+        "cell_size",
+        "total_grid_width",
+        "total_grid_height",
+        "annotation_heights",
+        "annotations_height",
+        "legend_position",
+        "legend_height",
+        "legend_width",
+        "caption_height",
+        "content_width",
+        "width",
+        "height",
+    )
+
     def __init__(
         self,
         diagram: DiagramDefinition,
         max_width: float = 6.0 * inch,
         cell_size: float = None,
+        render_mode: str = "cells",
     ):
         """Initialize diagram flowable.
 
@@ -54,17 +76,27 @@ class DiagramFlowable(Flowable):
             diagram: The diagram definition to render.
             max_width: Maximum width in points.
             cell_size: Cell size in points (auto-calculated if None).
+            render_mode: "forms" reuses one form per cell kind and size;
+                any other mode draws every cell directly, since diagram
+                cells are highlighted individually.
         """
         super().__init__()
         self.diagram = diagram
         self.max_width = max_width
         self.cell_size = cell_size or self.DEFAULT_CELL_SIZE
+        self.render_mode = render_mode
 
         # Store calculated annotation heights
         self.annotation_heights = []
 
-        # Calculate dimensions
-        self._calculate_dimensions()
+        # Calculate dimensions (shared by flowables of the same diagram)
+        MEASUREMENTS.apply(
+            self,
+            diagram,
+            (max_width, self.cell_size),
+            self._calculate_dimensions,
+            self.MEASURED,
+        )
 
     def _calculate_dimensions(self):
         """Calculate the total dimensions needed for the diagram."""
@@ -274,23 +306,26 @@ class DiagramFlowable(Flowable):
         # Draw grid title if present (20pt reserved in height calculation)
         if grid.title:
             canvas.setFont(DEFAULT_FONTS["heading"], 11)
-            title_width = canvas.stringWidth(grid.title, DEFAULT_FONTS["heading"], 11)
+            title_width = string_width(grid.title, DEFAULT_FONTS["heading"], 11)
             title_x = x + (grid.cols * self.cell_size - title_width) / 2
             canvas.drawString(title_x, y - 5, grid.title)
             y -= 20
 
         # Draw cells
-        for row in range(grid.rows):
-            for col in range(grid.cols):
-                cell_x = x + col * self.cell_size
-                cell_y = y - (row + 1) * self.cell_size
-
-                cell = grid.get_cell(row, col)
-                if cell:
-                    self._draw_cell(canvas, cell, cell_x, cell_y)
-                else:
-                    # Default white cell
-                    self._draw_white_cell(canvas, cell_x, cell_y, None, None)
+        if self.render_mode == "forms":
+            self._draw_cells_as_forms(canvas, grid, x, y)
+        else:
+            for row in range(grid.rows):
+                for col in range(grid.cols):
+                    cell_x = x + col * self.cell_size
+                    cell_y = y - (row + 1) * self.cell_size
+
+                    cell = grid.get_cell(row, col)
+                    if cell:
+                        self._draw_cell(canvas, cell, cell_x, cell_y)
+                    else:
+                        # Default white cell
+                        self._draw_white_cell(canvas, cell_x, cell_y, None, None)
 
         # Draw outer border
         canvas.setStrokeColor(black)
@@ -302,14 +337,70 @@ class DiagramFlowable(Flowable):
         # Draw grid caption if present
         if grid.caption:
             canvas.setFont(DEFAULT_FONTS["caption"], 10)
-            caption_width = canvas.stringWidth(
-                grid.caption, DEFAULT_FONTS["caption"], 10
-            )
+            caption_width = string_width(grid.caption, DEFAULT_FONTS["caption"], 10)
             caption_x = x + (grid_width - caption_width) / 2
             canvas.drawString(caption_x, y - grid_height - 15, grid.caption)
 
         canvas.restoreState()
 
+    def _draw_cells_as_forms(self, canvas, grid: DiagramGrid, x: float, y: float):
+        """Place each cell's background as a shared form, then draw the text."""
+        values = []
+        clues = []
+
+        # Step the origin from cell to cell instead of saving state per cell
+        canvas.saveState()
+        origin_x = origin_y = 0.0
+        for row in range(grid.rows):
+            for col in range(grid.cols):
+                cell_x = x + col * self.cell_size
+                cell_y = y - (row + 1) * self.cell_size
+
+                cell = grid.get_cell(row, col)
+                if cell and cell.cell_type == CellType.BLACK:
+                    form = self._cell_form(canvas, "black")
+                elif cell and cell.cell_type == CellType.CLUE:
+                    form = self._cell_form(canvas, "clue")
+                    clues.append((cell_x, cell_y, cell.clue_across, cell.clue_down))
+                else:
+                    highlight = cell.highlight if cell else None
+                    form = self._cell_form(canvas, "white", highlight)
+                    if cell and cell.value:
+                        values.append((cell_x, cell_y, cell.value))
+
+                canvas.translate(cell_x - origin_x, cell_y - origin_y)
+                origin_x, origin_y = cell_x, cell_y
+                canvas.doForm(form)
+        canvas.restoreState()
+
+        canvas.setFillColor(black)
+        if clues:
+            canvas.setFont(self.DEFAULT_FONT, self.cell_size * 0.3)
+            for cell_x, cell_y, h_clue, v_clue in clues:
+                self._draw_clue_numbers(canvas, cell_x, cell_y, h_clue, v_clue)
+        if values:
+            canvas.setFont(self.DEFAULT_FONT, self.cell_size * 0.5)
+            for cell_x, cell_y, value in values:
+                self._draw_value(canvas, cell_x, cell_y, value)
+
+    def _cell_form(self, canvas, kind: str, highlight: HighlightStyle = None) -> str:
+        """Return the form for a cell kind at this cell size, defining it once."""
+        if highlight is None:
+            highlight = HighlightStyle.NONE
+        name = f"D{kind[0]}{highlight.value[0:3]}{self.cell_size:g}"
+        if not canvas.hasForm(name):
+            pad = self.DEFAULT_LINE_WIDTH
+            size = self.cell_size
+            canvas.beginForm(name, -pad, -pad, size + pad, size + pad)
+            if kind == "black":
+                self._draw_black_cell(canvas, 0, 0)
+            elif kind == "clue":
+                self._draw_clue_background(canvas, 0, 0)
+            else:
+                self._draw_white_cell(canvas, 0, 0, None, highlight)
+            canvas.endForm()
+        return name
+
     def _draw_cell(self, canvas, cell: DiagramCell, x: float, y: float):
         """Draw a single cell based on its type."""
         if cell.cell_type == CellType.BLACK:
@@ -346,12 +437,16 @@ class DiagramFlowable(Flowable):
         # Draw value if present
         if value:
             canvas.setFillColor(black)
-            font_size = self.cell_size * 0.5
-            canvas.setFont(self.DEFAULT_FONT, font_size)
-            text_width = canvas.stringWidth(value, self.DEFAULT_FONT, font_size)
-            text_x = x + (self.cell_size - text_width) / 2
-            text_y = y + (self.cell_size - font_size) / 2
-            canvas.drawString(text_x, text_y, value)
+            canvas.setFont(self.DEFAULT_FONT, self.cell_size * 0.5)
+            self._draw_value(canvas, x, y, value)
+
+    def _draw_value(self, canvas, x: float, y: float, value: str):
+        """Draw a cell value centred in the cell, using the current font."""
+        centre = self.cell_size / 2
+        dx, dy = centered_offset(
+            value, self.DEFAULT_FONT, self.cell_size * 0.5, centre, centre
+        )
+        canvas.drawString(x + dx, y + dy, value)
 
     def _draw_clue_cell(
         self,
@@ -363,6 +458,15 @@ class DiagramFlowable(Flowable):
         highlight: HighlightStyle,
     ):
         """Draw a clue cell with diagonal split."""
+        self._draw_clue_background(canvas, x, y)
+
+        # Clue numbers
+        canvas.setFillColor(black)
+        canvas.setFont(self.DEFAULT_FONT, self.cell_size * 0.3)
+        self._draw_clue_numbers(canvas, x, y, h_clue, v_clue)
+
+    def _draw_clue_background(self, canvas, x: float, y: float):
+        """Draw the gray background and diagonal of a clue cell."""
         # Gray background
         gray = Color(0.816, 0.816, 0.816)
         canvas.setFillColor(gray)
@@ -374,24 +478,25 @@ class DiagramFlowable(Flowable):
         canvas.setLineWidth(0.8)
         canvas.line(x, y + self.cell_size, x + self.cell_size, y)
 
-        # Clue numbers
-        canvas.setFillColor(black)
+    def _draw_clue_numbers(self, canvas, x: float, y: float, h_clue, v_clue):
+        """Draw a clue cell's numbers, using the current font and fill."""
         clue_font_size = self.cell_size * 0.3
-        canvas.setFont(self.DEFAULT_FONT, clue_font_size)
 
         if h_clue:
             text = str(h_clue)
-            tw = canvas.stringWidth(text, self.DEFAULT_FONT, clue_font_size)
-            tx = x + self.cell_size * 0.75 - tw / 2
-            ty = y + self.cell_size * 0.75 - clue_font_size / 2
-            canvas.drawString(tx, ty, text)
+            anchor = self.cell_size * 0.75
+            dx, dy = centered_offset(
+                text, self.DEFAULT_FONT, clue_font_size, anchor, anchor
+            )
+            canvas.drawString(x + dx, y + dy, text)
 
         if v_clue:
             text = str(v_clue)
-            tw = canvas.stringWidth(text, self.DEFAULT_FONT, clue_font_size)
-            tx = x + self.cell_size * 0.25 - tw / 2
-            ty = y + self.cell_size * 0.25 - clue_font_size / 2
-            canvas.drawString(tx, ty, text)
+            anchor = self.cell_size * 0.25
+            dx, dy = centered_offset(
+                text, self.DEFAULT_FONT, clue_font_size, anchor, anchor
+            )
+            canvas.drawString(x + dx, y + dy, text)
 
     def _draw_title(self, canvas, y):
         """Draw the diagram title centered at the top."""
@@ -402,9 +507,7 @@ class DiagramFlowable(Flowable):
         canvas.setFont(DEFAULT_FONTS["heading"], 14)
         canvas.setFillColor(black)
 
-        text_width = canvas.stringWidth(
-            self.diagram.title, DEFAULT_FONTS["heading"], 14
-        )
+        text_width = string_width(self.diagram.title, DEFAULT_FONTS["heading"], 14)
         x = (self.width - text_width) / 2
         canvas.drawString(x, y + 8, self.diagram.title)
         canvas.restoreState()
@@ -529,9 +632,7 @@ class DiagramFlowable(Flowable):
         canvas.setFont(DEFAULT_FONTS["caption"], 10)
         canvas.setFillColor(black)
 
-        text_width = canvas.stringWidth(
-            self.diagram.caption, DEFAULT_FONTS["caption"], 10
-        )
+        text_width = string_width(self.diagram.caption, DEFAULT_FONTS["caption"], 10)
         x = (self.width - text_width) / 2
         canvas.drawString(x, y, self.diagram.caption)
         canvas.restoreState()
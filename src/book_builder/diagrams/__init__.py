@@ -3,8 +3,19 @@ Diagram definitions for instructional chapters.
 
 This package contains programmatic diagram definitions that are
 rendered directly using ReportLab, avoiding the HTML conversion pipeline.
+Each chapter module builds its definitions when imported, so the exports
+below are imported on first access.
 """
 
-from .chapter1 import CHAPTER1_DIAGRAMS, get_chapter1_diagram
+from importlib import import_module
 
 __all__ = ["CHAPTER1_DIAGRAMS", "get_chapter1_diagram"]
+
+
+def __getattr__(name: str):
+    """Import an export from the chapter1 module on first access."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(".chapter1", __name__), name)
+    globals()[name] = value
+    return value
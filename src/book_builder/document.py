@@ -5,32 +5,45 @@ This module provides the BookDocument class that orchestrates the
 assembly of all book components into a complete PDF.
 """
 
+import hashlib
 import logging
+import os
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 from reportlab.platypus import (
-    BaseDocTemplate,
     PageTemplate,
     Frame,
     Paragraph,
     Spacer,
     PageBreak,
     ActionFlowable,
+    Flowable,
     SimpleDocTemplate,
+    TableStyle,
 )
-from reportlab.platypus.tableofcontents import TableOfContents
+from reportlab.platypus.tableofcontents import TableOfContents, defaultTableStyle
 from reportlab.lib.units import inch
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 
+# Module import: fonts itself imports book_builder.config
+from src.pdf_generation import fonts
 from .config import BookConfig, PuzzleSectionConfig, DEFAULT_FONTS
 from .chapter_renderer import ChapterRenderer
 from .assembler import BookAssembler
-from .puzzle_flowable import PuzzleFlowable, SolutionFlowable
+from .flowable_stream import FlowableStream
+from .page_plan import PlanningDocTemplate, SizedStandIn, build_planned, plan_pages
+from .parallel import Deferred, PageMarker, save_in_parts
+from .render_cache import RenderCache
+from .puzzle_flowable import build_puzzle_flowable, build_solution_sheet
 
 logger = logging.getLogger(__name__)
 
+# Fingerprint index in the books directory, shared by every book there
+DUPLICATE_INDEX_FILENAME = "puzzle_fingerprints.db"
+
 
 class TOCEntry:
     """Entry in the table of contents."""
@@ -71,22 +84,32 @@ class BookDocument:
         doc.add_about_author(path)
         doc.finalize_toc()
         doc.save(output_path)
+
+    The add_* methods record sections rather than flowables. Each section
+    produces its flowables when the book is laid out, so a build holds only
+    the flowables being placed, however many puzzles the book has.
     """
 
-    def __init__(self, config: BookConfig, book_dir: Path):
+    def __init__(self, config: BookConfig, book_dir: Path, incremental: bool = False):
         """Initialize the book document.
 
         Args:
             config: Book configuration.
             book_dir: Base directory of the book.
+            incremental: Reuse chapters, puzzle sections and solutions
+                rendered by earlier builds (see render_cache).
         """
         self.config = config
         self.book_dir = book_dir
+        fonts.register_default_fonts(
+            config.fonts.body, config.fonts.heading, config.fonts.puzzle
+        )
         self.assembler = BookAssembler(config, book_dir)
         self.chapter_renderer = ChapterRenderer(config, book_dir)
 
-        # Flowables to build
-        self.flowables: list = []
+        # Sections in book order; each call produces the section's
+        # flowables, with Deferred items for those parallel can draw apart
+        self.sections: list[Callable[[], Iterable]] = []
 
         # TOC tracking
         self.toc_entries: list[TOCEntry] = []
@@ -95,9 +118,15 @@ class BookDocument:
         self._toc: Optional[TableOfContents] = None
 
         # Puzzle tracking for solutions
-        self.all_puzzles: list[tuple] = []  # (puzzle_num, puzzle, difficulty_label)
+        # (puzzle_num, puzzle or PuzzleRef, difficulty_label)
+        self.all_puzzles: list[tuple] = []
         self._puzzle_num = 1
 
+        # Number of Deferred items the sections produce
+        self.deferred_count = 0
+
+        self._duplicate_index = None
+
         # Page dimensions
         self.page_width = config.page_width_points
         self.page_height = config.page_height_points
@@ -111,14 +140,45 @@ class BookDocument:
             self.page_height - (self.margins.top + self.margins.bottom) * 72
         )
 
+        self.render_cache: Optional[RenderCache] = None
+        if incremental:
+            settings = (
+                f"{config.layout.model_dump_json()}{config.fonts.model_dump_json()}"
+                f"{self.page_width}x{self.page_height}"
+            )
+            self.render_cache = RenderCache(
+                book_dir / "output" / "render_cache",
+                salt=hashlib.sha256(settings.encode()).hexdigest(),
+            )
+
+    def flowables(
+        self, deferred_as: Optional[Callable[[Deferred], Flowable]] = None
+    ) -> Iterator[Flowable]:
+        """Produce the book's flowables, one section at a time.
+
+        Args:
+            deferred_as: Returns the flowable laid out for a Deferred item;
+                by default the item's own flowable.
+
+        Yields:
+            Flowables in book order, created afresh on every call.
+        """
+        for section in self.sections:
+            for flowable in section():
+                if isinstance(flowable, Deferred):
+                    flowable = (
+                        deferred_as(flowable) if deferred_as else flowable.flowable
+                    )
+                yield flowable
+
     def add_title_page(self) -> "BookDocument":
         """Add the title page."""
-        self.flowables.extend(self.assembler.build_title_page())
+        self.sections.append(self.assembler.build_title_page)
         return self
 
     def add_copyright_page(self) -> "BookDocument":
         """Add the copyright page."""
-        self.flowables.extend(self.assembler.build_copyright_page())
+        self.sections.append(self.assembler.build_copyright_page)
         return self
 
     def add_toc_placeholder(self) -> "BookDocument":
@@ -128,9 +188,9 @@ class BookDocument:
         page numbers during the multi-pass build process.
         """
         self._has_toc = True
-        self._toc_placeholder_index = len(self.flowables)
+        self._toc_placeholder_index = len(self.sections)
 
-        # Add TOC header
+        # TOC header
         toc_header_style = ParagraphStyle(
             "TOCHeader",
             fontName=DEFAULT_FONTS["heading"],
@@ -139,11 +199,15 @@ class BookDocument:
             alignment=TA_CENTER,
             spaceAfter=30,
         )
-        self.flowables.append(Paragraph("Table of Contents", toc_header_style))
-        self.flowables.append(Spacer(1, 0.5 * inch))
 
         # Create TOC with custom styles
-        self._toc = TableOfContents()
+        # The TOC table would otherwise set ReportLab's default Helvetica
+        self._toc = TableOfContents(
+            tableStyle=TableStyle(
+                defaultTableStyle.getCommands()
+                + [("FONTNAME", (0, 0), (-1, -1), DEFAULT_FONTS["body"])]
+            )
+        )
         self._toc.levelStyles = [
             # Level 0 - Main sections (chapters, puzzle sections)
             ParagraphStyle(
@@ -166,8 +230,16 @@ class BookDocument:
                 spaceAfter=2,
             ),
         ]
-        self.flowables.append(self._toc)
-        self.flowables.append(PageBreak())
+        # The same TOC object is laid out in every pass
+        toc = self._toc
+        self.sections.append(
+            lambda: [
+                Paragraph("Table of Contents", toc_header_style),
+                Spacer(1, 0.5 * inch),
+                toc,
+                PageBreak(),
+            ]
+        )
         return self
 
     def add_chapter(self, chapter_path: Path, title: str) -> "BookDocument":
@@ -182,52 +254,138 @@ class BookDocument:
             logger.warning(f"Chapter not found: {full_path}")
             return self
 
-        # Add TOC notification flowable (tracks page number)
-        if self._has_toc:
-            self.flowables.append(TOCNotifyFlowable(title, level=1))
-
         # Track for internal reference
         self.toc_entries.append(TOCEntry(title, level=1))
 
-        logger.info(f"Rendering chapter: {title}")
-        chapter_flowables = self.chapter_renderer.render_chapter(full_path, title)
-        self.flowables.extend(chapter_flowables)
-        self.flowables.append(PageBreak())
+        if self.render_cache is not None:
+            self._add_cached_chapter(full_path, title)
+        else:
+            logger.info(f"Adding chapter: {title}")
+            self.sections.append(
+                partial(self._chapter_flowables, full_path, title, self._has_toc)
+            )
         return self
 
+    def _chapter_flowables(self, full_path: Path, title: str, notify: bool) -> list:
+        """Render a chapter, preceded by its TOC notification if notify."""
+        flowables = [TOCNotifyFlowable(title, level=1)] if notify else []
+        flowables.extend(self.chapter_renderer.render_chapter(full_path, title))
+        flowables.append(PageBreak())
+        return flowables
+
+    def _add_cached_chapter(self, full_path: Path, title: str) -> None:
+        """Add a chapter rendered on pages of its own, reusing a cached render.
+
+        Chapters start and end on a page break, so their pages do not depend
+        on what comes before them. The layout pass only reserves the pages;
+        the rendered chapter is stamped onto them afterwards.
+        """
+        cache = self.render_cache
+        parts = ["chapter", title]
+        for dependency in self.chapter_renderer.chapter_dependencies(full_path):
+            parts.extend([dependency.name, dependency.read_bytes()])
+        key = cache.key(*parts)
+
+        path = cache.get(key)
+        if path is None:
+            logger.info(f"Rendering chapter: {title}")
+            chapter_flowables = self.chapter_renderer.render_chapter(full_path, title)
+            part = cache.path(key).with_suffix(".part")
+            self.build_pages(chapter_flowables + [PageBreak()], part)
+            path = cache.put(key, part)
+        else:
+            logger.info(f"Reusing rendered chapter: {title}")
+
+        from pdfrw import PdfReader
+
+        page_count = len(PdfReader(str(path)).pages)
+        self.deferred_count += page_count
+        self.sections.append(
+            partial(
+                self._reserved_pages, str(path), page_count, key, title, self._has_toc
+            )
+        )
+
+    def _reserved_pages(
+        self, pdf_path: str, page_count: int, block: str, title: str, notify: bool
+    ) -> Iterator:
+        """Reserve the pages of a rendered chapter, preceded by its TOC notification."""
+        if notify:
+            yield TOCNotifyFlowable(title, level=1)
+        for index in range(page_count):
+            yield Deferred(PageMarker(), "pages", (pdf_path, index), block)
+            yield PageBreak()
+
     def add_section_header(self, title: str) -> "BookDocument":
         """Add a section header page.
 
         Args:
             title: Section title.
         """
-        # Add TOC notification flowable (tracks page number)
-        if self._has_toc:
-            self.flowables.append(TOCNotifyFlowable(title, level=0))
-
         # Track for internal reference
         self.toc_entries.append(TOCEntry(title, level=0))
-        self.flowables.extend(self.assembler.build_section_header(title))
+        self.sections.append(partial(self._section_header, title, self._has_toc))
         return self
 
+    def _section_header(self, title: str, notify: bool) -> list:
+        """Section header page, preceded by its TOC notification if notify."""
+        flowables = [TOCNotifyFlowable(title, level=0)] if notify else []
+        flowables.extend(self.assembler.build_section_header(title))
+        return flowables
+
+    @property
+    def duplicate_index(self):
+        """Fingerprint index keeping this book's puzzles unique.
+
+        With ``puzzles.unique_across_books`` set in book.yaml, the index is
+        shared by all books next to this one. This book's claims are
+        cleared first, as the build claims its puzzles again, and so are
+        those of books that no longer exist. Otherwise the index lives in
+        memory for this build only.
+
+        Opened on first use, so builds without puzzles never touch it.
+        """
+        if self._duplicate_index is None:
+            from src.puzzle_generation import DuplicateIndex
+
+            if not self.config.puzzles.unique_across_books:
+                self._duplicate_index = DuplicateIndex()
+                return self._duplicate_index
+
+            books_dir = self.book_dir.parent
+            index = DuplicateIndex(books_dir / DUPLICATE_INDEX_FILENAME)
+            for book in index.books():
+                if book == self.book_dir.name or not (books_dir / book).is_dir():
+                    removed = index.release(book)
+                    logger.debug(f"Released {removed} puzzles claimed by {book}")
+            self._duplicate_index = index
+        return self._duplicate_index
+
     def add_puzzle_section(
-        self, section: PuzzleSectionConfig, cache_dir: Optional[Path] = None
+        self,
+        section: PuzzleSectionConfig,
+        cache_dir: Optional[Path] = None,
+        duplicates=None,
     ) -> "BookDocument":
         """Add a puzzle section with generated puzzles.
 
         Args:
             section: Puzzle section configuration.
             cache_dir: Directory for puzzle caching.
+            duplicates: DuplicateIndex keeping puzzles unique; defaults to
+                duplicate_index.
         """
         if cache_dir is None:
             cache_dir = self.book_dir / "output" / "puzzles"
+        if duplicates is None:
+            duplicates = self.duplicate_index
 
         # Section header
         if section.title:
             self.add_section_header(section.title)
 
-        # Generate puzzles
-        puzzles = self.assembler.generate_puzzles_for_section(section, cache_dir)
+        # Generate puzzles; flowables get references and load grids when drawn
+        puzzles = self.assembler.puzzle_refs_for_section(section, cache_dir, duplicates)
 
         # Map difficulty to display name
         difficulty_labels = {
@@ -239,24 +397,30 @@ class BookDocument:
             section.difficulty, section.difficulty.title()
         )
 
-        # Add puzzles as flowables
+        # Number the puzzles; their flowables are built during layout
+        block = f"puzzles-{self._puzzle_num}"
+        entries = []
         for puzzle in puzzles:
-            pf = PuzzleFlowable(
-                puzzle=puzzle,
-                puzzle_number=self._puzzle_num,
-                difficulty=difficulty_label,
-                max_width=self.content_width,
-                max_height=self.content_height,
-                show_rules=True,
-            )
-            self.flowables.append(pf)
-            self.flowables.append(PageBreak())
-
-            self.all_puzzles.append((self._puzzle_num, puzzle, difficulty_label))
+            entries.append((self._puzzle_num, puzzle, difficulty_label))
             self._puzzle_num += 1
+        self.all_puzzles.extend(entries)
+        self.deferred_count += len(entries)
+        self.sections.append(partial(self._puzzle_pages, entries, block))
 
         return self
 
+    def _puzzle_pages(self, entries: list[tuple], block: str) -> Iterator:
+        """One page per puzzle entry, built as it is laid out."""
+        for entry in entries:
+            pf = build_puzzle_flowable(
+                entry,
+                self.content_width,
+                self.content_height,
+                self.config.layout.render_mode,
+            )
+            yield Deferred(pf, "puzzle", entry, block)
+            yield PageBreak()
+
     def add_solutions(self) -> "BookDocument":
         """Add the solutions section."""
         if not self.all_puzzles:
@@ -265,36 +429,15 @@ class BookDocument:
 
         self.add_section_header("Solutions")
 
-        from reportlab.platypus import Table
-
-        solutions_per_row = 3
-        solution_col_width = self.content_width / solutions_per_row
-        solution_row_height = (self.content_height - 40) / 4
-
-        for i in range(0, len(self.all_puzzles), solutions_per_row):
-            row_puzzles = self.all_puzzles[i : i + solutions_per_row]
-            row_flowables = []
-
-            for num, puzzle, _ in row_puzzles:
-                sf = SolutionFlowable(
-                    puzzle=puzzle,
-                    puzzle_number=num,
-                    max_cell_size=14,
-                    max_width=solution_col_width - 10,
-                    max_height=solution_row_height - 10,
-                )
-                row_flowables.append(sf)
-
-            # Pad row if needed
-            while len(row_flowables) < solutions_per_row:
-                row_flowables.append(Spacer(1, 1))
+        entries = list(self.all_puzzles)
+        render_mode = self.config.layout.render_mode
+        self.deferred_count += 1
 
-            table = Table(
-                [row_flowables], colWidths=[solution_col_width] * solutions_per_row
-            )
-            self.flowables.append(table)
-            self.flowables.append(Spacer(1, 10))
+        def solutions():
+            sheet = build_solution_sheet(entries, render_mode)
+            return [Deferred(sheet, "solutions", sheet.entries, "solutions")]
 
+        self.sections.append(solutions)
         return self
 
     def add_about_author(self, markdown_path: Optional[Path] = None) -> "BookDocument":
@@ -303,7 +446,15 @@ class BookDocument:
         Args:
             markdown_path: Optional path to markdown file with author info.
         """
-        self.flowables.append(PageBreak())
+        full_path = self.book_dir / markdown_path if markdown_path else None
+        if full_path and not full_path.exists():
+            logger.warning(f"About author file not found: {full_path}")
+        self.sections.append(partial(self._about_author, full_path))
+        return self
+
+    def _about_author(self, full_path: Optional[Path]) -> list:
+        """About the author page, rendered from full_path if given."""
+        flowables = [PageBreak()]
 
         header_style = ParagraphStyle(
             "AboutHeader",
@@ -322,24 +473,22 @@ class BookDocument:
             alignment=TA_CENTER,
         )
 
-        self.flowables.append(Spacer(1, 2 * inch))
-        self.flowables.append(Paragraph("About the Author", header_style))
+        flowables.append(Spacer(1, 2 * inch))
+        flowables.append(Paragraph("About the Author", header_style))
 
-        if markdown_path:
-            full_path = self.book_dir / markdown_path
+        if full_path:
             if full_path.exists():
                 about_flowables = self.chapter_renderer.render_chapter(
                     full_path, "About the Author"
                 )
-                self.flowables.extend(about_flowables)
+                flowables.extend(about_flowables)
             else:
-                logger.warning(f"About author file not found: {full_path}")
-                self.flowables.append(
+                flowables.append(
                     Paragraph("[Author biography placeholder]", body_style)
                 )
         else:
             author = self.config.metadata.author or "Anonymous"
-            self.flowables.append(
+            flowables.append(
                 Paragraph(
                     f"{author} enjoys creating puzzle books that challenge "
                     f"and entertain solvers of all skill levels.",
@@ -347,8 +496,8 @@ class BookDocument:
                 )
             )
 
-        self.flowables.append(PageBreak())
-        return self
+        flowables.append(PageBreak())
+        return flowables
 
     def add_notes_pages(self, count: int = 4) -> "BookDocument":
         """Add blank notes/scratch pages.
@@ -356,6 +505,11 @@ class BookDocument:
         Args:
             count: Number of notes pages to add.
         """
+        self.sections.append(partial(self._notes_pages, count))
+        return self
+
+    def _notes_pages(self, count: int) -> list:
+        """Blank notes pages."""
         header_style = ParagraphStyle(
             "NotesHeader",
             fontName=DEFAULT_FONTS["heading"],
@@ -364,29 +518,30 @@ class BookDocument:
             alignment=TA_CENTER,
         )
 
+        flowables = []
         for i in range(count):
-            self.flowables.append(Spacer(1, 0.5 * inch))
-            self.flowables.append(Paragraph("Notes", header_style))
-            self.flowables.append(Spacer(1, 0.5 * inch))
+            flowables.append(Spacer(1, 0.5 * inch))
+            flowables.append(Paragraph("Notes", header_style))
+            flowables.append(Spacer(1, 0.5 * inch))
             # Ruled lines would go here in a more complex implementation
-            self.flowables.append(PageBreak())
+            flowables.append(PageBreak())
 
-        return self
+        return flowables
 
     def finalize_toc(self) -> "BookDocument":
         """Finalize the table of contents with page numbers.
 
-        ReportLab's TableOfContents handles this automatically via
-        multi-pass building (multiBuild).
+        Page numbers are planned when the book is built (see page_plan).
         """
-        # TableOfContents is automatically populated during multiBuild
         return self
 
-    def save(self, output_path: Optional[Path] = None) -> Path:
+    def save(self, output_path: Optional[Path] = None, workers: int = 1) -> Path:
         """Build and save the PDF.
 
         Args:
             output_path: Output path. Defaults to books/{book_id}/output/interior.pdf
+            workers: Processes drawing puzzle and solution grids; 1 draws
+                them in this process, 0 uses one per CPU core.
 
         Returns:
             Path to the saved PDF.
@@ -396,10 +551,48 @@ class BookDocument:
             output_dir.mkdir(parents=True, exist_ok=True)
             output_path = output_dir / "interior.pdf"
 
+        if workers == 0:
+            workers = os.cpu_count() or 1
+
+        if self.deferred_count and (workers > 1 or self.render_cache is not None):
+            save_in_parts(self, output_path, workers)
+        else:
+            self.build(output_path)
+
+        logger.info(f"Book saved to: {output_path}")
+        return output_path
+
+    def build(
+        self,
+        output_path: Path,
+        deferred_as: Optional[Callable[[Deferred], Flowable]] = None,
+    ) -> None:
+        """Lay out the book into a PDF with page numbers (and TOC if added).
+
+        Args:
+            output_path: Output path.
+            deferred_as: Returns the flowable laid out for a Deferred item;
+                by default the item's own flowable. Planning TOC page
+                numbers only sizes them.
+        """
         if self._has_toc:
-            # Use BaseDocTemplate with multiBuild for TOC support
-            doc = self._create_multibuild_doc(output_path)
-            doc.multiBuild(self.flowables)
+            # Plan TOC page numbers in one measuring pass, then render once
+            headings = [(entry.level, entry.title) for entry in self.toc_entries]
+            plan = plan_pages(
+                self._create_toc_doc,
+                self.flowables(lambda deferred: SizedStandIn(deferred.flowable)),
+                self._toc,
+                headings,
+            )
+            for entry, (_, _, page) in zip(self.toc_entries, plan.toc_entries):
+                entry.page_number = page
+            build_planned(
+                self._create_toc_doc,
+                self.flowables(deferred_as),
+                self._toc,
+                plan,
+                output_path,
+            )
         else:
             # Simple build without TOC
             doc = SimpleDocTemplate(
@@ -411,27 +604,48 @@ class BookDocument:
                 bottomMargin=self.margins.bottom * inch,
                 title=self.config.metadata.title,
                 author=self.config.metadata.author,
+                initialFontName=DEFAULT_FONTS["body"],
             )
             doc.build(
-                self.flowables,
+                FlowableStream(self.flowables(deferred_as)),
                 onFirstPage=self._add_page_number,
                 onLaterPages=self._add_page_number,
             )
 
-        logger.info(f"Book saved to: {output_path}")
-        return output_path
+    def build_pages(self, flowables: list, output_path: Path) -> None:
+        """Lay out flowables on plain pages: same frame, no page numbers or TOC.
 
-    def _create_multibuild_doc(self, output_path: Path) -> BaseDocTemplate:
-        """Create a BaseDocTemplate configured for multi-pass TOC building."""
-        doc = BaseDocTemplate(
+        Args:
+            flowables: Flowables starting on a fresh page.
+            output_path: Output path.
+        """
+        doc = SimpleDocTemplate(
             str(output_path),
             pagesize=(self.page_width, self.page_height),
             leftMargin=self.margins.left * inch,
             rightMargin=self.margins.right * inch,
             topMargin=self.margins.top * inch,
             bottomMargin=self.margins.bottom * inch,
+            initialFontName=DEFAULT_FONTS["body"],
+        )
+        doc.build(flowables)
+
+    def _create_toc_doc(self, output) -> PlanningDocTemplate:
+        """Create the doc template for a book with a TOC.
+
+        Args:
+            output: Output path or file object.
+        """
+        doc = PlanningDocTemplate(
+            output,
+            pagesize=(self.page_width, self.page_height),
+            leftMargin=self.margins.left * inch,
+            rightMargin=self.margins.right * inch,
+            topMargin=self.margins.top * inch,
+            bottomMargin=self.margins.bottom * inch,
             title=self.config.metadata.title,
             author=self.config.metadata.author,
+            initialFontName=DEFAULT_FONTS["body"],
         )
 
         # Create a frame for the content area
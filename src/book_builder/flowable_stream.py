@@ -0,0 +1,43 @@
+"""
+Lazily produced flowables for Platypus builds.
+
+A doc template lays out a list of flowables, taking them from the front.
+It only looks past the first one along a chain of keepWithNext flowables,
+which it lays out together with the flowable that follows. FlowableStream
+is a list that refills itself from an iterator whenever layout asks how
+long it is, holding just enough flowables for that lookahead. A book's
+sections can then be produced one after the other while the book is laid
+out, and each flowable is released once it has been placed.
+"""
+
+from typing import Iterable
+
+_EXHAUSTED = object()
+
+
+class FlowableStream(list):
+    """List of flowables pulled from an iterator as layout consumes them."""
+
+    def __init__(self, flowables: Iterable):
+        """Wrap flowables to be produced on demand.
+
+        Args:
+            flowables: Flowables in book order, typically a generator.
+        """
+        super().__init__()
+        self._source = iter(flowables)
+
+    def __len__(self) -> int:
+        """Top up the buffer and return its length.
+
+        The buffer holds at least one flowable and never ends in a
+        keepWithNext flowable unless the iterator is exhausted.
+        """
+        while True:
+            length = super().__len__()
+            if length and not self[-1].getKeepWithNext():
+                return length
+            flowable = next(self._source, _EXHAUSTED)
+            if flowable is _EXHAUSTED:
+                return length
+            self.append(flowable)
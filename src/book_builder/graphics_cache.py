@@ -0,0 +1,173 @@
+"""
+Disk cache of converted SVG and PDF figures.
+
+A chapter is rendered for the planning and the rendering pass of every
+build, and each time svglib converted its SVG figures and pdfrw parsed its
+PDF figures again. GraphicsCache keeps the converted figure, a scaled
+Drawing or a page's form XObject, keyed by a hash of the figure file, the
+size it is drawn at and the versions of the libraries involved, so an
+unchanged figure is loaded from a single pickle.
+
+pdfrw objects cannot be pickled as they are: they resolve references
+through the reader that loaded them. freeze_pdf_object flattens a form
+XObject into plain nodes and thaw_pdf_object rebuilds it.
+
+Entries are written under a temporary name and renamed into place, so
+concurrent builds and worker processes can share a cache directory.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+import reportlab
+
+logger = logging.getLogger(__name__)
+
+GRAPHICS_CACHE_DIRNAME = "graphics_cache"
+
+# Bump when the format of cached entries changes
+CACHE_FORMAT = 1
+
+_DICT = "dict"
+_ARRAY = "array"
+
+
+class _Node(NamedTuple):
+    """Reference to another node of a frozen PDF object."""
+
+    number: int
+
+
+def freeze_pdf_object(root) -> list[tuple]:
+    """Flatten a pdfrw object graph into picklable nodes.
+
+    Every dictionary and array becomes a (kind, indirect, stream, entries)
+    node, with references to other nodes as _Node. Shared objects stay
+    shared. Indirect references are resolved, so the source file is not
+    needed to rebuild the graph.
+
+    Args:
+        root: A pdfrw PdfDict, e.g. a form XObject from pagexobj.
+
+    Returns:
+        The nodes, the root first.
+    """
+    from pdfrw import PdfArray, PdfDict
+
+    nodes: list = []
+    numbers: dict[int, int] = {}
+
+    def freeze(obj):
+        if not isinstance(obj, (PdfDict, PdfArray)):
+            return obj
+        if id(obj) in numbers:
+            return _Node(numbers[id(obj)])
+        number = numbers[id(obj)] = len(nodes)
+        nodes.append(None)
+        if isinstance(obj, PdfDict):
+            entries = [(key, freeze(value)) for key, value in obj.iteritems()]
+            nodes[number] = (_DICT, bool(obj.indirect), obj.stream, entries)
+        else:
+            entries = [freeze(value) for value in obj]
+            nodes[number] = (_ARRAY, bool(obj.indirect), None, entries)
+        return _Node(number)
+
+    freeze(root)
+    return nodes
+
+
+def thaw_pdf_object(nodes: list[tuple]):
+    """Rebuild the pdfrw object graph flattened by freeze_pdf_object.
+
+    Args:
+        nodes: Nodes from freeze_pdf_object.
+
+    Returns:
+        The root object.
+    """
+    from pdfrw import PdfArray, PdfDict
+
+    objects = [PdfDict() if node[0] == _DICT else PdfArray() for node in nodes]
+
+    def thaw(value):
+        return objects[value.number] if isinstance(value, _Node) else value
+
+    for obj, (kind, indirect, stream, entries) in zip(objects, nodes):
+        obj.indirect = indirect
+        if kind == _DICT:
+            for key, value in entries:
+                obj[key] = thaw(value)
+            # /Length is among the entries already
+            obj._stream = stream
+        else:
+            obj.extend(thaw(value) for value in entries)
+    return objects[0]
+
+
+class GraphicsCache:
+    """Converted figures keyed by file content and drawing size."""
+
+    def __init__(self, cache_dir: Path):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached figures (created on first
+                write).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source: Path, *parts) -> str:
+        """Hash a figure file's contents and parts (str()-able) into a key."""
+        digest = hashlib.sha256(f"{CACHE_FORMAT}:{reportlab.Version}".encode())
+        digest.update(source.read_bytes())
+        for part in parts:
+            digest.update(b"\0")
+            digest.update(str(part).encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Location of the entry for a key."""
+        return self.cache_dir / f"{key}.pickle"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None.
+
+        An entry that cannot be loaded is removed and counts as a miss, so
+        the figure is converted and cached again.
+        """
+        path = self.path(key)
+        if not path.exists():
+            self.misses += 1
+            return None
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached figure {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value under a key; failures are logged, not raised."""
+        path = self.path(key)
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Written under a temporary name so concurrent builds never read
+            # a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning(f"Could not cache converted figure {path.name}: {e}")
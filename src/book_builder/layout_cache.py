@@ -0,0 +1,90 @@
+"""
+Measurements shared between flowables built from the same definition.
+
+Diagrams and reference tables are defined once (see the diagrams package)
+and turned into a new flowable every time their chapter is rendered: for
+the book, for a cached chapter, or for a chapters-only build. Measuring
+one wraps a Paragraph per annotation, so the attributes their
+_calculate_dimensions sets are kept here per definition content and
+parameters and copied onto later flowables instead of being worked out
+again.
+"""
+
+import copy
+import hashlib
+import logging
+from typing import Callable, Hashable, Iterable
+
+from reportlab.platypus import Flowable
+
+logger = logging.getLogger(__name__)
+
+
+def definition_digest(definition: object) -> str:
+    """
+    Hash of a definition's content.
+
+    Definitions are dataclasses, so their repr lists every field, nested
+    definitions included; equal definitions get the same digest however
+    many times they are loaded.
+
+    Args:
+        definition: Diagram or reference table definition
+
+    Returns:
+        Hex digest of the definition's repr
+    """
+    return hashlib.sha256(repr(definition).encode()).hexdigest()
+
+
+class MeasurementCache:
+    """Attributes set by flowables' measuring methods, keyed by their inputs."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        # (flowable class, definition digest, params) -> {attribute: value}
+        self._entries: dict[tuple, dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def apply(
+        self,
+        flowable: Flowable,
+        definition: object,
+        params: Hashable,
+        calculate: Callable[[], None],
+        attributes: Iterable[str],
+    ) -> None:
+        """
+        Give a flowable the measurements of its definition and parameters.
+
+        Args:
+            flowable: Flowable being measured
+            definition: Object the flowable was built from, keyed on its
+                content (see definition_digest)
+            params: Every other input the measurements depend on
+            calculate: Measures the flowable by setting attributes on it
+            attributes: Names of the attributes calculate sets, which wrap
+                and draw read
+        """
+        key = (type(flowable), definition_digest(definition), params)
+        measured = self._entries.get(key)
+        if measured is not None:
+            self.hits += 1
+            for name, value in measured.items():
+                setattr(flowable, name, copy.copy(value))
+            return
+
+        self.misses += 1
+        calculate()
+        self._entries[key] = {
+            name: copy.copy(getattr(flowable, name)) for name in attributes
+        }
+
+    def clear(self) -> None:
+        """Forget all measurements."""
+        self._entries.clear()
+
+
+# Shared by every diagram and reference table flowable
+MEASUREMENTS = MeasurementCache()
@@ -0,0 +1,173 @@
+"""
+Page planning for books with a table of contents.
+
+multiBuild lays out and draws the whole book again and again until the TOC's
+page numbers stop changing. Only the TOC's size feeds back into the layout,
+and a TableOfContents is as tall as its titles make it: page numbers are
+drawn in its right-hand column at draw time. So a single measuring pass,
+with the TOC filled with every heading and placeholder page numbers, puts
+each heading on its final page. Puzzle pages and solution sheets take their
+space in that pass as stand-ins that draw nothing; only chapters and other
+flowing content are laid out for real. The book is then rendered once with
+the planned page numbers.
+
+Both passes consume their flowables as a FlowableStream, so the book's
+flowables are produced afresh for each pass and never held all at once.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Callable, Iterable
+
+from reportlab.platypus import BaseDocTemplate, Flowable
+from reportlab.platypus.tableofcontents import TableOfContents
+
+from .flowable_stream import FlowableStream
+
+logger = logging.getLogger(__name__)
+
+# Page number shown in the TOC while planning; it never affects the layout
+PLACEHOLDER_PAGE = 0
+
+
+class PlanningDocTemplate(BaseDocTemplate):
+    """Doc template that records where TOC headings land.
+
+    Layout marks flowables it postpones or keeps together. Like multiBuild,
+    the template logs those edits so flowables used in both passes, such as
+    the TableOfContents, can be laid out again.
+    """
+
+    def __init__(self, filename, **kwargs):
+        """Initialize the template; kwargs are passed to BaseDocTemplate."""
+        super().__init__(filename, **kwargs)
+        self.toc_entries: list[tuple] = []
+        self._layout_edits: list[tuple] = []
+        self._multiBuildEdits = self._layout_edits.append
+
+    def undo_layout_edits(self) -> None:
+        """Revert the marks layout left on the flowables."""
+        while self._layout_edits:
+            edit = self._layout_edits.pop(0)
+            edit[0](*edit[1:])
+
+    def notify(self, kind, stuff):
+        """Record (level, title, page) of each TOCEntry notification."""
+        if kind == "TOCEntry":
+            self.toc_entries.append(tuple(stuff))
+        super().notify(kind, stuff)
+
+
+class SizedStandIn(Flowable):
+    """Stand-in that takes a flowable's space and draws nothing."""
+
+    def __init__(self, flowable: Flowable):
+        """Wrap a flowable that only needs measuring.
+
+        Args:
+            flowable: The real flowable, used for sizing only.
+        """
+        super().__init__()
+        self.flowable = flowable
+        self.hAlign = getattr(flowable, "hAlign", self.hAlign)
+        self.vAlign = getattr(flowable, "vAlign", self.vAlign)
+
+    def wrap(self, available_width, available_height):
+        """Size exactly like the wrapped flowable."""
+        self.width, self.height = self.flowable.wrap(available_width, available_height)
+        return self.width, self.height
+
+    def split(self, available_width, available_height):
+        """Split like the wrapped flowable."""
+        parts = self.flowable.split(available_width, available_height)
+        return [SizedStandIn(part) for part in parts]
+
+    def draw(self):
+        """Draw nothing."""
+
+
+@dataclass
+class PagePlan:
+    """
+    Page numbers worked out by the measuring pass.
+
+    Attributes:
+        toc_entries: (level, title, page) of every heading, in book order
+        page_count: Number of pages in the book
+    """
+
+    toc_entries: list[tuple] = field(default_factory=list)
+    page_count: int = 0
+
+
+def set_toc_entries(toc: TableOfContents, entries: list[tuple]) -> None:
+    """Make a TableOfContents lay out the given (level, title, page) entries."""
+    toc.clearEntries()
+    toc.addEntries(entries)
+    # The TOC draws its previous run's entries
+    toc.beforeBuild()
+
+
+def plan_pages(
+    make_doc: Callable[[object], PlanningDocTemplate],
+    flowables: Iterable,
+    toc: TableOfContents,
+    headings: list[tuple],
+) -> PagePlan:
+    """
+    Lay out a book once to find the page of every TOC heading.
+
+    Args:
+        make_doc: Creates the book's doc template for a file or file object
+        flowables: The book's flowables, with SizedStandIns for those that
+            only need sizing
+        toc: The book's table of contents
+        headings: (level, title) of every heading, in book order
+
+    Returns:
+        Page plan of the book
+    """
+    set_toc_entries(
+        toc, [(level, title, PLACEHOLDER_PAGE) for level, title in headings]
+    )
+
+    doc = make_doc(BytesIO())
+    doc.build(FlowableStream(flowables))
+    doc.undo_layout_edits()
+
+    plan = PagePlan(doc.toc_entries, doc.page)
+    logger.debug(
+        f"Planned {plan.page_count} pages with {len(plan.toc_entries)} TOC entries"
+    )
+    return plan
+
+
+def build_planned(
+    make_doc: Callable[[object], PlanningDocTemplate],
+    flowables: Iterable,
+    toc: TableOfContents,
+    plan: PagePlan,
+    output_path,
+) -> None:
+    """
+    Render a book in one pass with the TOC page numbers from its plan.
+
+    Args:
+        make_doc: Creates the book's doc template for a file or file object
+        flowables: The book's flowables, produced afresh
+        toc: The book's table of contents
+        plan: Plan from plan_pages for the same book
+        output_path: Output path
+
+    Raises:
+        RuntimeError: If a heading landed on a page other than planned
+    """
+    set_toc_entries(toc, plan.toc_entries)
+    doc = make_doc(str(output_path))
+    doc.build(FlowableStream(flowables))
+
+    if doc.toc_entries != plan.toc_entries:
+        raise RuntimeError(
+            "Table of contents page numbers changed between planning and rendering"
+        )
@@ -0,0 +1,503 @@
+"""
+Building a book in parts: parallel and incremental rendering.
+
+Puzzle pages and solution sheets are fixed-layout and independent of each
+other, so their grids can be drawn in worker processes. A parallel build
+first lays out the whole book as usual (chapters, TOC and page numbers
+included) with each puzzle page and solution sheet replaced by a stand-in
+of the same size that only records where it landed (a sheet records one
+placement per page). The layout pass runs in this process; only drawing
+is spread over workers. The page plan is split into chunks at section
+boundaries; each worker draws its chunk's grids at the recorded positions
+into a PDF of its own, and the chunks are stamped onto the laid-out pages
+with pdfrw. Font subsets repeated across the stamped PDFs are written once.
+
+Incremental builds use the same stamping. Chapters rendered on their own
+pages reserve blank pages in the layout (PageMarker), and each puzzle
+section or solutions block is cached as one PDF keyed by its puzzles and
+placement, so only blocks missing from the render cache are drawn.
+"""
+
+import hashlib
+import logging
+import math
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from pdfrw import PdfArray, PdfDict, PdfName, PdfReader, PdfWriter
+from pdfrw.buildxobj import pagexobj
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable
+
+# Module import: fonts itself imports book_builder.config
+from src.pdf_generation import fonts
+from .config import DEFAULT_FONTS
+from .puzzle_flowable import build_puzzle_flowable, build_solution_sheet
+from .render_cache import RenderCache
+from src.puzzle_generation.refs import puzzle_digest
+
+if TYPE_CHECKING:
+    from .document import BookDocument
+
+logger = logging.getLogger(__name__)
+
+# Chunks per worker; more than one evens out chunks that render slowly
+CHUNKS_PER_WORKER = 2
+
+
+@dataclass
+class Deferred:
+    """
+    A flowable in a book's sections that can be drawn apart from layout.
+
+    Attributes:
+        flowable: The flowable, drawn in place by an ordinary build
+        kind: PlacedItem kind
+        entry: PlacedItem entry
+        block: PlacedItem block
+    """
+
+    flowable: Flowable
+    kind: str
+    entry: object
+    block: str
+
+
+@dataclass
+class PlacedItem:
+    """
+    A puzzle page or page of solutions and where the layout pass put it.
+
+    Attributes:
+        kind: "puzzle" for a puzzle page, "solutions" for the part of the
+            solution sheet on one page, "pages" for a page of an already
+            rendered PDF
+        entry: Puzzle entry, list of entries for solutions, or
+            (pdf_path, page_index) for "pages"
+        block: Section the item belongs to; blocks are cached as a whole
+        page: 1-based page number
+        x: Left edge in page coordinates
+        y: Bottom edge in page coordinates
+        avail_width: Width the frame offered when the item was placed
+        avail_height: Height the frame offered when the item was placed
+    """
+
+    kind: str
+    entry: object
+    block: str = ""
+    page: int = 0
+    x: float = 0.0
+    y: float = 0.0
+    avail_width: float = 0.0
+    avail_height: float = 0.0
+
+
+@dataclass
+class ChunkJob:
+    """
+    Pages one worker draws.
+
+    Attributes:
+        pages: Page numbers of the chunk, in order
+        items: Items placed on those pages
+        page_size: (width, height) in points
+        content_width: Content width the flowables were built with
+        content_height: Content height the flowables were built with
+        render_mode: Grid render mode
+        output_path: Where the worker writes the chunk PDF
+    """
+
+    pages: list[int]
+    items: list[PlacedItem]
+    page_size: tuple[float, float]
+    content_width: float
+    content_height: float
+    render_mode: str
+    output_path: str = ""
+
+
+class PageMarker(Flowable):
+    """Empty flowable reserving a page that is stamped after layout."""
+
+    def wrap(self, available_width, available_height):
+        """Take no space."""
+        return 0, 0
+
+    def draw(self):
+        """Draw nothing."""
+
+
+class PlacedFlowable(Flowable):
+    """Stand-in that takes a flowable's space and records its placement."""
+
+    def __init__(self, flowable: Flowable, item: PlacedItem, placed: list):
+        """Wrap a flowable whose drawing is deferred to a worker.
+
+        Args:
+            flowable: The real flowable, used for sizing only.
+            item: Placement record to fill in when drawn.
+            placed: List the item is appended to when drawn.
+        """
+        super().__init__()
+        self.flowable = flowable
+        self.item = item
+        self.placed = placed
+        self.hAlign = getattr(flowable, "hAlign", self.hAlign)
+        self.vAlign = getattr(flowable, "vAlign", self.vAlign)
+
+    def wrap(self, available_width, available_height):
+        """Size exactly like the wrapped flowable."""
+        self.item.avail_width = available_width
+        self.item.avail_height = available_height
+        self.width, self.height = self.flowable.wrap(available_width, available_height)
+        return self.width, self.height
+
+    def split(self, available_width, available_height):
+        """Split like the wrapped solution sheet; each part is placed apart."""
+        parts = self.flowable.split(available_width, available_height)
+        return [
+            PlacedFlowable(
+                part,
+                PlacedItem(self.item.kind, part.entries, self.item.block),
+                self.placed,
+            )
+            for part in parts
+        ]
+
+    def draw(self):
+        """Record the page and position instead of drawing."""
+        self.item.page = self.canv.getPageNumber()
+        self.item.x, self.item.y = self.canv.absolutePosition(0, 0)
+        self.placed.append(self.item)
+
+
+def _build_flowable(item: PlacedItem, job: ChunkJob) -> Flowable:
+    """Rebuild the real flowable for a placed item."""
+    if item.kind == "puzzle":
+        return build_puzzle_flowable(
+            item.entry, job.content_width, job.content_height, job.render_mode
+        )
+    return build_solution_sheet(item.entry, job.render_mode)
+
+
+def render_chunk(job: ChunkJob) -> str:
+    """
+    Draw a chunk's items at their planned positions, one PDF page per page.
+
+    Args:
+        job: Chunk to draw
+
+    Returns:
+        Path of the chunk PDF
+    """
+    fonts.register_default_fonts()
+    by_page = defaultdict(list)
+    for item in job.items:
+        by_page[item.page].append(item)
+
+    canvas = Canvas(
+        job.output_path,
+        pagesize=job.page_size,
+        initialFontName=DEFAULT_FONTS["body"],
+    )
+    for page in job.pages:
+        for item in by_page[page]:
+            flowable = _build_flowable(item, job)
+            flowable.wrapOn(canvas, item.avail_width, item.avail_height)
+            flowable.drawOn(canvas, item.x, item.y)
+        canvas.showPage()
+    canvas.save()
+    return job.output_path
+
+
+def plan_chunks(
+    items: list[PlacedItem], chunk_count: int, **job_fields
+) -> list[ChunkJob]:
+    """
+    Split placed items into chunks of whole pages.
+
+    Chunks are cut at block boundaries: consecutive blocks are packed into
+    a chunk while they fit its share of the pages, and only a block larger
+    than that share is split, into even runs of pages.
+
+    Args:
+        items: Items with their placement recorded
+        chunk_count: Number of chunks to aim for
+        **job_fields: Remaining ChunkJob fields shared by every chunk
+
+    Returns:
+        Chunks in page order
+    """
+    by_page = defaultdict(list)
+    for item in items:
+        by_page[item.page].append(item)
+    pages = sorted(by_page)
+    size = max(1, math.ceil(len(pages) / chunk_count))
+
+    # Runs of consecutive pages belonging to the same block
+    runs = []
+    for page in pages:
+        block = by_page[page][0].block
+        if runs and runs[-1][0] == block:
+            runs[-1][1].append(page)
+        else:
+            runs.append((block, [page]))
+
+    groups = [[]]
+    for _, run_pages in runs:
+        if len(run_pages) > size:
+            pieces = math.ceil(len(run_pages) / size)
+            step = math.ceil(len(run_pages) / pieces)
+            groups.extend(
+                run_pages[start : start + step]
+                for start in range(0, len(run_pages), step)
+            )
+            groups.append([])
+        elif len(groups[-1]) + len(run_pages) > size:
+            groups.append(list(run_pages))
+        else:
+            groups[-1].extend(run_pages)
+
+    return [
+        ChunkJob(
+            chunk_pages,
+            [item for page in chunk_pages for item in by_page[page]],
+            **job_fields,
+        )
+        for chunk_pages in groups
+        if chunk_pages
+    ]
+
+
+def merge_pages(layout_path: Path, stamps: dict, output_path: Path) -> None:
+    """
+    Stamp rendered pages onto the laid-out pages.
+
+    Each rendered page is added to the laid-out page as a form XObject drawn
+    after the page's own content, which is left in place.
+
+    Args:
+        layout_path: PDF from the layout pass
+        stamps: Page number -> list of (pdf_path, page_index) to stamp on it
+        output_path: Where to write the merged book
+    """
+    layout = PdfReader(str(layout_path))
+    readers = {}
+    # Content streams around a page's own content, shared by every page
+    save = _content_stream("q\n")
+    restore_and_stamp = {}
+    for page_number, sources in stamps.items():
+        page = layout.pages[page_number - 1]
+        resources = PdfDict(page.inheritable.Resources or PdfDict())
+        xobjects = PdfDict(resources.XObject or PdfDict())
+        commands = []
+        for pdf_path, index in sources:
+            if pdf_path not in readers:
+                readers[pdf_path] = PdfReader(pdf_path)
+            name = PdfName(f"Stamp{len(commands)}")
+            xobjects[name] = pagexobj(readers[pdf_path].pages[index])
+            commands.append(f"q {name} Do Q")
+        resources.XObject = xobjects
+        page.Resources = resources
+
+        contents = page.Contents
+        if not isinstance(contents, list):
+            contents = [] if contents is None else [contents]
+        if len(commands) not in restore_and_stamp:
+            restore_and_stamp[len(commands)] = _content_stream(
+                "\nQ\n" + "\n".join(commands) + "\n"
+            )
+        page.Contents = PdfArray([save, *contents, restore_and_stamp[len(commands)]])
+
+    dropped = share_resources(layout.pages)
+    logger.debug(f"Merged {dropped} duplicate resource objects")
+    PdfWriter(str(output_path), trailer=layout).write()
+
+
+def _content_stream(content: str) -> PdfDict:
+    """An indirect content stream, so pages can share it."""
+    stream = PdfDict(stream=content)
+    stream.indirect = True
+    return stream
+
+
+def share_resources(pages: list) -> int:
+    """
+    Replace identical resource objects of the given pages with one object.
+
+    Every stamped PDF embeds its own copy of the font subsets it uses.
+    Subsets of the same glyphs are byte-identical, so after stamping the
+    copies are folded into the first one and written once.
+
+    Args:
+        pages: Pages whose /Resources trees are merged (modified in place)
+
+    Returns:
+        Number of duplicate objects dropped
+    """
+    canonical = {}  # digest -> first object with that content
+    digests = {}  # id(object) -> digest
+
+    def intern(obj) -> bytes:
+        """Digest an object's content, sharing its duplicate children."""
+        if id(obj) in digests:
+            return digests[id(obj)]
+        digests[id(obj)] = b""  # guards against reference cycles
+
+        digest = hashlib.sha256(type(obj).__name__.encode())
+        if isinstance(obj, PdfDict):
+            children = sorted(obj.iteritems(), key=lambda pair: pair[0])
+        else:
+            children = list(enumerate(obj))
+        for key, value in children:
+            if key == "/Parent":
+                continue
+            digest.update(f"{key}\0".encode())
+            if isinstance(value, (PdfDict, PdfArray)):
+                child = intern(value)
+                shared = canonical[child] if child else value
+                if shared is not value:
+                    obj[key] = shared
+                digest.update(child)
+            else:
+                digest.update(f"{value}\0".encode())
+        if isinstance(obj, PdfDict) and obj.stream is not None:
+            digest.update(obj.stream.encode("latin-1"))
+
+        digests[id(obj)] = digest.digest()
+        canonical.setdefault(digests[id(obj)], obj)
+        return digests[id(obj)]
+
+    for page in pages:
+        if page.Resources is not None:
+            intern(page.Resources)
+    return len(digests) - len(canonical)
+
+
+def _block_key(cache: RenderCache, items: list[PlacedItem], job_fields: dict) -> str:
+    """Cache key of a puzzle section or solutions block and its placement."""
+    first_page = items[0].page
+    parts = [items[0].kind, sorted(job_fields.items())]
+    for item in items:
+        entries = [item.entry] if item.kind == "puzzle" else item.entry
+        for number, puzzle, label in entries:
+            parts.append(f"{number}:{label}:{puzzle_digest(puzzle)}")
+        parts.append(
+            (
+                item.page - first_page,
+                item.x,
+                item.y,
+                item.avail_width,
+                item.avail_height,
+            )
+        )
+    return cache.key(*parts)
+
+
+def _write_pages(sources: list[tuple], output_path: Path) -> None:
+    """Copy (pdf_path, page_index) pages into one PDF."""
+    writer = PdfWriter()
+    readers = {}
+    for pdf_path, index in sources:
+        if pdf_path not in readers:
+            readers[pdf_path] = PdfReader(pdf_path)
+        writer.addpage(readers[pdf_path].pages[index])
+    writer.write(str(output_path))
+
+
+def save_in_parts(
+    doc: "BookDocument",
+    output_path: Path,
+    workers: int,
+) -> None:
+    """
+    Build a book whose deferred parts are drawn apart from the layout pass.
+
+    Pages of already rendered PDFs (cached chapters) are stamped as they
+    are. Puzzle and solution blocks come from doc.render_cache when present;
+    the rest are drawn by `workers` processes (in this process for one
+    worker) and added to the cache.
+
+    Args:
+        doc: Book with all content added
+        output_path: Output path
+        workers: Number of worker processes
+    """
+    cache: Optional[RenderCache] = doc.render_cache
+    # Items in the order the layout pass placed them
+    items = []
+
+    def place(deferred: Deferred) -> PlacedFlowable:
+        item = PlacedItem(deferred.kind, deferred.entry, deferred.block)
+        return PlacedFlowable(deferred.flowable, item, items)
+
+    with tempfile.TemporaryDirectory(dir=Path(output_path).parent) as tmp:
+        layout_path = Path(tmp) / "layout.pdf"
+        doc.build(layout_path, deferred_as=place)
+
+        stamps = defaultdict(list)
+        blocks = defaultdict(list)
+        for item in items:
+            if item.kind == "pages":
+                stamps[item.page].append(item.entry)
+            else:
+                blocks[item.block].append(item)
+
+        job_fields = dict(
+            page_size=(doc.page_width, doc.page_height),
+            content_width=doc.content_width,
+            content_height=doc.content_height,
+            render_mode=doc.config.layout.render_mode,
+        )
+
+        # Blocks found in the cache are stamped from there
+        missing = {}
+        for block, block_items in blocks.items():
+            key = _block_key(cache, block_items, job_fields) if cache else None
+            path = cache.get(key) if cache else None
+            if path is None:
+                missing[block] = (key, block_items)
+                continue
+            pages = sorted({item.page for item in block_items})
+            for index, page in enumerate(pages):
+                stamps[page].append((str(path), index))
+
+        to_draw = [item for _, block_items in missing.values() for item in block_items]
+        if to_draw:
+            jobs = plan_chunks(to_draw, workers * CHUNKS_PER_WORKER, **job_fields)
+            for i, job in enumerate(jobs):
+                job.output_path = str(Path(tmp) / f"chunk-{i:03d}.pdf")
+            logger.info(
+                f"Drawing {len(to_draw)} puzzle and solution pages "
+                f"in {len(jobs)} chunks on {workers} workers"
+            )
+
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    list(pool.map(render_chunk, jobs))
+            else:
+                for job in jobs:
+                    render_chunk(job)
+
+            drawn = {}
+            for job in jobs:
+                for index, page in enumerate(job.pages):
+                    drawn[page] = (job.output_path, index)
+                    stamps[page].append(drawn[page])
+
+            if cache:
+                for key, block_items in missing.values():
+                    pages = sorted({item.page for item in block_items})
+                    part = cache.path(key).with_suffix(".part")
+                    _write_pages([drawn[page] for page in pages], part)
+                    cache.put(key, part)
+
+        if cache:
+            logger.info(
+                f"Render cache: {cache.hits} parts reused, {cache.misses} rendered"
+            )
+        merge_pages(layout_path, stamps, output_path)
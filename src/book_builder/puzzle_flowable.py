@@ -3,12 +3,19 @@ Puzzle flowable - wraps puzzle rendering for use in Platypus documents.
 
 This module provides a Flowable wrapper around puzzle grid rendering,
 allowing puzzles to be included in Platypus document flow.
+
+Flowables accept either a Puzzle or a PuzzleRef. With a reference, layout
+uses the grid size stored in the reference and the grid is only loaded
+(through a small LRU cache) when the flowable is drawn.
 """
 
+from typing import Sequence, Union
+
 from reportlab.platypus import Flowable
 from reportlab.lib.colors import HexColor
 
 from src.puzzle_generation import Puzzle
+from src.puzzle_generation.refs import PuzzleRef, puzzle_size, resolve_puzzle
 from src.pdf_generation.renderer import render_grid
 from src.pdf_generation.models import RenderConfig
 from src.book_builder.config import DEFAULT_FONTS
@@ -21,13 +28,19 @@ KAKURO_RULES = [
     "Use logic—no guessing required!",
 ]
 
+# Solutions pages, in points: largest cell size, largest grid width or height
+# (large grids shrink to it) and space between grids
+SOLUTION_CELL_SIZE = 14
+SOLUTION_MAX_GRID_SIZE = 132
+SOLUTION_GAP = 10
+
 
 class PuzzleFlowable(Flowable):
     """A Flowable that renders a Kakuro puzzle grid with rules and header."""
 
     def __init__(
         self,
-        puzzle: Puzzle,
+        puzzle: Union[Puzzle, PuzzleRef],
         puzzle_number: int,
         difficulty: str = "Beginner",
         cell_size: float = 36,
@@ -35,11 +48,12 @@ class PuzzleFlowable(Flowable):
         max_width: float = None,
         max_height: float = None,
         show_rules: bool = True,
+        render_mode: str = "cells",
     ):
         """Initialize puzzle flowable.
 
         Args:
-            puzzle: Puzzle to render.
+            puzzle: Puzzle to render, or a reference loaded when drawn.
             puzzle_number: Puzzle number for labeling.
             difficulty: Difficulty level for header.
             cell_size: Cell size in points.
@@ -47,9 +61,11 @@ class PuzzleFlowable(Flowable):
             max_width: Maximum width in points.
             max_height: Maximum height in points.
             show_rules: Whether to show the rules at top.
+            render_mode: Grid render mode (see RenderConfig.render_mode).
         """
         super().__init__()
-        self.puzzle = puzzle
+        self._puzzle = puzzle
+        self.grid_rows, self.grid_cols = puzzle_size(puzzle)
         self.puzzle_number = puzzle_number
         self.difficulty = difficulty
         self.cell_size = cell_size
@@ -57,15 +73,23 @@ class PuzzleFlowable(Flowable):
         self.max_width = max_width
         self.max_height = max_height
         self.show_rules = show_rules
+        self.render_mode = render_mode
 
         # Layout constants
         self.header_height = 30
         self.rules_height = 80 if show_rules else 0
         self.grid_top_margin = 20
 
+        # Space the current dimensions were calculated for
+        self._wrapped_for = None
+
+    @property
+    def puzzle(self) -> Puzzle:
+        """The puzzle, loaded on first access if given as a reference."""
+        return resolve_puzzle(self._puzzle)
+
     def _calculate_dimensions(self, available_width, available_height):
         """Calculate the flowable and grid dimensions."""
-        grid = self.puzzle.grid
 
         # Calculate available space for the grid
         grid_available_height = (
@@ -78,15 +102,15 @@ class PuzzleFlowable(Flowable):
         grid_available_width = available_width
 
         # Calculate cell size to maximize grid size while fitting
-        cell_size_by_width = grid_available_width / grid.width
-        cell_size_by_height = grid_available_height / grid.height
+        cell_size_by_width = grid_available_width / self.grid_cols
+        cell_size_by_height = grid_available_height / self.grid_rows
 
         # Use the smaller to ensure it fits, but cap at a reasonable maximum
         self.actual_cell_size = min(cell_size_by_width, cell_size_by_height, 50)
 
         # Calculate actual grid dimensions
-        self.grid_width = grid.width * self.actual_cell_size
-        self.grid_height = grid.height * self.actual_cell_size
+        self.grid_width = self.grid_cols * self.actual_cell_size
+        self.grid_height = self.grid_rows * self.actual_cell_size
 
         # Total flowable dimensions
         self.width = available_width
@@ -100,7 +124,10 @@ class PuzzleFlowable(Flowable):
 
     def wrap(self, available_width, available_height):
         """Return the dimensions of the flowable."""
-        self._calculate_dimensions(available_width, available_height)
+        # Platypus and Table wrap the same flowable repeatedly with the same space
+        if self._wrapped_for != (available_width, available_height):
+            self._calculate_dimensions(available_width, available_height)
+            self._wrapped_for = (available_width, available_height)
         return self.width, self.height
 
     def draw(self):
@@ -131,6 +158,7 @@ class PuzzleFlowable(Flowable):
             solution_font_size=max(10.0, 16.0 * scale),
             font_name=DEFAULT_FONTS["body"],
             show_solution=self.show_solution,
+            render_mode=self.render_mode,
         )
 
         # Draw the grid
@@ -141,10 +169,9 @@ class PuzzleFlowable(Flowable):
         canvas.saveState()
 
         # Header text: "Beginner - Puzzle 1 - 6×6"
-        grid = self.puzzle.grid
         header = (
             f"{self.difficulty} – Puzzle {self.puzzle_number} – "
-            f"{grid.width}×{grid.height}"
+            f"{self.grid_cols}×{self.grid_rows}"
         )
 
         canvas.setFont(DEFAULT_FONTS["heading"], 16)
@@ -181,52 +208,64 @@ class SolutionFlowable(Flowable):
 
     def __init__(
         self,
-        puzzle: Puzzle,
+        puzzle: Union[Puzzle, PuzzleRef],
         puzzle_number: int,
         max_cell_size: float = 14,
         max_width: float = None,
         max_height: float = None,
+        render_mode: str = "cells",
     ):
         """Initialize solution flowable.
 
         Args:
-            puzzle: Puzzle to render.
+            puzzle: Puzzle to render, or a reference loaded when drawn.
             puzzle_number: Puzzle number for labeling.
             max_cell_size: Maximum cell size in points.
             max_width: Maximum width for this solution grid.
             max_height: Maximum height for this solution grid.
+            render_mode: Grid render mode (see RenderConfig.render_mode).
         """
         super().__init__()
-        self.puzzle = puzzle
+        self._puzzle = puzzle
+        self.grid_rows, self.grid_cols = puzzle_size(puzzle)
         self.puzzle_number = puzzle_number
         self.max_cell_size = max_cell_size
         self.max_width = max_width
         self.max_height = max_height
+        self.render_mode = render_mode
         self.label_height = 16
 
         # Will be calculated in wrap()
         self.actual_cell_size = max_cell_size
         self.width = 0
         self.height = 0
+        self._wrapped_for = None
+
+    @property
+    def puzzle(self) -> Puzzle:
+        """The puzzle, loaded on first access if given as a reference."""
+        return resolve_puzzle(self._puzzle)
 
     def wrap(self, available_width, available_height):
         """Calculate dimensions based on available space."""
-        grid = self.puzzle.grid
+        if self._wrapped_for == (available_width, available_height):
+            return self.width, self.height
+        self._wrapped_for = (available_width, available_height)
 
         # Use provided max or available space
         max_w = self.max_width or available_width
         max_h = self.max_height or available_height
 
         # Calculate cell size to fit within constraints
-        cell_by_width = max_w / grid.width
-        cell_by_height = (max_h - self.label_height) / grid.height
+        cell_by_width = max_w / self.grid_cols
+        cell_by_height = (max_h - self.label_height) / self.grid_rows
 
         # Use smallest constraint, capped at max_cell_size
         self.actual_cell_size = min(cell_by_width, cell_by_height, self.max_cell_size)
 
         # Calculate actual dimensions
-        self.width = grid.width * self.actual_cell_size
-        self.height = grid.height * self.actual_cell_size + self.label_height
+        self.width = self.grid_cols * self.actual_cell_size
+        self.height = self.grid_rows * self.actual_cell_size + self.label_height
 
         return self.width, self.height
 
@@ -245,6 +284,7 @@ class SolutionFlowable(Flowable):
             solution_font_size=max(5.0, 8.0 * scale),
             font_name=DEFAULT_FONTS["body"],
             show_solution=True,
+            render_mode=self.render_mode,
         )
 
         # Draw puzzle number
@@ -254,5 +294,166 @@ class SolutionFlowable(Flowable):
         canvas.restoreState()
 
         # Draw the grid
-        grid_height = self.puzzle.grid.height * self.actual_cell_size
+        grid_height = self.grid_rows * self.actual_cell_size
         render_grid(canvas, self.puzzle, 0, grid_height, config)
+
+
+class SolutionSheetFlowable(Flowable):
+    """Solution grids packed onto pages in shelves.
+
+    Grids keep puzzle order and are laid left to right at their own size; a
+    grid that does not fit on the current shelf starts the next one, and
+    shelves fill the frame top to bottom. The sheet splits between shelves,
+    so every page holds one sheet that draws its grids directly.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[tuple],
+        cell_size: float = SOLUTION_CELL_SIZE,
+        max_grid_size: float = SOLUTION_MAX_GRID_SIZE,
+        gap: float = SOLUTION_GAP,
+        render_mode: str = "cells",
+    ):
+        """Initialize solution sheet flowable.
+
+        Args:
+            entries: (puzzle_number, puzzle or PuzzleRef, label) entries.
+            cell_size: Largest cell size in points.
+            max_grid_size: Largest grid width or height in points.
+            gap: Space between grids and between shelves in points.
+            render_mode: Grid render mode (see RenderConfig.render_mode).
+        """
+        super().__init__()
+        self.entries = list(entries)
+        self.cell_size = cell_size
+        self.max_grid_size = max_grid_size
+        self.gap = gap
+        self.render_mode = render_mode
+        self.grids = [
+            SolutionFlowable(
+                puzzle=puzzle,
+                puzzle_number=num,
+                max_cell_size=cell_size,
+                render_mode=render_mode,
+            )
+            for num, puzzle, _ in self.entries
+        ]
+
+        # Will be calculated in wrap(): (first grid, grid count, height) per shelf
+        self.shelves: list[tuple[int, int, float]] = []
+        self._wrapped_for = None
+
+    def _pack(self, width: float) -> None:
+        """Pack the grids into shelves of the given width."""
+        self.shelves = []
+        start, used, height = 0, 0.0, 0.0
+        for i, grid in enumerate(self.grids):
+            # Grid sizes do not depend on the height left, so every page
+            # packs the same way
+            w, h = grid.wrap(
+                min(width, self.max_grid_size), self.max_grid_size + grid.label_height
+            )
+            if i > start and used + self.gap + w > width:
+                self.shelves.append((start, i - start, height))
+                start, used, height = i, 0.0, 0.0
+            used += w if i == start else self.gap + w
+            height = max(height, h)
+        if self.grids:
+            self.shelves.append((start, len(self.grids) - start, height))
+
+    def _shelves_height(self, count: int) -> float:
+        """Height of the first count shelves, each followed by a gap.
+
+        Counting the gap under the last shelf too keeps split consistent:
+        the rest of a split sheet never fits in the space the first part
+        left on its page.
+        """
+        return sum(height + self.gap for _, _, height in self.shelves[:count])
+
+    def wrap(self, available_width, available_height):
+        """Pack the grids into the available width and return the total size."""
+        if self._wrapped_for != available_width:
+            self._pack(available_width)
+            self._wrapped_for = available_width
+        self.width = available_width
+        self.height = self._shelves_height(len(self.shelves))
+        return self.width, self.height
+
+    def split(self, available_width, available_height):
+        """Split after the last shelf that fits the available height."""
+        self.wrap(available_width, available_height)
+        fitting = 0
+        while (
+            fitting < len(self.shelves)
+            and self._shelves_height(fitting + 1) <= available_height
+        ):
+            fitting += 1
+        if fitting == 0:
+            return []
+        if fitting == len(self.shelves):
+            return [self]
+
+        first = self.shelves[fitting][0]
+        settings = (self.cell_size, self.max_grid_size, self.gap, self.render_mode)
+        return [
+            SolutionSheetFlowable(self.entries[:first], *settings),
+            SolutionSheetFlowable(self.entries[first:], *settings),
+        ]
+
+    def draw(self):
+        """Draw every shelf, each centred horizontally, grids top-aligned."""
+        top = self.height
+        for first, count, height in self.shelves:
+            grids = self.grids[first : first + count]
+            shelf_width = sum(grid.width for grid in grids) + self.gap * (count - 1)
+            x = (self.width - shelf_width) / 2
+            for grid in grids:
+                grid.drawOn(self.canv, x, top - grid.height)
+                x += grid.width + self.gap
+            top -= height + self.gap
+
+
+def build_puzzle_flowable(
+    entry: tuple,
+    max_width: float,
+    max_height: float,
+    render_mode: str = "cells",
+) -> PuzzleFlowable:
+    """Build the flowable for one puzzle page.
+
+    Args:
+        entry: (puzzle_number, puzzle or PuzzleRef, difficulty_label).
+        max_width: Content width in points.
+        max_height: Content height in points.
+        render_mode: Grid render mode (see RenderConfig.render_mode).
+
+    Returns:
+        PuzzleFlowable filling one page.
+    """
+    puzzle_number, puzzle, difficulty = entry
+    return PuzzleFlowable(
+        puzzle=puzzle,
+        puzzle_number=puzzle_number,
+        difficulty=difficulty,
+        max_width=max_width,
+        max_height=max_height,
+        show_rules=True,
+        render_mode=render_mode,
+    )
+
+
+def build_solution_sheet(
+    entries: Sequence[tuple],
+    render_mode: str = "cells",
+) -> "SolutionSheetFlowable":
+    """Build the solutions sheet for a list of puzzles.
+
+    Args:
+        entries: (puzzle_number, puzzle or PuzzleRef, label) entries, in order.
+        render_mode: Grid render mode (see RenderConfig.render_mode).
+
+    Returns:
+        SolutionSheetFlowable packing every solution grid.
+    """
+    return SolutionSheetFlowable(entries, render_mode=render_mode)
@@ -8,8 +8,10 @@ suitable for reference content like "unique combinations" tables.
 from reportlab.platypus import Flowable
 from reportlab.lib.colors import HexColor
 
+from src.pdf_generation.metrics import string_width
 from .diagram_models import ReferenceTableDefinition, CARD_COLORS
 from .config import DEFAULT_FONTS
+from .layout_cache import MEASUREMENTS
 
 
 class ReferenceTableFlowable(Flowable):
@@ -26,6 +28,16 @@ class ReferenceTableFlowable(Flowable):
     SECTION_PADDING = 15
     BORDER_RADIUS = 8
 
+    # Attributes _calculate_dimensions sets
+    MEASURED = (
+        "title_height",
+        "section_heights",
+        "footer_height",
+        "content_width",
+        "width",
+        "height",
+    )
+
     def __init__(self, table_def: ReferenceTableDefinition, max_width: float = 432):
         """Initialize the reference table flowable.
 
@@ -36,7 +48,9 @@ class ReferenceTableFlowable(Flowable):
         super().__init__()
         self.table = table_def
         self.max_width = max_width
-        self._calculate_dimensions()
+        MEASUREMENTS.apply(
+            self, table_def, max_width, self._calculate_dimensions, self.MEASURED
+        )
 
     def _calculate_dimensions(self):
         """Calculate total dimensions needed."""
@@ -115,7 +129,7 @@ class ReferenceTableFlowable(Flowable):
         """Draw the main title."""
         canvas.setFillColor(HexColor("#333333"))
         canvas.setFont(DEFAULT_FONTS["heading"], self.TITLE_FONT_SIZE)
-        title_width = canvas.stringWidth(
+        title_width = string_width(
             self.table.title, DEFAULT_FONTS["heading"], self.TITLE_FONT_SIZE
         )
         x = (self.width - title_width) / 2
@@ -127,7 +141,7 @@ class ReferenceTableFlowable(Flowable):
         y_cursor -= 22
         canvas.setFillColor(HexColor("#2E7D32"))  # Green
         canvas.setFont(DEFAULT_FONTS["heading"], self.SECTION_TITLE_FONT_SIZE)
-        title_width = canvas.stringWidth(
+        title_width = string_width(
             section.title, DEFAULT_FONTS["heading"], self.SECTION_TITLE_FONT_SIZE
         )
         x = (self.width - title_width) / 2
@@ -166,16 +180,14 @@ class ReferenceTableFlowable(Flowable):
         sum_text = f"Sum: {card.sum_value}"
         canvas.setFillColor(HexColor(colors["sum"]))
         canvas.setFont(DEFAULT_FONTS["heading"], self.SUM_FONT_SIZE)
-        sum_width = canvas.stringWidth(
-            sum_text, DEFAULT_FONTS["heading"], self.SUM_FONT_SIZE
-        )
+        sum_width = string_width(sum_text, DEFAULT_FONTS["heading"], self.SUM_FONT_SIZE)
         sum_x = x + (self.CARD_WIDTH - sum_width) / 2
         canvas.drawString(sum_x, y + self.CARD_HEIGHT - 18, sum_text)
 
         # Combination
         canvas.setFillColor(HexColor(colors["combo"]))
         canvas.setFont(DEFAULT_FONTS["body"], self.COMBO_FONT_SIZE)
-        combo_width = canvas.stringWidth(
+        combo_width = string_width(
             card.combination, DEFAULT_FONTS["body"], self.COMBO_FONT_SIZE
         )
         combo_x = x + (self.CARD_WIDTH - combo_width) / 2
@@ -189,8 +201,6 @@ class ReferenceTableFlowable(Flowable):
         canvas.setFillColor(HexColor("#666666"))
         canvas.setFont(DEFAULT_FONTS["caption"], 9)
         # Center the footer
-        footer_width = canvas.stringWidth(
-            self.table.footer_note, DEFAULT_FONTS["caption"], 9
-        )
+        footer_width = string_width(self.table.footer_note, DEFAULT_FONTS["caption"], 9)
         x = (self.width - footer_width) / 2
         canvas.drawString(x, y, self.table.footer_note)
@@ -0,0 +1,88 @@
+"""
+Content-addressed cache of rendered book parts.
+
+Incremental builds keep each chapter, puzzle section and solutions block as
+a PDF named by a hash of everything that shaped it: its inputs (markdown and
+images, or puzzles and their placement), the book's layout configuration
+and the rendering code itself. A rebuild renders only the parts whose hash
+is not in the cache and stamps the rest onto the laid-out pages.
+"""
+
+import hashlib
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Packages whose source shapes rendered output
+RENDER_PACKAGES = ("book_builder", "pdf_generation")
+
+SRC_DIR = Path(__file__).parent.parent
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the rendering source code, so code changes invalidate the cache."""
+    digest = hashlib.sha256()
+    for package in RENDER_PACKAGES:
+        for source in sorted((SRC_DIR / package).rglob("*.py")):
+            digest.update(str(source.relative_to(SRC_DIR)).encode())
+            digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Rendered PDF parts keyed by content hash."""
+
+    def __init__(self, cache_dir: Path, salt: str = ""):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached PDFs (created if missing).
+            salt: Digest of settings every part depends on, e.g. the layout.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, *parts) -> str:
+        """Hash the code version, salt and parts (bytes or str()-able) into a key."""
+        digest = hashlib.sha256()
+        digest.update(code_version().encode())
+        digest.update(self.salt.encode())
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else str(part).encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Location of the PDF for a key."""
+        return self.cache_dir / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached PDF for a key, or None."""
+        path = self.path(key)
+        if path.exists():
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def put(self, key: str, source: Path) -> Path:
+        """Move a rendered PDF into the cache under a key.
+
+        Args:
+            key: Cache key.
+            source: Rendered PDF; moved, not copied.
+
+        Returns:
+            Path of the cached PDF.
+        """
+        path = self.path(key)
+        os.replace(source, path)
+        return path
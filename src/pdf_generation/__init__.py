@@ -7,6 +7,7 @@ from Kakuro puzzles for Amazon KDP publishing.
 Main exports:
     - create_puzzle_book: Generate a complete puzzle book PDF
     - PDFDocument: Multi-page document builder
+    - StreamingPDFDocument: Document builder that renders puzzles as they arrive
     - PageLayout: Page configuration (dimensions, margins)
     - RenderConfig: Rendering configuration (fonts, line widths)
     - BookConfig: Complete book configuration
@@ -22,10 +23,16 @@ from .models import (
     A4,
     POINTS_PER_INCH,
 )
-from .fonts import register_fonts, get_font_name, is_font_available
+from .fonts import (
+    register_fonts,
+    register_default_fonts,
+    get_font_name,
+    is_font_available,
+)
+from .metrics import string_width
 from .renderer import render_grid
-from .page_builder import build_puzzle_page, build_solution_page
-from .document import PDFDocument, create_puzzle_book
+from .page_builder import build_puzzle_page, build_solution_page, pack_puzzle_page
+from .document import PDFDocument, StreamingPDFDocument, create_puzzle_book
 
 __all__ = [
     # Constants
@@ -40,15 +47,19 @@ __all__ = [
     "A4",
     # Fonts
     "register_fonts",
+    "register_default_fonts",
     "get_font_name",
     "is_font_available",
     # Rendering
+    "string_width",
     "render_grid",
     # Page building
     "build_puzzle_page",
     "build_solution_page",
+    "pack_puzzle_page",
     # Document
     "PDFDocument",
+    "StreamingPDFDocument",
     "create_puzzle_book",
 ]
 
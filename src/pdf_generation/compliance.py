@@ -7,8 +7,10 @@ standards, which are required for professional printing (e.g., Amazon KDP).
 
 import logging
 from datetime import datetime
-from reportlab.pdfgen.canvas import Canvas
+from pathlib import Path
+from typing import Union
 
+from reportlab.pdfgen.canvas import Canvas
 
 logger = logging.getLogger(__name__)
 
@@ -65,3 +67,52 @@ def apply_compliance(canvas: Canvas, title: str, author: str = "") -> None:
     # However, setting 'GTS_PDFXVersion' in Info is often enough for simple checkers
     # to recognize the intent. Full embedding requires lower-level access.
     pass
+
+
+def _font_is_embedded(font) -> bool:
+    """Whether a PDF font dictionary carries its font program."""
+    if font.Subtype == "/Type3":
+        # Glyphs are drawn by content streams in the font itself
+        return True
+    if font.Subtype == "/Type0":
+        font = font.DescendantFonts[0]
+    descriptor = font.FontDescriptor
+    if descriptor is None:
+        return False
+    return any(
+        descriptor[key] is not None for key in ("/FontFile", "/FontFile2", "/FontFile3")
+    )
+
+
+def find_unembedded_fonts(pdf_path: Union[str, Path]) -> list[str]:
+    """
+    List fonts a PDF uses without embedding them.
+
+    Reads only the font dictionaries of page and form XObject resources,
+    so it is fast enough to run after every build.
+
+    Args:
+        pdf_path: PDF to check
+
+    Returns:
+        Sorted base font names of unembedded fonts (empty if all embedded)
+    """
+    unembedded = set()
+    seen = set()
+
+    def scan(resources):
+        if resources is None or id(resources) in seen:
+            return
+        seen.add(id(resources))
+        for font in (resources.Font or {}).values():
+            if not _font_is_embedded(font):
+                unembedded.add(str(font.BaseFont).lstrip("/"))
+        for xobject in (resources.XObject or {}).values():
+            if xobject.Subtype == "/Form":
+                scan(xobject.Resources)
+
+    from pdfrw import PdfReader
+
+    for page in PdfReader(str(pdf_path)).pages:
+        scan(page.Resources)
+    return sorted(unembedded)
@@ -6,18 +6,27 @@ assembling puzzle pages, solution sections, and other book elements.
 """
 
 import logging
+import tempfile
+from itertools import islice
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Optional, Union
 
 from reportlab.pdfgen.canvas import Canvas
 
 from src.puzzle_generation import Puzzle
+from src.puzzle_generation.packed import PackedPuzzleFile, PackedWriter
 from .models import BookConfig
 from .page_builder import build_puzzle_page, build_solution_page
 from .compliance import apply_compliance
+from .fonts import register_default_fonts
 
 logger = logging.getLogger(__name__)
 
+SOLUTIONS_PER_PAGE = 4
+
+# Pages per part file written by StreamingPDFDocument
+PAGES_PER_PART = 20
+
 
 class PDFDocument:
     """Multi-page PDF document builder for Kakuro puzzle books."""
@@ -39,21 +48,30 @@ class PDFDocument:
         self.config = config or BookConfig()
         self.is_compliant = is_compliant
         self.layout = self.config.layout
+        register_default_fonts(self.layout.render_config.font_name)
 
-        # Create the canvas
-        page_width, page_height = self.layout.page_size
-        self.canvas = Canvas(
-            str(self.output_path),
-            pagesize=(page_width, page_height),
-        )
-
-        # Set document metadata
-        self.canvas.setTitle(self.config.title)
-        self.canvas.setAuthor(self.config.author)
+        self.canvas = self._open_canvas()
 
         self._puzzles: list[Puzzle] = []
         self._current_page = 0
 
+    def _new_canvas(self, path: Path) -> Canvas:
+        """Create a canvas with the book's page size and metadata."""
+        page_width, page_height = self.layout.page_size
+        canvas = Canvas(str(path), pagesize=(page_width, page_height))
+        canvas.setTitle(self.config.title)
+        canvas.setAuthor(self.config.author)
+        return canvas
+
+    def _open_canvas(self) -> Canvas:
+        """Create the canvas pages are drawn on."""
+        return self._new_canvas(self.output_path)
+
+    def _end_page(self) -> None:
+        """Finish the current page."""
+        self._current_page += 1
+        self.canvas.showPage()
+
     def add_puzzle(self, puzzle: Puzzle) -> None:
         """Add a puzzle to the document.
 
@@ -62,11 +80,11 @@ class PDFDocument:
         """
         self._puzzles.append(puzzle)
 
-    def add_puzzles(self, puzzles: list[Puzzle]) -> None:
+    def add_puzzles(self, puzzles: Iterable[Puzzle]) -> None:
         """Add multiple puzzles to the document.
 
         Args:
-            puzzles: List of puzzles to add.
+            puzzles: Puzzles to add.
         """
         self._puzzles.extend(puzzles)
 
@@ -84,27 +102,21 @@ class PDFDocument:
 
             if batch:
                 build_puzzle_page(self.canvas, batch, self.layout)
-                self._current_page += 1
-                self.canvas.showPage()
+                self._end_page()
 
-    def _render_solution_pages(self) -> None:
-        """Render solution pages."""
+    def _render_solution_pages(self, puzzles: Iterable[Puzzle]) -> None:
+        """Render solution pages.
+
+        Args:
+            puzzles: Solved puzzles in book order; read one page at a time.
+        """
         # Add a section header for solutions
         self._add_section_header("Solutions")
 
-        # Render solutions in groups of 4 per page
-        puzzle_num = 1
-        for i in range(0, len(self._puzzles), 4):
-            batch = []
-            for j in range(4):
-                if i + j < len(self._puzzles):
-                    batch.append((puzzle_num, self._puzzles[i + j]))
-                    puzzle_num += 1
-
-            if batch:
-                build_solution_page(self.canvas, batch, self.layout)
-                self._current_page += 1
-                self.canvas.showPage()
+        numbered = enumerate(puzzles, start=1)
+        while batch := list(islice(numbered, SOLUTIONS_PER_PAGE)):
+            build_solution_page(self.canvas, batch, self.layout)
+            self._end_page()
 
     def _add_section_header(self, title: str) -> None:
         """Add a section header page."""
@@ -118,8 +130,7 @@ class PDFDocument:
         y = page_height / 2
 
         self.canvas.drawString(x, y, title)
-        self._current_page += 1
-        self.canvas.showPage()
+        self._end_page()
 
     def save(self) -> Path:
         """Render all content and save the PDF.
@@ -134,7 +145,7 @@ class PDFDocument:
 
         # Render solution pages if configured
         if self.config.include_solutions and self._puzzles:
-            self._render_solution_pages()
+            self._render_solution_pages(self._puzzles)
 
         # Apply PDF/X compliance settings
         if self.is_compliant:
@@ -147,6 +158,261 @@ class PDFDocument:
         return self.output_path
 
 
+class StreamingPDFDocument(PDFDocument):
+    """PDFDocument that renders puzzles as they are added.
+
+    A page is drawn as soon as its puzzles have arrived, and every
+    PAGES_PER_PART pages are saved as a part file in a spool directory, so
+    the first pages reach disk right away. Puzzles are not kept: each one's
+    solution is appended to a packed file in the spool (a few dozen bytes
+    per puzzle), from which save() renders the solutions section before
+    joining the parts into the output PDF one part at a time (see
+    join_pdfs). Memory use does not grow with the number of puzzles added,
+    beyond an offset per PDF object and a reference per page while joining.
+    """
+
+    def __init__(
+        self,
+        output_path: Union[str, Path],
+        config: BookConfig = None,
+        is_compliant: bool = True,
+        spool_dir: Optional[Union[str, Path]] = None,
+    ):
+        """Initialize a new streaming PDF document.
+
+        Args:
+            output_path: Path where the PDF will be saved.
+            config: Book configuration. Uses defaults if not provided.
+            is_compliant: Whether to apply PDF/X-1a compliance settings.
+            spool_dir: Where to create the spool directory; defaults to the
+                output directory.
+        """
+        output_path = Path(output_path)
+        self._spool = tempfile.TemporaryDirectory(
+            prefix=f".{output_path.stem}-", dir=spool_dir or output_path.parent
+        )
+        self._parts: list[Path] = []
+        self._part_pages = 0
+        super().__init__(output_path, config, is_compliant)
+
+        self._page: list[tuple[int, Puzzle]] = []
+        self._puzzle_count = 0
+        self._solutions = PackedWriter(Path(self._spool.name) / "solutions.kkpz")
+
+    def _open_canvas(self) -> Canvas:
+        """Start the next part file."""
+        path = Path(self._spool.name) / f"part-{len(self._parts):05d}.pdf"
+        self._parts.append(path)
+        self._part_pages = 0
+        return self._new_canvas(path)
+
+    def _close_part(self) -> None:
+        """Save the current part file."""
+        if self.is_compliant:
+            apply_compliance(self.canvas, self.config.title, self.config.author)
+        self.canvas.save()
+
+    def _end_page(self) -> None:
+        """Finish the current page and save the part once it is full."""
+        super()._end_page()
+        self._part_pages += 1
+        if self._part_pages == PAGES_PER_PART:
+            self._close_part()
+            self.canvas = self._open_canvas()
+
+    def add_puzzle(self, puzzle: Puzzle) -> None:
+        """Add a puzzle, drawing its page once the page is full.
+
+        Args:
+            puzzle: Puzzle to add; not kept after its page is drawn.
+        """
+        self._puzzle_count += 1
+        self._solutions.add(puzzle)
+        self._page.append((self._puzzle_count, puzzle))
+        if len(self._page) == self.layout.puzzles_per_page:
+            self._draw_page()
+
+    def add_puzzles(self, puzzles: Iterable[Puzzle]) -> None:
+        """Add puzzles from any iterable, drawing pages as they fill.
+
+        Args:
+            puzzles: Puzzles to add, e.g. a generator.
+        """
+        for puzzle in puzzles:
+            self.add_puzzle(puzzle)
+
+    def _draw_page(self) -> None:
+        """Draw the pending puzzles on a page."""
+        build_puzzle_page(self.canvas, self._page, self.layout)
+        self._page = []
+        self._end_page()
+
+    def save(self) -> Path:
+        """Render the solutions, join the part files and save the PDF.
+
+        Returns:
+            Path to the saved PDF file.
+        """
+        logger.info(f"Finishing PDF with {self._puzzle_count} puzzles...")
+        if self._page:
+            self._draw_page()
+
+        self._solutions.close()
+        if self.config.include_solutions and self._puzzle_count:
+            with PackedPuzzleFile(self._solutions.path, compact=True) as solutions:
+                self._render_solution_pages(solutions)
+
+        if self._part_pages:
+            self._close_part()
+        else:
+            # The last part was started by a page break but never drawn on
+            self._parts.pop()
+
+        join_pdfs(self._parts, self.output_path)
+        self._spool.cleanup()
+
+        logger.info(
+            f"PDF saved to {self.output_path} ({self._current_page} pages "
+            f"from {len(self._parts)} parts)"
+        )
+        return self.output_path
+
+
+class _PdfObjectWriter:
+    """Writes the objects of PDF files to one output as they are read.
+
+    Objects are numbered and written as each part is formatted, so only the
+    part being read is in memory. The page tree and catalog take the first
+    two object numbers and are written last, followed by the cross
+    reference table.
+    """
+
+    CATALOG = 1
+    PAGES = 2
+
+    def __init__(self, out):
+        """Start a PDF on a binary file object."""
+        self.out = out
+        # File offset of object n at index n - 1
+        self.offsets: list[Optional[int]] = [None, None]
+        self.pages: list[int] = []
+        self.info: Optional[str] = None
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes) -> None:
+        self.out.write(data)
+
+    def _reserve(self) -> int:
+        """Allocate the next object number."""
+        self.offsets.append(None)
+        return len(self.offsets)
+
+    def _write_object(self, number: int, body: str) -> None:
+        self.offsets[number - 1] = self.out.tell()
+        self._write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    def add_part(self, path: Path) -> None:
+        """Append the pages of a PDF file.
+
+        Pages are reparented onto the output's page tree with the
+        attributes they inherited. The first part's document info is kept.
+        """
+        from pdfrw import IndirectPdfDict, PdfArray, PdfDict, PdfObject, PdfReader
+        from pdfrw.pdfwriter import user_fmt
+
+        reader = PdfReader(str(path))
+        numbers: dict[int, int] = {}
+        pending: list[tuple[int, object]] = []
+
+        def reference(obj) -> str:
+            if isinstance(obj, PdfDict):
+                indirect = obj.indirect or obj.stream is not None
+            else:
+                indirect = getattr(obj, "indirect", False)
+            if not indirect:
+                return format_direct(obj)
+            number = numbers.get(id(obj))
+            if number is None:
+                number = numbers[id(obj)] = self._reserve()
+                pending.append((number, obj))
+            return f"{number} 0 R"
+
+        def format_direct(obj) -> str:
+            # As pdfrw's PdfWriter formats objects
+            if isinstance(obj, PdfArray):
+                return "[" + " ".join(reference(item) for item in obj) + "]"
+            if isinstance(obj, PdfDict):
+                pairs = " ".join(
+                    f"{getattr(key, 'encoded', None) or key} {reference(value)}"
+                    for key, value in obj.iteritems()
+                )
+                if obj.stream is None:
+                    return f"<<{pairs}>>"
+                return f"<<{pairs}>>\nstream\n{obj.stream}\nendstream"
+            if hasattr(obj, "indirect"):
+                return str(getattr(obj, "encoded", None) or obj)
+            return user_fmt(obj)
+
+        parent = PdfObject(f"{self.PAGES} 0 R")
+        for page in reader.pages:
+            inherited = page.inheritable
+            copy = IndirectPdfDict(
+                page,
+                Resources=inherited.Resources,
+                MediaBox=inherited.MediaBox,
+                CropBox=inherited.CropBox,
+                Rotate=inherited.Rotate,
+                Parent=parent,
+            )
+            # References to the page, e.g. from annotations, reach the copy
+            numbers[id(page)] = number = self._reserve()
+            pending.append((number, copy))
+            self.pages.append(number)
+        if self.info is None and reader.Info is not None:
+            self.info = reference(reader.Info)
+
+        while pending:
+            number, obj = pending.pop()
+            self._write_object(number, format_direct(obj))
+
+    def close(self) -> None:
+        """Write the page tree, catalog, cross reference table and trailer."""
+        kids = " ".join(f"{number} 0 R" for number in self.pages)
+        self._write_object(
+            self.PAGES, f"<</Type /Pages /Count {len(self.pages)} /Kids [{kids}]>>"
+        )
+        self._write_object(self.CATALOG, f"<</Type /Catalog /Pages {self.PAGES} 0 R>>")
+
+        xref = self.out.tell()
+        size = len(self.offsets) + 1
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f\r\n"]
+        lines.extend(f"{offset:010d} 00000 n\r\n" for offset in self.offsets)
+        info = f" /Info {self.info}" if self.info else ""
+        lines.append(
+            f"trailer\n<</Size {size} /Root {self.CATALOG} 0 R{info}>>\n"
+            f"startxref\n{xref}\n%%EOF\n"
+        )
+        self._write("".join(lines).encode("latin-1"))
+
+
+def join_pdfs(parts: Iterable[Union[str, Path]], output_path: Union[str, Path]) -> None:
+    """Join PDF files into one, reading a single part at a time.
+
+    Each part's objects are written out as soon as it is read, so memory
+    use does not grow with the size of the joined document. The document
+    info of the first part is kept.
+
+    Args:
+        parts: PDF files in page order.
+        output_path: Path of the joined PDF.
+    """
+    with open(output_path, "wb") as out:
+        writer = _PdfObjectWriter(out)
+        for part in parts:
+            writer.add_part(Path(part))
+        writer.close()
+
+
 def create_puzzle_book(
     puzzles: list[Puzzle],
     output_path: Union[str, Path],
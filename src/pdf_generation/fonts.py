@@ -3,14 +3,26 @@ Font management for PDF generation.
 
 This module handles font registration and embedding for PDF output.
 It provides fallback to built-in fonts when custom fonts are unavailable.
+
+Parsing a TrueType file is the slow part of registering it, and every
+process that renders (each worker of a parallel build included) needs the
+same fonts. Parsed fonts are therefore pickled to a cache directory next to
+the font files, keyed by a hash of the file and the ReportLab version, and
+loaded from there by later processes.
 """
 
+import hashlib
 import logging
+import os
+import pickle
+import tempfile
 from pathlib import Path
 from typing import Optional
+from weakref import WeakKeyDictionary
 
+import reportlab
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +32,9 @@ from src.book_builder.config import DEFAULT_FONTS
 # Default font assets directory
 FONTS_DIR = Path(__file__).parent.parent.parent / "assets" / "fonts"
 
+# Parsed fonts, in this subdirectory of the fonts directory
+FONT_CACHE_DIRNAME = ".cache"
+
 # Built-in ReportLab fonts (always available)
 BUILTIN_FONTS = {
     "Helvetica",
@@ -40,6 +55,119 @@ BUILTIN_FONTS = {
 _registered_fonts: set[str] = set()
 
 
+def _font_cache_path(font_file: Path, data: bytes) -> Path:
+    """Cache file for a font file's contents under this ReportLab version."""
+    digest = hashlib.sha256(reportlab.Version.encode())
+    digest.update(data)
+    return (
+        font_file.parent
+        / FONT_CACHE_DIRNAME
+        / f"{font_file.stem}-{digest.hexdigest()[:32]}.pickle"
+    )
+
+
+def _font_state(font: TTFont) -> tuple[dict, dict]:
+    """Picklable attributes of a parsed font and of its face.
+
+    Left out are the raw file data, which is read anyway to hash it, the
+    face's scaling function and the font's per-document state.
+    """
+    font_state = {k: v for k, v in vars(font).items() if k not in ("face", "state")}
+    face_state = {
+        k: v for k, v in vars(font.face).items() if k not in ("_ttf_data", "_pdfScale")
+    }
+    return font_state, face_state
+
+
+def _restore_font(font_state: dict, face_state: dict, data: bytes) -> TTFont:
+    """Rebuild a parsed font from _font_state without parsing the file."""
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(face_state)
+    face._ttf_data = data
+    # As TTFontFile.extractInfo sets it
+    units_per_em = face.unitsPerEm
+    if units_per_em == 1000:
+        face._pdfScale = lambda x: x
+    else:
+        face._pdfScale = lambda x: x * 1000 / units_per_em
+
+    font = TTFont.__new__(TTFont)
+    font.__dict__.update(font_state)
+    font.face = face
+    font.state = WeakKeyDictionary()
+    return font
+
+
+def load_ttf(font_name: str, font_file: Path) -> TTFont:
+    """Load a TrueType font, reusing the parse cached by an earlier process.
+
+    A cache file that cannot be loaded (truncated, or written by an
+    incompatible ReportLab) is removed and the font parsed again.
+
+    Args:
+        font_name: Name to register the font under.
+        font_file: Path to the .ttf file.
+
+    Returns:
+        The parsed font.
+    """
+    data = font_file.read_bytes()
+    cache_path = _font_cache_path(font_file, data)
+    if cache_path.exists():
+        try:
+            with open(cache_path, "rb") as f:
+                font_state, face_state = pickle.load(f)
+            font_state["fontName"] = font_name
+            font = _restore_font(font_state, face_state, data)
+            logger.debug(f"Loaded font {font_name} from {cache_path}")
+            return font
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable font cache {cache_path}: {e}")
+            cache_path.unlink(missing_ok=True)
+
+    font = TTFont(font_name, str(font_file))
+    try:
+        state = pickle.dumps(_font_state(font), protocol=pickle.HIGHEST_PROTOCOL)
+        cache_path.parent.mkdir(exist_ok=True)
+        # Written under a temporary name so concurrent processes never read
+        # a partial file
+        fd, tmp = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(state)
+        os.replace(tmp, cache_path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.warning(f"Could not cache parsed font {font_file}: {e}")
+    return font
+
+
+def register_default_fonts(*font_names: str) -> list[str]:
+    """Register the TrueType fonts named in DEFAULT_FONTS, and font_names.
+
+    Called by whatever renders first in a process; fonts already registered
+    are skipped, so later calls cost a set lookup. Names without a .ttf file
+    in FONTS_DIR (such as ReportLab's built-in fonts) are left alone.
+
+    Args:
+        *font_names: Further fonts to register, e.g. from a book config.
+
+    Returns:
+        Names of the fonts registered by this module.
+    """
+    for font_name in {*DEFAULT_FONTS.values(), *font_names}:
+        font_file = FONTS_DIR / f"{font_name}.ttf"
+        if font_name in _registered_fonts or not font_file.is_file():
+            continue
+        try:
+            pdfmetrics.registerFont(load_ttf(font_name, font_file))
+            _registered_fonts.add(font_name)
+            logger.debug(f"Registered font: {font_name}")
+        except Exception as e:
+            logger.warning(f"Failed to register font {font_file}: {e}")
+
+    _register_noto_sans_family()
+    return sorted(_registered_fonts)
+
+
 def register_fonts(fonts_dir: Optional[Path] = None) -> list[str]:
     """Register custom fonts from the fonts directory.
 
@@ -64,14 +192,19 @@ def register_fonts(fonts_dir: Optional[Path] = None) -> list[str]:
             continue
 
         try:
-            pdfmetrics.registerFont(TTFont(font_name, str(font_file)))
+            pdfmetrics.registerFont(load_ttf(font_name, font_file))
             _registered_fonts.add(font_name)
             registered.append(font_name)
             logger.debug(f"Registered font: {font_name}")
         except Exception as e:
             logger.warning(f"Failed to register font {font_file}: {e}")
 
-    # Register NotoSans as a font family if both regular and bold are present
+    _register_noto_sans_family()
+    return registered
+
+
+def _register_noto_sans_family() -> None:
+    """Register NotoSans as a font family if both regular and bold are present."""
     if "NotoSans-Regular" in _registered_fonts and "NotoSans-Bold" in _registered_fonts:
         try:
             from reportlab.pdfbase.pdfmetrics import registerFontFamily
@@ -87,8 +220,6 @@ def register_fonts(fonts_dir: Optional[Path] = None) -> list[str]:
         except Exception as e:
             logger.warning(f"Failed to register NotoSans font family: {e}")
 
-    return registered
-
 
 def get_font_name(preferred: str = None, fallback: str = None) -> str:
     """Get an available font name.
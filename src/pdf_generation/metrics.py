@@ -0,0 +1,57 @@
+"""
+Cached text metrics for grid labels.
+
+Clue numbers run from 3 to 45 and digits from 1 to 9, and a book draws them
+in a handful of fonts and sizes, so the same few hundred widths are measured
+over and over. These helpers measure each (font, size, text) once and also
+cache where a label sits inside a cell, leaving only additions per cell.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+from reportlab.pdfbase import pdfmetrics
+
+# Enough for every label of every font and size in a book, plus headings
+METRICS_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=METRICS_CACHE_SIZE)
+def string_width(text: str, font_name: str, font_size: float) -> float:
+    """
+    Width of a string in points (cached).
+
+    Args:
+        text: Text to measure
+        font_name: Registered font name
+        font_size: Font size in points
+
+    Returns:
+        Width in points
+    """
+    return pdfmetrics.stringWidth(text, font_name, font_size)
+
+
+@lru_cache(maxsize=METRICS_CACHE_SIZE)
+def centered_offset(
+    text: str,
+    font_name: str,
+    font_size: float,
+    anchor_x: float,
+    anchor_y: float,
+) -> Tuple[float, float]:
+    """
+    Offset from a cell's lower-left corner that centres text on an anchor.
+
+    Args:
+        text: Text to place
+        font_name: Registered font name
+        font_size: Font size in points
+        anchor_x: Horizontal centre, relative to the cell corner
+        anchor_y: Vertical centre, relative to the cell corner
+
+    Returns:
+        (dx, dy) to add to the cell corner to get the text origin
+    """
+    width = string_width(text, font_name, font_size)
+    return anchor_x - width / 2, anchor_y - font_size / 2
@@ -11,6 +11,9 @@ from typing import Optional, NamedTuple
 # Points per inch (ReportLab's native unit)
 POINTS_PER_INCH = 72
 
+# Ways render_grid can draw cells (see RenderConfig.render_mode)
+RENDER_MODES = ("cells", "forms", "batched")
+
 
 class PageSize(NamedTuple):
     """Page dimensions in points."""
@@ -76,6 +79,11 @@ class RenderConfig:
         solution_font_size: Font size for solution digits
         font_name: Name of font to use
         show_solution: Whether to display solution digits
+        render_mode: How cells are drawn: "cells" draws each cell with its
+            own rectangles and lines; "forms" defines each cell kind once per
+            size as a reusable form and only draws numbers per cell;
+            "batched" fills and strokes the whole grid with a few paths and
+            writes all numbers in one text object
     """
 
     cell_size: float = 43.2  # 0.6 inch in points
@@ -85,6 +93,15 @@ class RenderConfig:
     solution_font_size: float = 14.0
     font_name: str = "NotoSans-Regular"
     show_solution: bool = False
+    render_mode: str = "cells"
+
+    def __post_init__(self):
+        """Validate the render mode."""
+        if self.render_mode not in RENDER_MODES:
+            raise ValueError(
+                f"Unknown render mode {self.render_mode!r}, "
+                f"expected one of {RENDER_MODES}"
+            )
 
     @classmethod
     def large_print(cls) -> "RenderConfig":
@@ -105,7 +122,8 @@ class PageLayout:
     Attributes:
         page_size: Page dimensions (width, height) in points
         margins: Page margins
-        puzzles_per_page: Number of puzzles per page (1 or 2)
+        puzzles_per_page: Number of puzzles per page; pages with more than
+            one share a cell size chosen by page_builder.pack_puzzle_page
         render_config: Grid rendering configuration
     """
 
@@ -137,6 +155,11 @@ class PageLayout:
             render_config=RenderConfig.large_print(),
         )
 
+    @classmethod
+    def compact(cls, puzzles_per_page: int = 6) -> "PageLayout":
+        """Create compact layout (several smaller puzzles per page)."""
+        return cls(puzzles_per_page=puzzles_per_page)
+
 
 @dataclass
 class BookConfig:
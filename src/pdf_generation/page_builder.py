@@ -5,13 +5,136 @@ This module handles the composition of puzzle pages, positioning
 grids and adding page elements like puzzle numbers and titles.
 """
 
+from dataclasses import dataclass, field
+
 from reportlab.pdfgen.canvas import Canvas
 from reportlab.lib.colors import black
 
 from src.puzzle_generation import Puzzle
+from src.puzzle_generation.refs import puzzle_size
 from .models import PageLayout, RenderConfig
 from .renderer import render_grid
 
+# N-up pages, in points: space above each grid for its number, and gaps
+# between rows and between grids in a row
+PUZZLE_NUMBER_HEIGHT = 30
+ROW_GAP = 40
+COLUMN_GAP = 24
+
+
+@dataclass
+class GridSlot:
+    """Where one puzzle goes on an N-up page.
+
+    Attributes:
+        number: Puzzle number
+        puzzle: Puzzle to draw
+        x: Left edge of the grid
+        y: Top edge of the grid
+        width: Grid width at the page's cell size
+        height: Grid height at the page's cell size
+    """
+
+    number: int
+    puzzle: Puzzle
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+@dataclass
+class PagePacking:
+    """Common cell size and grid positions of an N-up page.
+
+    Attributes:
+        cell_size: Cell size shared by every grid on the page
+        columns: Grids per row
+        slots: Grid positions, in puzzle order
+    """
+
+    cell_size: float
+    columns: int
+    slots: list[GridSlot] = field(default_factory=list)
+
+
+def _largest_cell_size(
+    sizes: list[tuple[int, int]], columns: int, layout: PageLayout
+) -> float:
+    """Largest cell size at which the grids fit `columns` to a row.
+
+    Args:
+        sizes: (rows, cols) of each grid, in page order.
+        columns: Grids per row.
+        layout: Page layout.
+
+    Returns:
+        Cell size in points, uncapped.
+    """
+    rows = [sizes[i : i + columns] for i in range(0, len(sizes), columns)]
+
+    # Each row's widths plus its gaps must fit the content width
+    by_width = min(
+        (layout.content_width - COLUMN_GAP * (len(row) - 1))
+        / sum(cols for _, cols in row)
+        for row in rows
+    )
+
+    # The tallest grid of every row plus numbers and gaps must fit the height
+    fixed_height = len(rows) * PUZZLE_NUMBER_HEIGHT + ROW_GAP * (len(rows) - 1)
+    by_height = (layout.content_height - fixed_height) / sum(
+        max(grid_rows for grid_rows, _ in row) for row in rows
+    )
+    return min(by_width, by_height)
+
+
+def pack_puzzle_page(
+    puzzles: list[tuple[int, Puzzle]],
+    layout: PageLayout,
+) -> PagePacking:
+    """Place puzzles of mixed sizes on one page at a common cell size.
+
+    Tries every number of grids per row and keeps the arrangement with the
+    largest cell size (never larger than the layout's), preferring fewer
+    columns on ties. Grid sizes come from puzzle_size, so references are not
+    loaded to be measured.
+
+    Args:
+        puzzles: (puzzle_number, puzzle) tuples, in reading order.
+        layout: Page layout configuration.
+
+    Returns:
+        Packing with the cell size and every grid's position.
+    """
+    sizes = [puzzle_size(puzzle) for _, puzzle in puzzles]
+
+    columns, cell_size = 1, 0.0
+    for candidate in range(1, len(puzzles) + 1):
+        size = _largest_cell_size(sizes, candidate, layout)
+        if size > cell_size:
+            columns, cell_size = candidate, size
+    cell_size = min(cell_size, layout.render_config.cell_size)
+
+    packing = PagePacking(cell_size, columns)
+    _, page_height = layout.page_size
+    top = page_height - layout.margins.top - PUZZLE_NUMBER_HEIGHT
+    for start in range(0, len(puzzles), columns):
+        row = list(
+            zip(puzzles[start : start + columns], sizes[start : start + columns])
+        )
+        row_width = sum(cols for _, (_, cols) in row) * cell_size + COLUMN_GAP * (
+            len(row) - 1
+        )
+        x = layout.margins.left + (layout.content_width - row_width) / 2
+        for (number, puzzle), (grid_rows, grid_cols) in row:
+            width, height = grid_cols * cell_size, grid_rows * cell_size
+            packing.slots.append(GridSlot(number, puzzle, x, top, width, height))
+            x += width + COLUMN_GAP
+        row_height = max(grid_rows for _, (grid_rows, _) in row) * cell_size
+        top -= row_height + ROW_GAP + PUZZLE_NUMBER_HEIGHT
+
+    return packing
+
 
 def build_puzzle_page(
     canvas: Canvas,
@@ -29,18 +152,8 @@ def build_puzzle_page(
         # Single puzzle - center on page
         puzzle_num, puzzle = puzzles[0]
         _draw_single_puzzle_page(canvas, puzzle_num, puzzle, layout)
-    elif len(puzzles) == 2:
-        # Two puzzles - one top, one bottom
-        _draw_two_puzzle_page(canvas, puzzles[0], puzzles[1], layout)
-    else:
-        # For now, just draw the first two
-        if puzzles:
-            _draw_two_puzzle_page(
-                canvas,
-                puzzles[0],
-                puzzles[1] if len(puzzles) > 1 else puzzles[0],
-                layout,
-            )
+    elif puzzles:
+        _draw_n_up_page(canvas, puzzles, layout)
 
 
 def _draw_single_puzzle_page(
@@ -67,46 +180,10 @@ def _draw_single_puzzle_page(
     render_grid(canvas, puzzle, x, y, config)
 
 
-def _draw_two_puzzle_page(
-    canvas: Canvas,
-    puzzle1: tuple[int, Puzzle],
-    puzzle2: tuple[int, Puzzle],
-    layout: PageLayout,
-) -> None:
-    """Draw two puzzles on a page, one above the other."""
-    config = layout.render_config
-    page_width, page_height = layout.page_size
-    num1, puz1 = puzzle1
-    num2, puz2 = puzzle2
-
-    # Fixed spacing constants
-    puzzle_number_height = 30  # Space for "Puzzle N" text
-    gap_between_puzzles = 40  # Gap between puzzles
-
-    # Calculate available content height
-    content_height = layout.content_height
-
-    # Calculate the maximum cell size that will fit both puzzles
-    # Available height = content_height - 2 * puzzle_number_height - gap
-    available_for_grids = (
-        content_height - 2 * puzzle_number_height - gap_between_puzzles
-    )
-
-    # Each puzzle needs: grid_rows * cell_size
-    # Total rows = puz1.grid.height + puz2.grid.height
-    total_rows = puz1.grid.height + puz2.grid.height
-    max_cell_size_for_height = available_for_grids / total_rows
-
-    # Also check width constraint
-    max_cols = max(puz1.grid.width, puz2.grid.width)
-    max_cell_size_for_width = layout.content_width / max_cols
-
-    # Use the smaller of the two constraints, but don't exceed original config
-    cell_size = min(max_cell_size_for_height, max_cell_size_for_width, config.cell_size)
-
-    # Create scaled config
+def _scaled_config(config: RenderConfig, cell_size: float) -> RenderConfig:
+    """Scale a render configuration to another cell size."""
     scale = cell_size / config.cell_size
-    scaled_config = RenderConfig(
+    return RenderConfig(
         cell_size=cell_size,
         line_width=config.line_width * scale,
         thick_line_width=config.thick_line_width * scale,
@@ -114,28 +191,24 @@ def _draw_two_puzzle_page(
         solution_font_size=max(8.0, config.solution_font_size * scale),
         font_name=config.font_name,
         show_solution=config.show_solution,
+        render_mode=config.render_mode,
     )
 
-    # Calculate actual grid dimensions with scaled cell size
-    grid_width1 = puz1.grid.width * cell_size
-    grid_height1 = puz1.grid.height * cell_size
-    grid_width2 = puz2.grid.width * cell_size
 
-    # Position first puzzle at top
-    y1 = page_height - layout.margins.top - puzzle_number_height
-    x1 = (page_width - grid_width1) / 2
-
-    # Draw first puzzle
-    _draw_puzzle_number(canvas, num1, x1, y1 + 20, grid_width1, scaled_config)
-    render_grid(canvas, puz1, x1, y1, scaled_config)
-
-    # Position second puzzle below first with gap
-    y2 = y1 - grid_height1 - gap_between_puzzles - puzzle_number_height
-    x2 = (page_width - grid_width2) / 2
+def _draw_n_up_page(
+    canvas: Canvas,
+    puzzles: list[tuple[int, Puzzle]],
+    layout: PageLayout,
+) -> None:
+    """Draw several puzzles on a page at a common cell size."""
+    packing = pack_puzzle_page(puzzles, layout)
+    config = _scaled_config(layout.render_config, packing.cell_size)
 
-    # Draw second puzzle
-    _draw_puzzle_number(canvas, num2, x2, y2 + 20, grid_width2, scaled_config)
-    render_grid(canvas, puz2, x2, y2, scaled_config)
+    for slot in packing.slots:
+        _draw_puzzle_number(
+            canvas, slot.number, slot.x, slot.y + 20, slot.width, config
+        )
+        render_grid(canvas, slot.puzzle, slot.x, slot.y, config)
 
 
 def _draw_puzzle_number(
@@ -180,6 +253,7 @@ def build_solution_page(
         solution_font_size=layout.render_config.solution_font_size * 0.7,
         font_name=layout.render_config.font_name,
         show_solution=True,
+        render_mode=layout.render_config.render_mode,
     )
 
     solution_layout = PageLayout(
@@ -5,14 +5,21 @@ This module handles the low-level rendering of Kakuro puzzle grids
 to a ReportLab PDF canvas.
 """
 
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from reportlab.pdfgen.canvas import Canvas
 from reportlab.lib.colors import black, white, Color
 
 from src.puzzle_generation import Puzzle, CellType
+from .metrics import centered_offset
 from .models import RenderConfig
 
+# Clue cell background, like the prototype (#D0D0D0 = 208/255 ≈ 0.816)
+CLUE_GRAY = Color(0.816, 0.816, 0.816)
+
+# Width of the diagonal splitting a clue cell
+DIAGONAL_WIDTH = 0.8
+
 
 def render_grid(
     canvas: Canvas,
@@ -42,6 +49,37 @@ def render_grid(
     # Save canvas state
     canvas.saveState()
 
+    if config.render_mode == "forms":
+        _render_cells_as_forms(canvas, puzzle, x, y, config)
+    elif config.render_mode == "batched":
+        _render_cells_batched(canvas, puzzle, x, y, config)
+    else:
+        _render_cells(canvas, puzzle, x, y, config)
+
+    # Draw outer border
+    canvas.setStrokeColor(black)
+    canvas.setLineWidth(config.thick_line_width)
+    canvas.rect(x, y - grid_height, grid_width, grid_height, stroke=1, fill=0)
+
+    # Restore canvas state
+    canvas.restoreState()
+
+    return grid_width, grid_height
+
+
+def _render_cells(
+    canvas: Canvas,
+    puzzle: Puzzle,
+    x: float,
+    y: float,
+    config: RenderConfig,
+) -> None:
+    """Draw every cell with its own rectangle, line and state calls."""
+    grid = puzzle.grid
+
+    # Clues come from the puzzle's cached run layout, O(1) per cell
+    layout = puzzle.layout
+
     # Set font
     canvas.setFont(config.font_name, config.clue_font_size)
 
@@ -56,8 +94,7 @@ def render_grid(
 
             if cell_value == CellType.BLACK.value:
                 # Black cell - check if it's a clue cell
-                h_clue = _get_horizontal_clue(puzzle, row, col)
-                v_clue = _get_vertical_clue(puzzle, row, col)
+                h_clue, v_clue = layout.clues(row, col)
 
                 if h_clue is not None or v_clue is not None:
                     # It's a clue cell with at least one clue
@@ -72,15 +109,177 @@ def render_grid(
                 )
                 _draw_white_cell(canvas, cell_x, cell_y, solution_value, config)
 
-    # Draw outer border
-    canvas.setStrokeColor(black)
-    canvas.setLineWidth(config.thick_line_width)
-    canvas.rect(x, y - grid_height, grid_width, grid_height, stroke=1, fill=0)
 
-    # Restore canvas state
+def _render_cells_as_forms(
+    canvas: Canvas,
+    puzzle: Puzzle,
+    x: float,
+    y: float,
+    config: RenderConfig,
+) -> None:
+    """Place each cell's background as a shared form, then draw the numbers.
+
+    The white, black and clue cell graphics are defined once per document
+    and cell size (see _cell_form), so each cell costs a single form
+    placement: a relative translation and a form call. Clue numbers and
+    solution digits are drawn afterwards with the fill color and font set
+    once per kind.
+    """
+    grid = puzzle.grid
+    layout = puzzle.layout
+    clues = []
+    digits = []
+
+    # Step the origin from cell to cell instead of saving state per cell
+    canvas.saveState()
+    origin_x = origin_y = 0.0
+    for row in range(grid.height):
+        for col in range(grid.width):
+            cell_x = x + col * config.cell_size
+            cell_y = y - (row + 1) * config.cell_size
+            cell_value = grid.get_cell(row, col)
+
+            if cell_value == CellType.BLACK.value:
+                h_clue, v_clue = layout.clues(row, col)
+                if h_clue is not None or v_clue is not None:
+                    kind = "clue"
+                    clues.append((cell_x, cell_y, h_clue, v_clue))
+                else:
+                    kind = "black"
+            else:
+                kind = "white"
+                if config.show_solution and cell_value > 0:
+                    digits.append((cell_x, cell_y, cell_value))
+
+            canvas.translate(cell_x - origin_x, cell_y - origin_y)
+            origin_x, origin_y = cell_x, cell_y
+            canvas.doForm(_cell_form(canvas, kind, config))
     canvas.restoreState()
 
-    return grid_width, grid_height
+    canvas.setFillColor(black)
+    if clues:
+        canvas.setFont(config.font_name, config.clue_font_size)
+        for cell_x, cell_y, h_clue, v_clue in clues:
+            _draw_clue_numbers(canvas, cell_x, cell_y, h_clue, v_clue, config)
+    if digits:
+        canvas.setFont(config.font_name, config.solution_font_size)
+        for cell_x, cell_y, value in digits:
+            _draw_digit(canvas, cell_x, cell_y, value, config)
+
+
+def _render_cells_batched(
+    canvas: Canvas,
+    puzzle: Puzzle,
+    x: float,
+    y: float,
+    config: RenderConfig,
+) -> None:
+    """Draw the whole grid with one path per fill color and one text object.
+
+    White, black and clue cell fills each go into a single filled path. The
+    cell borders are then stroked as one lattice of full-length grid lines,
+    and the clue diagonals as one more path, so the graphics state is set a
+    handful of times per grid instead of per cell. Clue numbers and solution
+    digits share one text object.
+    """
+    grid = puzzle.grid
+    layout = puzzle.layout
+    size = config.cell_size
+    fills = {
+        "white": canvas.beginPath(),
+        "black": canvas.beginPath(),
+        "clue": canvas.beginPath(),
+    }
+    diagonals = canvas.beginPath()
+    clue_texts = []
+    digit_texts = []
+
+    for row in range(grid.height):
+        for col in range(grid.width):
+            cell_x = x + col * size
+            cell_y = y - (row + 1) * size
+            cell_value = grid.get_cell(row, col)
+
+            if cell_value == CellType.BLACK.value:
+                h_clue, v_clue = layout.clues(row, col)
+                if h_clue is not None or v_clue is not None:
+                    fills["clue"].rect(cell_x, cell_y, size, size)
+                    diagonals.moveTo(cell_x, cell_y + size)
+                    diagonals.lineTo(cell_x + size, cell_y)
+                    clue_texts.extend(
+                        _clue_texts(cell_x, cell_y, h_clue, v_clue, config)
+                    )
+                else:
+                    fills["black"].rect(cell_x, cell_y, size, size)
+            else:
+                fills["white"].rect(cell_x, cell_y, size, size)
+                if config.show_solution and cell_value > 0:
+                    digit_texts.append(_digit_text(cell_x, cell_y, cell_value, config))
+
+    for kind, color in (("white", white), ("black", black), ("clue", CLUE_GRAY)):
+        canvas.setFillColor(color)
+        canvas.drawPath(fills[kind], stroke=0, fill=1)
+
+    # Every cell is stroked in black, so the borders form a full lattice
+    width = grid.width * size
+    height = grid.height * size
+    lattice = canvas.beginPath()
+    for row in range(grid.height + 1):
+        lattice.moveTo(x, y - row * size)
+        lattice.lineTo(x + width, y - row * size)
+    for col in range(grid.width + 1):
+        lattice.moveTo(x + col * size, y)
+        lattice.lineTo(x + col * size, y - height)
+    canvas.setStrokeColor(black)
+    canvas.setLineWidth(config.line_width)
+    canvas.drawPath(lattice, stroke=1, fill=0)
+    canvas.setLineWidth(DIAGONAL_WIDTH)
+    canvas.drawPath(diagonals, stroke=1, fill=0)
+
+    if clue_texts or digit_texts:
+        text = canvas.beginText()
+        text.setFillColor(black)
+        for font_size, texts in (
+            (config.clue_font_size, clue_texts),
+            (config.solution_font_size, digit_texts),
+        ):
+            if texts:
+                text.setFont(config.font_name, font_size)
+                for text_x, text_y, value in texts:
+                    text.setTextOrigin(text_x, text_y)
+                    text.textOut(value)
+        canvas.drawText(text)
+
+
+def _cell_form(canvas: Canvas, kind: str, config: RenderConfig) -> str:
+    """Return the name of the form for a cell kind, defining it on first use.
+
+    Forms are keyed by cell size and line width, so every grid drawn at the
+    same scale in a document shares them.
+
+    Args:
+        canvas: Canvas whose document holds the form.
+        kind: "white", "black" or "clue".
+        config: Rendering configuration (cell size and line width).
+
+    Returns:
+        Form name to pass to ``canvas.doForm``.
+    """
+    # Short names: each placement writes the name into the page stream
+    name = f"K{kind[0]}{config.cell_size:g}_{config.line_width:g}"
+    if not canvas.hasForm(name):
+        # Leave room for strokes centred on the cell edges
+        pad = max(config.line_width, DIAGONAL_WIDTH)
+        size = config.cell_size
+        canvas.beginForm(name, -pad, -pad, size + pad, size + pad)
+        if kind == "white":
+            _draw_white_cell(canvas, 0, 0, None, config)
+        elif kind == "black":
+            _draw_black_cell(canvas, 0, 0, config)
+        else:
+            _draw_clue_background(canvas, 0, 0, config)
+        canvas.endForm()
+    return name
 
 
 def _draw_black_cell(
@@ -112,14 +311,33 @@ def _draw_white_cell(
     if value is not None and value > 0:
         canvas.setFillColor(black)
         canvas.setFont(config.font_name, config.solution_font_size)
-        # Center the digit in the cell
-        text = str(value)
-        text_width = canvas.stringWidth(
-            text, config.font_name, config.solution_font_size
-        )
-        text_x = x + (config.cell_size - text_width) / 2
-        text_y = y + (config.cell_size - config.solution_font_size) / 2
-        canvas.drawString(text_x, text_y, text)
+        _draw_digit(canvas, x, y, value, config)
+
+
+def _draw_digit(
+    canvas: Canvas,
+    x: float,
+    y: float,
+    value: int,
+    config: RenderConfig,
+) -> None:
+    """Draw a solution digit centred in a cell, using the current font."""
+    canvas.drawString(*_digit_text(x, y, value, config))
+
+
+def _digit_text(
+    x: float,
+    y: float,
+    value: int,
+    config: RenderConfig,
+) -> Tuple[float, float, str]:
+    """Position of a solution digit centred in the cell at (x, y)."""
+    text = str(value)
+    centre = config.cell_size / 2
+    dx, dy = centered_offset(
+        text, config.font_name, config.solution_font_size, centre, centre
+    )
+    return x + dx, y + dy, text
 
 
 def _draw_clue_cell(
@@ -143,11 +361,24 @@ def _draw_clue_cell(
     Note: ReportLab coordinate system has Y=0 at bottom of page.
     Cell (x, y) is the BOTTOM-LEFT corner of the cell.
     """
+    _draw_clue_background(canvas, x, y, config)
+
+    # Draw clue numbers in black (matching prototype)
+    canvas.setFillColor(black)
+    canvas.setFont(config.font_name, config.clue_font_size)
+    _draw_clue_numbers(canvas, x, y, h_clue, v_clue, config)
+
+
+def _draw_clue_background(
+    canvas: Canvas,
+    x: float,
+    y: float,
+    config: RenderConfig,
+) -> None:
+    """Draw the gray background and diagonal of a clue cell."""
     cell_size = config.cell_size
 
-    # Gray background like prototype (#D0D0D0 = 208/255 ≈ 0.816)
-    gray = Color(0.816, 0.816, 0.816)
-    canvas.setFillColor(gray)
+    canvas.setFillColor(CLUE_GRAY)
     canvas.setStrokeColor(black)
     canvas.setLineWidth(config.line_width)
     canvas.rect(x, y, cell_size, cell_size, stroke=1, fill=1)
@@ -156,30 +387,55 @@ def _draw_clue_cell(
     # In ReportLab coords: top-left = (x, y + cell_size),
     # bottom-right = (x + cell_size, y)
     canvas.setStrokeColor(black)
-    canvas.setLineWidth(0.8)
+    canvas.setLineWidth(DIAGONAL_WIDTH)
     canvas.line(x, y + cell_size, x + cell_size, y)
 
-    # Draw clue numbers in black (matching prototype)
-    canvas.setFillColor(black)
-    canvas.setFont(config.font_name, config.clue_font_size)
+
+def _draw_clue_numbers(
+    canvas: Canvas,
+    x: float,
+    y: float,
+    h_clue: Optional[int],
+    v_clue: Optional[int],
+    config: RenderConfig,
+) -> None:
+    """Draw the clue numbers of a clue cell, using the current font and fill."""
+    for text_x, text_y, text in _clue_texts(x, y, h_clue, v_clue, config):
+        canvas.drawString(text_x, text_y, text)
+
+
+def _clue_texts(
+    x: float,
+    y: float,
+    h_clue: Optional[int],
+    v_clue: Optional[int],
+    config: RenderConfig,
+) -> List[Tuple[float, float, str]]:
+    """Positions of the clue numbers in the clue cell at (x, y)."""
+    cell_size = config.cell_size
+    texts = []
 
     # Horizontal clue ('across') - sum for run going RIGHT
     # Position at 75% across, 75% up (upper-right area, above diagonal)
     if h_clue is not None and h_clue > 0:
         text = str(h_clue)
-        text_width = canvas.stringWidth(text, config.font_name, config.clue_font_size)
-        text_x = x + cell_size * 0.75 - text_width / 2
-        text_y = y + cell_size * 0.75 - config.clue_font_size / 2
-        canvas.drawString(text_x, text_y, text)
+        anchor = cell_size * 0.75
+        dx, dy = centered_offset(
+            text, config.font_name, config.clue_font_size, anchor, anchor
+        )
+        texts.append((x + dx, y + dy, text))
 
     # Vertical clue ('down') - sum for run going DOWN
     # Position at 25% across, 25% up (lower-left area, below diagonal)
     if v_clue is not None and v_clue > 0:
         text = str(v_clue)
-        text_width = canvas.stringWidth(text, config.font_name, config.clue_font_size)
-        text_x = x + cell_size * 0.25 - text_width / 2
-        text_y = y + cell_size * 0.25 - config.clue_font_size / 2
-        canvas.drawString(text_x, text_y, text)
+        anchor = cell_size * 0.25
+        dx, dy = centered_offset(
+            text, config.font_name, config.clue_font_size, anchor, anchor
+        )
+        texts.append((x + dx, y + dy, text))
+
+    return texts
 
 
 def _get_horizontal_clue(puzzle: Puzzle, row: int, col: int) -> Optional[int]:
@@ -193,12 +449,8 @@ def _get_horizontal_clue(puzzle: Puzzle, row: int, col: int) -> Optional[int]:
     Returns:
         The clue value if this cell starts a horizontal run, None otherwise.
     """
-    for run in puzzle.horizontal_runs:
-        # Check if this cell is the clue position (one before the run starts)
-        # Horizontal runs: clue is at (row, col-1) for run starting at (row, col)
-        if run.row == row and run.col == col + 1:
-            return run.total
-    return None
+    # Horizontal runs: clue is at (row, col-1) for run starting at (row, col)
+    return puzzle.layout.clues(row, col)[0]
 
 
 def _get_vertical_clue(puzzle: Puzzle, row: int, col: int) -> Optional[int]:
@@ -212,9 +464,5 @@ def _get_vertical_clue(puzzle: Puzzle, row: int, col: int) -> Optional[int]:
     Returns:
         The clue value if this cell starts a vertical run, None otherwise.
     """
-    for run in puzzle.vertical_runs:
-        # Check if this cell is the clue position (one above the run starts)
-        # Vertical runs: clue is at (row-1, col) for run starting at (row, col)
-        if run.col == col and run.row == row + 1:
-            return run.total
-    return None
+    # Vertical runs: clue is at (row-1, col) for run starting at (row, col)
+    return puzzle.layout.clues(row, col)[1]
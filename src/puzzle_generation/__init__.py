@@ -6,27 +6,81 @@ configurable dimensions and difficulty levels.
 
 Main exports:
     - generate_puzzle: Generate a complete Kakuro puzzle
+    - generate_puzzle_in_band: Generate a puzzle within a difficulty band
     - solve_puzzle: Solve a given Kakuro puzzle
+    - score_puzzle: Rate a puzzle by the solving techniques it needs
+    - iter_puzzles: Stream puzzles with a resumable on-disk journal
+    - PuzzleRef: Journal reference to a puzzle, loaded only when drawn
+    - PuzzleStore: Content-addressed store of generated puzzle streams
+    - PuzzleCorpus: Indexed SQLite corpus of puzzles and book assignments
+    - puzzle_fingerprint: Canonical, transpose-invariant puzzle hash
+    - PackedPuzzleFile: Memory-mapped reader for packed binary puzzle files
+    - PackedWriter: Incremental writer for packed binary puzzle files
     - Grid: Grid data structure
+    - CompactGrid: Flat byte-array grid with the same accessors as Grid
     - Run: Run data structure
+    - RunLayout: Runs of a grid with per-cell run and clue lookups
     - Puzzle: Complete puzzle data structure
 """
 
-from .models import Grid, Run, Puzzle, Direction, CellType
-from .generator import generate_puzzle, PuzzleGenerationError, InvalidGridError
+from .models import Grid, CompactGrid, Run, RunLayout, Puzzle, Direction, CellType
+from .generator import (
+    GENERATOR_VERSION,
+    generate_puzzle,
+    generate_puzzle_in_band,
+    PuzzleGenerationError,
+    InvalidGridError,
+)
 from .solver import solve_puzzle, SolverError, UnsolvableError, SolverTimeoutError
 from .config import PuzzleConfig, get_config
+from .difficulty import (
+    DifficultyBand,
+    DifficultyScore,
+    GenerationStats,
+    DEFAULT_BANDS,
+    score_puzzle,
+)
+from .fingerprint import DuplicateIndex, DuplicateGroup, puzzle_fingerprint
+from .packed import PackedPuzzleFile, PackedWriter, PackedFormatError, write_packed
+from .stream import GenerationSpec, JournalMismatchError, iter_puzzles
+from .store import PuzzleStore
+from .refs import PuzzleRef, load_puzzle
+from .corpus import PuzzleCorpus, CorpusEntry
 
 __all__ = [
     "generate_puzzle",
+    "generate_puzzle_in_band",
     "solve_puzzle",
+    "score_puzzle",
+    "iter_puzzles",
+    "GenerationSpec",
+    "JournalMismatchError",
+    "PuzzleStore",
+    "PuzzleRef",
+    "load_puzzle",
+    "PuzzleCorpus",
+    "CorpusEntry",
+    "puzzle_fingerprint",
+    "DuplicateIndex",
+    "DuplicateGroup",
+    "PackedPuzzleFile",
+    "PackedWriter",
+    "PackedFormatError",
+    "write_packed",
     "Grid",
+    "CompactGrid",
     "Run",
+    "RunLayout",
     "Puzzle",
     "Direction",
     "CellType",
     "PuzzleConfig",
     "get_config",
+    "DifficultyBand",
+    "DifficultyScore",
+    "GenerationStats",
+    "DEFAULT_BANDS",
+    "GENERATOR_VERSION",
     "PuzzleGenerationError",
     "InvalidGridError",
     "SolverError",
@@ -0,0 +1,602 @@
+"""
+SQLite-backed puzzle corpus.
+
+Puzzles are stored as compact blobs (one byte per cell of the solved grid;
+runs and clue totals are derived again on load) next to indexed columns
+describing each puzzle: size, white cell count, difficulty label and score,
+technique profile, whether logic alone solves it, generator version and
+source. A second table records which book uses which puzzle, so picking
+puzzles for a new book is an indexed query instead of a regeneration.
+"""
+
+import json
+import logging
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .difficulty import TECHNIQUE_WEIGHTS, score_puzzle
+from .generator import GENERATOR_VERSION
+from .models import Grid, Puzzle
+from .runs import compute_run_totals, extract_runs
+
+logger = logging.getLogger(__name__)
+
+# Columns holding the number of cells placed by each technique
+TECHNIQUE_COLUMNS = {name: f"{name}_cells" for name in TECHNIQUE_WEIGHTS}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS puzzles (
+    id INTEGER PRIMARY KEY,
+    blob BLOB NOT NULL UNIQUE,
+    fingerprint TEXT,
+    height INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    white_count INTEGER NOT NULL,
+    difficulty TEXT,
+    score REAL,
+    {", ".join(f"{col} INTEGER" for col in TECHNIQUE_COLUMNS.values())},
+    logic_solvable INTEGER,
+    generator_version TEXT NOT NULL,
+    source TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_puzzles_fingerprint
+    ON puzzles (fingerprint);
+CREATE INDEX IF NOT EXISTS idx_puzzles_size ON puzzles (height, width);
+CREATE INDEX IF NOT EXISTS idx_puzzles_score ON puzzles (score);
+CREATE INDEX IF NOT EXISTS idx_puzzles_select
+    ON puzzles (difficulty, height, width, logic_solvable, score);
+CREATE TABLE IF NOT EXISTS book_puzzles (
+    book TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    puzzle_id INTEGER NOT NULL REFERENCES puzzles (id),
+    PRIMARY KEY (book, position)
+);
+CREATE INDEX IF NOT EXISTS idx_book_puzzles_puzzle ON book_puzzles (puzzle_id);
+"""
+
+_BLACK = 0xFF
+
+
+def encode_puzzle(puzzle: Puzzle) -> bytes:
+    """
+    Encode a solved puzzle as a compact blob.
+
+    Layout: height byte, width byte, then one byte per cell in row-major
+    order (0xFF for black cells, the digit otherwise).
+
+    Args:
+        puzzle: Puzzle with a filled grid
+
+    Returns:
+        Encoded bytes
+    """
+    grid = puzzle.grid
+    cells = bytes(
+        _BLACK if value == -1 else value for row in grid.cells for value in row
+    )
+    return bytes((grid.height, grid.width)) + cells
+
+
+def decode_puzzle(blob: bytes) -> Puzzle:
+    """
+    Decode a blob written by encode_puzzle.
+
+    Args:
+        blob: Encoded puzzle bytes
+
+    Returns:
+        Puzzle with runs and clue totals recomputed from the grid
+    """
+    height, width = blob[0], blob[1]
+    cells = [
+        [
+            -1 if value == _BLACK else value
+            for value in blob[2 + r * width : 2 + (r + 1) * width]
+        ]
+        for r in range(height)
+    ]
+    grid = Grid(height=height, width=width, cells=cells)
+    layout = extract_runs(grid)
+    compute_run_totals(grid, layout.horizontal_runs, layout.vertical_runs)
+    return Puzzle.from_layout(grid, layout)
+
+
+@dataclass
+class CorpusEntry:
+    """
+    A puzzle row read from the corpus.
+
+    Attributes:
+        id: Row id in the corpus
+        puzzle: Decoded puzzle
+        difficulty: Difficulty label, if known
+        score: Difficulty score, if scored
+        techniques: Number of cells placed by each technique
+        logic_solvable: True if logic alone solves the puzzle, which proves
+            its solution unique; False means it needs a guess, so its
+            uniqueness is unknown
+        generator_version: Generator version that produced the puzzle
+        source: Where the puzzle was imported from
+    """
+
+    id: int
+    puzzle: Puzzle
+    difficulty: Optional[str] = None
+    score: Optional[float] = None
+    techniques: Dict[str, int] = field(default_factory=dict)
+    logic_solvable: Optional[bool] = None
+    generator_version: str = GENERATOR_VERSION
+    source: Optional[str] = None
+
+
+class PuzzleCorpus:
+    """Indexed SQLite store of puzzles and their book assignments."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open (and create if needed) a corpus database.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self._migrate()
+        self.conn.executescript(_SCHEMA)
+
+    def _migrate(self) -> None:
+        """Add or rename columns changed after a corpus file was created."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(puzzles)")}
+        if "is_unique" in columns:
+            # It never held uniqueness, only whether logic solved the puzzle
+            logger.info("Renaming is_unique column of puzzle corpus")
+            with self.conn:
+                self.conn.execute(
+                    "ALTER TABLE puzzles RENAME COLUMN is_unique TO logic_solvable"
+                )
+        if columns and "fingerprint" not in columns:
+            logger.info("Adding fingerprint column to puzzle corpus")
+            with self.conn:
+                self.conn.execute("ALTER TABLE puzzles ADD COLUMN fingerprint TEXT")
+                # Transposed copies already stored keep a NULL fingerprint
+                seen = set()
+                updates = []
+                for pid, blob in self.conn.execute("SELECT id, blob FROM puzzles"):
+                    fingerprint = decode_puzzle(blob).fingerprint()
+                    if fingerprint not in seen:
+                        seen.add(fingerprint)
+                        updates.append((fingerprint, pid))
+                self.conn.executemany(
+                    "UPDATE puzzles SET fingerprint = ? WHERE id = ?", updates
+                )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "PuzzleCorpus":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_puzzles(
+        self,
+        puzzles: Iterable[Puzzle],
+        difficulty: Optional[str] = None,
+        source: Optional[str] = None,
+        score: bool = True,
+        generator_version: str = GENERATOR_VERSION,
+        batch_size: int = 500,
+    ) -> int:
+        """
+        Bulk insert puzzles, skipping ones already in the corpus.
+
+        A puzzle counts as already stored when its canonical fingerprint
+        matches, so transposed copies are skipped too.
+
+        Rows are written in batches inside a single transaction.
+
+        Args:
+            puzzles: Puzzles to insert
+            difficulty: Difficulty label for all puzzles
+            source: Source description (e.g. the file they came from)
+            score: Whether to compute difficulty scores on insert
+            generator_version: Generator version that produced the puzzles
+            batch_size: Rows per executemany batch
+
+        Returns:
+            Number of new puzzles inserted
+        """
+        columns = [
+            "blob",
+            "fingerprint",
+            "height",
+            "width",
+            "white_count",
+            "difficulty",
+            "score",
+            *TECHNIQUE_COLUMNS.values(),
+            "logic_solvable",
+            "generator_version",
+            "source",
+        ]
+        sql = (
+            f"INSERT OR IGNORE INTO puzzles ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+
+        before = self.conn.total_changes
+        batch: List[Tuple[Any, ...]] = []
+        with self.conn:
+            for puzzle in puzzles:
+                batch.append(
+                    self._row(puzzle, difficulty, source, score, generator_version)
+                )
+                if len(batch) >= batch_size:
+                    self.conn.executemany(sql, batch)
+                    batch.clear()
+            if batch:
+                self.conn.executemany(sql, batch)
+
+        inserted = self.conn.total_changes - before
+        logger.info(f"Inserted {inserted} puzzles into corpus")
+        return inserted
+
+    def _row(
+        self,
+        puzzle: Puzzle,
+        difficulty: Optional[str],
+        source: Optional[str],
+        score: bool,
+        generator_version: str,
+    ) -> Tuple[Any, ...]:
+        """Build the insert row for one puzzle."""
+        white_count = sum(
+            1 for row in puzzle.grid.cells for value in row if value != -1
+        )
+        if score:
+            result = score_puzzle(puzzle)
+            scored = (
+                result.score,
+                *(result.techniques.get(name, 0) for name in TECHNIQUE_COLUMNS),
+                int(result.is_logically_unique),
+            )
+        else:
+            scored = (None,) * (len(TECHNIQUE_COLUMNS) + 2)
+        return (
+            encode_puzzle(puzzle),
+            puzzle.fingerprint(),
+            puzzle.grid.height,
+            puzzle.grid.width,
+            white_count,
+            difficulty,
+            *scored,
+            generator_version,
+            source,
+        )
+
+    def query(
+        self,
+        difficulty: Optional[str] = None,
+        size: Optional[Tuple[int, int]] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        logic_solvable: Optional[bool] = None,
+        unused: bool = False,
+        book: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CorpusEntry]:
+        """
+        Stream puzzles matching the given filters.
+
+        Rows are decoded one at a time as the cursor advances, so large
+        result sets are never held in memory.
+
+        Args:
+            difficulty: Difficulty label
+            size: (height, width) grid size
+            min_score: Lowest difficulty score (inclusive)
+            max_score: Highest difficulty score (inclusive)
+            logic_solvable: Filter on whether logic alone solves the puzzle
+            unused: Only puzzles not assigned to any book
+            book: Only puzzles assigned to this book, in book order
+            limit: Maximum number of rows
+
+        Yields:
+            CorpusEntry objects ordered by id (or book position)
+        """
+        where, params = self._filters(
+            difficulty, size, min_score, max_score, logic_solvable
+        )
+        join = ""
+        order = "p.id"
+        if book is not None:
+            join = "JOIN book_puzzles b ON b.puzzle_id = p.id"
+            where.append("b.book = ?")
+            params.append(book)
+            order = "b.position"
+        if unused:
+            where.append("p.id NOT IN (SELECT puzzle_id FROM book_puzzles)")
+
+        sql = f"SELECT {self._select_columns()} FROM puzzles p {join}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        for row in self.conn.execute(sql, params):
+            yield self._entry(row)
+
+    def count(
+        self,
+        difficulty: Optional[str] = None,
+        size: Optional[Tuple[int, int]] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        logic_solvable: Optional[bool] = None,
+    ) -> int:
+        """Count puzzles matching the given filters (see query)."""
+        where, params = self._filters(
+            difficulty, size, min_score, max_score, logic_solvable
+        )
+        sql = "SELECT COUNT(*) FROM puzzles p"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Summarize the corpus by difficulty and size.
+
+        Returns:
+            One dict per (difficulty, height, width) group with counts and
+            score statistics
+        """
+        sql = (
+            "SELECT difficulty, height, width, COUNT(*), SUM(logic_solvable), "
+            "AVG(score), MIN(score), MAX(score) FROM puzzles "
+            "GROUP BY difficulty, height, width ORDER BY difficulty, height, width"
+        )
+        keys = (
+            "difficulty",
+            "height",
+            "width",
+            "count",
+            "logic_solvable",
+            "avg_score",
+            "min_score",
+            "max_score",
+        )
+        return [dict(zip(keys, row)) for row in self.conn.execute(sql)]
+
+    def select_for_book(
+        self,
+        book: str,
+        count: int,
+        difficulty: Optional[str] = None,
+        size: Optional[Tuple[int, int]] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        logic_solvable: Optional[bool] = None,
+    ) -> List[CorpusEntry]:
+        """
+        Assign unused puzzles to a book and return them.
+
+        Args:
+            book: Book identifier
+            count: Number of puzzles to select
+            difficulty: Difficulty label
+            size: (height, width) grid size
+            min_score: Lowest difficulty score (inclusive)
+            max_score: Highest difficulty score (inclusive)
+            logic_solvable: Filter on whether logic alone solves the puzzle
+
+        Returns:
+            Selected entries, in the order they were added to the book
+
+        Raises:
+            ValueError: If the corpus has fewer matching unused puzzles
+        """
+        entries = list(
+            self.query(
+                difficulty=difficulty,
+                size=size,
+                min_score=min_score,
+                max_score=max_score,
+                logic_solvable=logic_solvable,
+                unused=True,
+                limit=count,
+            )
+        )
+        if len(entries) < count:
+            raise ValueError(
+                f"Corpus has only {len(entries)} unused puzzles matching the "
+                f"selection, {count} requested"
+            )
+
+        self.assign_to_book(book, [entry.id for entry in entries])
+        return entries
+
+    def assign_to_book(self, book: str, puzzle_ids: Iterable[int]) -> None:
+        """
+        Append puzzles to a book's list.
+
+        Args:
+            book: Book identifier
+            puzzle_ids: Corpus ids, in book order
+        """
+        with self.conn:
+            start = self.conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM book_puzzles "
+                "WHERE book = ?",
+                (book,),
+            ).fetchone()[0]
+            self.conn.executemany(
+                "INSERT INTO book_puzzles (book, position, puzzle_id) "
+                "VALUES (?, ?, ?)",
+                [(book, start + i, pid) for i, pid in enumerate(puzzle_ids)],
+            )
+
+    def import_json(
+        self,
+        path: Union[str, Path],
+        difficulty: Optional[str] = None,
+        score: bool = True,
+        book: Optional[str] = None,
+    ) -> int:
+        """
+        Import a puzzle cache file.
+
+        Accepts both JSON list caches and JSONL store journals. When no
+        difficulty is given it is taken from the file name prefix (for
+        example ``beginner_25_6.json``).
+
+        When a book is given, the file's puzzles are also appended to the
+        book's list in file order, whether or not they were new to the
+        corpus. Puzzles the book already lists are not added again, so
+        importing a legacy cache and the journal seeded from it records
+        each puzzle once. A journal's puzzles are all recorded, including
+        any beyond what the book's sections currently take.
+
+        Args:
+            path: Cache file
+            difficulty: Difficulty label for the imported puzzles
+            score: Whether to compute difficulty scores on insert
+            book: Book the file's puzzles belong to
+
+        Returns:
+            Number of new puzzles inserted
+        """
+        path = Path(path)
+        if difficulty is None:
+            difficulty = path.stem.split("_", 1)[0]
+
+        fingerprints: List[str] = []
+
+        def tracked() -> Iterator[Puzzle]:
+            for puzzle in read_puzzle_file(path):
+                fingerprints.append(puzzle.fingerprint())
+                yield puzzle
+
+        inserted = self.add_puzzles(
+            tracked(), difficulty=difficulty, source=str(path), score=score
+        )
+        if book is not None:
+            listed = {
+                pid
+                for (pid,) in self.conn.execute(
+                    "SELECT puzzle_id FROM book_puzzles WHERE book = ?", (book,)
+                )
+            }
+            ids = []
+            for fingerprint in fingerprints:
+                row = self.conn.execute(
+                    "SELECT id FROM puzzles WHERE fingerprint = ?", (fingerprint,)
+                ).fetchone()
+                if row is not None and row[0] not in listed:
+                    listed.add(row[0])
+                    ids.append(row[0])
+            self.assign_to_book(book, ids)
+        return inserted
+
+    def _filters(
+        self,
+        difficulty: Optional[str],
+        size: Optional[Tuple[int, int]],
+        min_score: Optional[float],
+        max_score: Optional[float],
+        logic_solvable: Optional[bool],
+    ) -> Tuple[List[str], List[Any]]:
+        """Build WHERE clauses and parameters for the common filters."""
+        where: List[str] = []
+        params: List[Any] = []
+        if difficulty is not None:
+            where.append("p.difficulty = ?")
+            params.append(difficulty)
+        if size is not None:
+            where.append("p.height = ? AND p.width = ?")
+            params.extend(size)
+        if min_score is not None:
+            where.append("p.score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("p.score <= ?")
+            params.append(max_score)
+        if logic_solvable is not None:
+            where.append("p.logic_solvable = ?")
+            params.append(int(logic_solvable))
+        return where, params
+
+    @staticmethod
+    def _select_columns() -> str:
+        """Column list matching _entry."""
+        return ", ".join(
+            [
+                "p.id",
+                "p.blob",
+                "p.difficulty",
+                "p.score",
+                *(f"p.{col}" for col in TECHNIQUE_COLUMNS.values()),
+                "p.logic_solvable",
+                "p.generator_version",
+                "p.source",
+            ]
+        )
+
+    @staticmethod
+    def _entry(row: Tuple[Any, ...]) -> CorpusEntry:
+        """Build a CorpusEntry from a row selected with _select_columns."""
+        n = len(TECHNIQUE_COLUMNS)
+        pid, blob, difficulty, score = row[:4]
+        counts = row[4 : 4 + n]
+        logic_solvable, generator_version, source = row[4 + n :]
+        techniques = {
+            name: value
+            for name, value in zip(TECHNIQUE_COLUMNS, counts)
+            if value is not None
+        }
+        return CorpusEntry(
+            id=pid,
+            puzzle=decode_puzzle(blob),
+            difficulty=difficulty,
+            score=score,
+            techniques=techniques,
+            logic_solvable=None if logic_solvable is None else bool(logic_solvable),
+            generator_version=generator_version,
+            source=source,
+        )
+
+
+def read_puzzle_file(path: Union[str, Path]) -> Iterator[Puzzle]:
+    """
+    Yield puzzles from a JSON list cache or a JSONL journal.
+
+    Args:
+        path: ``.json`` list cache or ``.jsonl`` store journal
+
+    Yields:
+        Puzzle objects in file order
+    """
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if "puzzle" in entry:
+                    yield Puzzle.from_dict(entry["puzzle"])
+        return
+
+    with open(path, "r") as f:
+        data = json.load(f)
+    for item in data:
+        yield Puzzle.from_dict(item)
@@ -0,0 +1,416 @@
+"""
+Difficulty scoring for Kakuro puzzles.
+
+This module rates a filled puzzle by solving it from its clues alone with a
+small set of human solving techniques, cheapest first. Every cell is charged
+the weight of the technique that was needed to place it, so puzzles that need
+harder reasoning (or guessing) score higher.
+
+Scoring can stop early: when a target band is supplied, the scorer aborts as
+soon as the final score can no longer land inside it.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+from .models import Puzzle, Run
+
+logger = logging.getLogger(__name__)
+
+# Bitmask with bits 1-9 set (bit d means digit d is still a candidate)
+ALL_DIGITS = 0b1111111110
+
+# Technique weights, cheapest first
+TECHNIQUE_WEIGHTS = {
+    "combination": 1.0,  # Run combinations and naked singles
+    "hidden_single": 2.0,  # Digit required by a run fits only one cell
+    "permutation": 4.0,  # Full enumeration of a run's placements
+    "guess": 10.0,  # No logical progress possible; a cell must be guessed
+}
+
+
+def _build_combinations() -> Dict[Tuple[int, int], List[int]]:
+    """Precompute digit-set bitmasks for every (length, total) pair."""
+    table: Dict[Tuple[int, int], List[int]] = {}
+    for length in range(1, 10):
+        for combo in combinations(range(1, 10), length):
+            mask = 0
+            for digit in combo:
+                mask |= 1 << digit
+            table.setdefault((length, sum(combo)), []).append(mask)
+    return table
+
+
+COMBINATIONS = _build_combinations()
+
+
+@dataclass(frozen=True)
+class DifficultyBand:
+    """
+    A target difficulty range for generation.
+
+    Attributes:
+        name: Band name (e.g. "beginner")
+        min_score: Lowest acceptable score (inclusive)
+        max_score: Highest acceptable score (inclusive)
+        allow_guessing: Whether puzzles that cannot be solved by logic
+            alone may be accepted
+        black_density: Black cell density used for candidates in this band
+    """
+
+    name: str
+    min_score: float
+    max_score: float
+    allow_guessing: bool = True
+    black_density: float = 0.22
+
+    def contains(self, result: "DifficultyScore") -> bool:
+        """Check if a scored puzzle lands inside this band."""
+        if result.aborted:
+            return False
+        if result.requires_guessing and not self.allow_guessing:
+            return False
+        return self.min_score <= result.score <= self.max_score
+
+
+# Default bands for the three book difficulty levels, spanning roughly the
+# 10th to 90th percentile of scores measured for each level's grid sizes
+# (6-8, 9-11 and 12-15) at the band's black density. Scores are averaged per
+# cell and barely move with grid size, so the books separate levels by size;
+# the bands reject outliers rather than reorder the levels.
+DEFAULT_BANDS = {
+    "beginner": DifficultyBand("beginner", 3.25, 5.5, black_density=0.24),
+    "intermediate": DifficultyBand("intermediate", 3.5, 5.0, black_density=0.22),
+    "expert": DifficultyBand("expert", 4.0, 5.0, black_density=0.20),
+}
+
+
+@dataclass
+class DifficultyScore:
+    """
+    Result of scoring a puzzle.
+
+    Attributes:
+        score: Average technique weight per white cell (1.0 = all basic)
+        techniques: Number of cells placed by each technique
+        requires_guessing: True if logic alone could not finish the puzzle
+        aborted: True if scoring stopped because the band was unreachable
+    """
+
+    score: float
+    techniques: Dict[str, int] = field(default_factory=dict)
+    requires_guessing: bool = False
+    aborted: bool = False
+
+    @property
+    def is_logically_unique(self) -> bool:
+        """True if logic alone solved the puzzle, which proves uniqueness."""
+        return not self.requires_guessing and not self.aborted
+
+
+@dataclass
+class GenerationStats:
+    """
+    Acceptance statistics for band-targeted generation.
+
+    Attributes:
+        candidates: Number of filled candidates that were scored
+        accepted: Number of candidates that landed in the band
+        aborted: Number of candidates abandoned early by the scorer
+        elapsed: Total generation time in seconds
+    """
+
+    candidates: int = 0
+    accepted: int = 0
+    aborted: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def acceptance_rate(self) -> float:
+        """Fraction of scored candidates that were accepted."""
+        return self.accepted / self.candidates if self.candidates else 0.0
+
+    @property
+    def seconds_per_accepted(self) -> Optional[float]:
+        """Average generation time per accepted puzzle."""
+        return self.elapsed / self.accepted if self.accepted else None
+
+    def to_dict(self) -> Dict[str, float]:
+        """Serialize statistics to a dictionary."""
+        return {
+            "candidates": self.candidates,
+            "accepted": self.accepted,
+            "aborted": self.aborted,
+            "elapsed": round(self.elapsed, 3),
+            "acceptance_rate": round(self.acceptance_rate, 4),
+            "seconds_per_accepted": (
+                round(self.seconds_per_accepted, 3)
+                if self.seconds_per_accepted is not None
+                else None
+            ),
+        }
+
+
+class _BandUnreachable(Exception):
+    """Internal signal that the score can no longer land in the band."""
+
+    pass
+
+
+def score_puzzle(
+    puzzle: Puzzle, band: Optional[DifficultyBand] = None
+) -> DifficultyScore:
+    """
+    Score a filled puzzle by solving it logically from its clues.
+
+    Args:
+        puzzle: A puzzle whose runs carry their totals
+        band: Optional target band. When given, scoring stops as soon as
+            the final score is guaranteed to fall outside the band.
+
+    Returns:
+        DifficultyScore describing the techniques that were needed
+    """
+    scorer = _LogicalScorer(puzzle, band)
+    return scorer.run()
+
+
+class _LogicalScorer:
+    """Technique-tiered logical solver that accumulates a difficulty score."""
+
+    def __init__(self, puzzle: Puzzle, band: Optional[DifficultyBand]):
+        grid = puzzle.grid
+        self.band = band
+        self.width = grid.width
+
+        # Candidate masks for every white cell, keyed by flat index, plus
+        # the filled digit so that a guess can be resolved to the solution
+        self.cand: Dict[int, int] = {}
+        self.solution: Dict[int, int] = {}
+        for row in range(grid.height):
+            for col in range(grid.width):
+                if not grid.is_black(row, col):
+                    idx = row * grid.width + col
+                    self.cand[idx] = ALL_DIGITS
+                    self.solution[idx] = grid.get_cell(row, col)
+
+        self.runs: List[Tuple[Tuple[int, ...], int]] = [
+            (self._cell_indices(run), run.total)
+            for run in puzzle.horizontal_runs + puzzle.vertical_runs
+        ]
+
+        self.white_count = len(self.cand)
+        self.solved: set = set()
+        self.weight_sum = 0.0
+        self.techniques: Dict[str, int] = {name: 0 for name in TECHNIQUE_WEIGHTS}
+
+        # Runs whose permutations were already enumerated without progress
+        self._exhausted: set = set()
+
+    def _cell_indices(self, run: Run) -> Tuple[int, ...]:
+        """Flat indices of a run's cells."""
+        return run.cell_indices(self.width)
+
+    def run(self) -> DifficultyScore:
+        """Solve tier by tier, charging each placement its technique weight."""
+        if self.white_count == 0:
+            return DifficultyScore(score=0.0, techniques=self.techniques)
+
+        tiers = (
+            ("combination", self._apply_combinations),
+            ("hidden_single", self._apply_hidden_singles),
+            ("permutation", self._apply_permutations),
+        )
+
+        requires_guessing = False
+        try:
+            while len(self.solved) < self.white_count:
+                for name, technique in tiers:
+                    if technique():
+                        self._charge(name)
+                        break
+                else:
+                    # Stuck: reveal one cell from the solution and carry on
+                    requires_guessing = True
+                    if not self._guess():
+                        self._charge_remaining("guess")
+                        break
+        except _BandUnreachable:
+            return self._result(requires_guessing, aborted=True)
+
+        return self._result(requires_guessing)
+
+    def _result(
+        self, requires_guessing: bool = False, aborted: bool = False
+    ) -> DifficultyScore:
+        return DifficultyScore(
+            score=self.weight_sum / self.white_count,
+            techniques=self.techniques,
+            requires_guessing=requires_guessing,
+            aborted=aborted,
+        )
+
+    def _charge(self, technique: str) -> None:
+        """Charge newly solved cells to a technique and check the band."""
+        newly_solved = [
+            idx
+            for idx, mask in self.cand.items()
+            if idx not in self.solved and mask & (mask - 1) == 0
+        ]
+        for idx in newly_solved:
+            self.solved.add(idx)
+        self.techniques[technique] += len(newly_solved)
+        self.weight_sum += TECHNIQUE_WEIGHTS[technique] * len(newly_solved)
+        self._check_band()
+
+    def _guess(self) -> bool:
+        """
+        Resolve the most constrained unsolved cell to its solution digit.
+
+        Returns:
+            False if the puzzle carries no solution to guess from
+        """
+        if self.band is not None and not self.band.allow_guessing:
+            raise _BandUnreachable()
+
+        unsolved = [idx for idx in self.cand if idx not in self.solved]
+        idx = min(unsolved, key=lambda i: bin(self.cand[i]).count("1"))
+        digit = self.solution[idx]
+        if not 1 <= digit <= 9:
+            return False
+        self.cand[idx] = 1 << digit
+        self._charge("guess")
+        return True
+
+    def _charge_remaining(self, technique: str) -> None:
+        """Charge all unsolved cells to a technique."""
+        remaining = self.white_count - len(self.solved)
+        self.techniques[technique] += remaining
+        self.weight_sum += TECHNIQUE_WEIGHTS[technique] * remaining
+
+    def _check_band(self) -> None:
+        """Abort when the final score is guaranteed to miss the band."""
+        if self.band is None:
+            return
+        remaining = self.white_count - len(self.solved)
+        lowest = (self.weight_sum + remaining * TECHNIQUE_WEIGHTS["combination"]) / (
+            self.white_count
+        )
+        highest_weight = (
+            TECHNIQUE_WEIGHTS["guess"]
+            if self.band.allow_guessing
+            else TECHNIQUE_WEIGHTS["permutation"]
+        )
+        highest = (self.weight_sum + remaining * highest_weight) / self.white_count
+        if lowest > self.band.max_score or highest < self.band.min_score:
+            raise _BandUnreachable()
+
+    def _valid_combos(self, cells: Tuple[int, ...], total: int) -> List[int]:
+        """Digit sets for a run that are still consistent with its candidates."""
+        valid = []
+        for combo in COMBINATIONS.get((len(cells), total), ()):
+            union = 0
+            for idx in cells:
+                overlap = self.cand[idx] & combo
+                if not overlap:
+                    break
+                union |= overlap
+            else:
+                if union == combo:
+                    valid.append(combo)
+        return valid
+
+    def _apply_combinations(self) -> bool:
+        """Restrict cells to their runs' combinations and remove placed digits."""
+        progress = False
+        changed = True
+        while changed:
+            changed = False
+            for cells, total in self.runs:
+                allowed = 0
+                for combo in self._valid_combos(cells, total):
+                    allowed |= combo
+                placed = 0
+                for idx in cells:
+                    mask = self.cand[idx]
+                    if mask & (mask - 1) == 0:
+                        placed |= mask
+                for idx in cells:
+                    mask = self.cand[idx]
+                    single = mask & (mask - 1) == 0
+                    new_mask = mask & allowed
+                    if not single:
+                        new_mask &= ~placed
+                    if new_mask != mask and new_mask:
+                        self.cand[idx] = new_mask
+                        changed = True
+                        progress = True
+        return progress
+
+    def _apply_hidden_singles(self) -> bool:
+        """Place digits that every valid combination needs but one cell can hold."""
+        progress = False
+        for cells, total in self.runs:
+            combos = self._valid_combos(cells, total)
+            if not combos:
+                continue
+            required = combos[0]
+            for combo in combos[1:]:
+                required &= combo
+            for digit in range(1, 10):
+                bit = 1 << digit
+                if not required & bit:
+                    continue
+                holders = [idx for idx in cells if self.cand[idx] & bit]
+                if len(holders) == 1 and self.cand[holders[0]] != bit:
+                    self.cand[holders[0]] = bit
+                    progress = True
+        return progress
+
+    def _apply_permutations(self) -> bool:
+        """Enumerate every placement of each run and keep only realizable digits."""
+        progress = False
+        for cells, total in self.runs:
+            masks = tuple(self.cand[idx] for idx in cells)
+            if all(mask & (mask - 1) == 0 for mask in masks):
+                continue
+            key = (cells, masks)
+            if key in self._exhausted:
+                continue
+
+            seen = [0] * len(cells)
+            for combo in self._valid_combos(cells, total):
+                self._enumerate(masks, 0, combo, [], seen)
+            narrowed = False
+            for pos, idx in enumerate(cells):
+                if seen[pos] and seen[pos] != self.cand[idx]:
+                    self.cand[idx] = seen[pos]
+                    narrowed = True
+            if narrowed:
+                progress = True
+            else:
+                self._exhausted.add(key)
+        return progress
+
+    def _enumerate(
+        self,
+        masks: Tuple[int, ...],
+        pos: int,
+        unused: int,
+        chosen: List[int],
+        seen: List[int],
+    ) -> None:
+        """Depth-first placement of a combination's digits onto a run's cells."""
+        if pos == len(masks):
+            for i, bit in enumerate(chosen):
+                seen[i] |= bit
+            return
+        options = masks[pos] & unused
+        while options:
+            bit = options & -options
+            options ^= bit
+            chosen.append(bit)
+            self._enumerate(masks, pos + 1, unused ^ bit, chosen, seen)
+            chosen.pop()
@@ -0,0 +1,301 @@
+"""
+Canonical puzzle fingerprints and a persistent duplicate index.
+
+A fingerprint identifies what a solver sees: the grid layout and the clue
+totals, not the particular solution digits. It is normalized under
+transposition (which turns across runs into down runs), so a grid and its
+mirror across the main diagonal share one fingerprint.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .models import Puzzle, Run
+
+logger = logging.getLogger(__name__)
+
+# (book, source) of one occurrence of a puzzle
+Occurrence = Tuple[Optional[str], Optional[str]]
+
+
+def puzzle_fingerprint(puzzle: Puzzle) -> str:
+    """
+    Compute the canonical fingerprint of a puzzle.
+
+    Args:
+        puzzle: Puzzle with runs and clue totals
+
+    Returns:
+        32-character hex digest, equal for a puzzle and its transpose
+    """
+    key = min(_layout_key(puzzle, False), _layout_key(puzzle, True))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _layout_key(puzzle: Puzzle, transpose: bool) -> str:
+    """Serialize layout and clues in one orientation."""
+    grid = puzzle.grid
+    cells = grid.cells
+    if transpose:
+        height, width = grid.width, grid.height
+        mask = "".join(
+            "#" if cells[c][r] == -1 else "."
+            for r in range(height)
+            for c in range(width)
+        )
+        across, down = puzzle.vertical_runs, puzzle.horizontal_runs
+    else:
+        height, width = grid.height, grid.width
+        mask = "".join("#" if value == -1 else "." for row in cells for value in row)
+        across, down = puzzle.horizontal_runs, puzzle.vertical_runs
+
+    def runs_key(runs: List[Run]) -> str:
+        keys = sorted(
+            (
+                (run.col, run.row, run.length, run.total)
+                if transpose
+                else (run.row, run.col, run.length, run.total)
+            )
+            for run in runs
+        )
+        return ";".join(",".join(map(str, key)) for key in keys)
+
+    return f"{height}x{width}|{mask}|A{runs_key(across)}|D{runs_key(down)}"
+
+
+@dataclass
+class DuplicateGroup:
+    """
+    A fingerprint that occurs more than once in the index.
+
+    Attributes:
+        fingerprint: Canonical puzzle fingerprint
+        occurrences: (book, source) pairs where the puzzle appears
+    """
+
+    fingerprint: str
+    occurrences: List[Occurrence]
+
+
+class DuplicateIndex:
+    """
+    Persistent index of puzzle fingerprints.
+
+    Fingerprints are kept in SQLite for persistence and in a dict in memory,
+    so membership checks during generation are O(1). Every occurrence is
+    recorded with its book and source so cross-book audits are a single
+    grouped query.
+
+    A puzzle belongs to its first recorded occurrence. claim and accepts
+    let that occurrence, such as a position in a puzzle journal, be
+    checked again on every build without counting as its own duplicate.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        """
+        Open (and create if needed) a duplicate index.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                fingerprint TEXT NOT NULL,
+                book TEXT,
+                source TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_fingerprints
+                ON fingerprints (fingerprint);
+            """)
+        # First occurrence of every fingerprint
+        self._owners: Dict[str, Occurrence] = {}
+        self._load_owners()
+
+    def _load_owners(self) -> None:
+        """Read the first occurrence of every fingerprint from the database."""
+        self._owners.clear()
+        for fingerprint, book, source in self.conn.execute(
+            "SELECT fingerprint, book, source FROM fingerprints ORDER BY rowid"
+        ):
+            self._owners.setdefault(fingerprint, (book, source))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "DuplicateIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of distinct fingerprints in the index."""
+        return len(self._owners)
+
+    def __contains__(self, puzzle: Puzzle) -> bool:
+        """Check whether a puzzle (or its transpose) is already indexed."""
+        return puzzle_fingerprint(puzzle) in self._owners
+
+    def add(
+        self,
+        puzzle: Puzzle,
+        book: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> bool:
+        """
+        Record a puzzle unless its fingerprint is already indexed.
+
+        Args:
+            puzzle: Puzzle to record
+            book: Book the puzzle belongs to
+            source: Where the puzzle came from
+
+        Returns:
+            True if the puzzle was new, False if it was a duplicate
+        """
+        fingerprint = puzzle_fingerprint(puzzle)
+        if fingerprint in self._owners:
+            return False
+        self._insert(fingerprint, book, source)
+        return True
+
+    def accepts(self, puzzle: Puzzle, book: Optional[str], source: str) -> bool:
+        """
+        Check whether a puzzle may appear at an occurrence.
+
+        Args:
+            puzzle: Puzzle to check
+            book: Book the occurrence belongs to
+            source: Identity of the occurrence within the book
+
+        Returns:
+            True if the puzzle is not indexed, or indexed for this very
+            occurrence
+        """
+        owner = self._owners.get(puzzle_fingerprint(puzzle))
+        return owner is None or owner == (book, source)
+
+    def claim(self, puzzle: Puzzle, book: Optional[str], source: str) -> bool:
+        """
+        Record a puzzle for an occurrence unless another occurrence holds it.
+
+        Claiming the same occurrence again is accepted and records nothing.
+
+        Args:
+            puzzle: Puzzle to record
+            book: Book the occurrence belongs to
+            source: Identity of the occurrence within the book
+
+        Returns:
+            True if the occurrence holds the puzzle, False if it is a
+            duplicate of another occurrence
+        """
+        fingerprint = puzzle_fingerprint(puzzle)
+        owner = self._owners.get(fingerprint)
+        if owner is None:
+            self._insert(fingerprint, book, source)
+            return True
+        return owner == (book, source)
+
+    def _insert(
+        self, fingerprint: str, book: Optional[str], source: Optional[str]
+    ) -> None:
+        """Record the first occurrence of a fingerprint."""
+        self._owners[fingerprint] = (book, source)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO fingerprints VALUES (?, ?, ?)", (fingerprint, book, source)
+            )
+
+    def books(self) -> Set[str]:
+        """Books with at least one recorded occurrence."""
+        return {
+            book
+            for (book,) in self.conn.execute(
+                "SELECT DISTINCT book FROM fingerprints WHERE book IS NOT NULL"
+            )
+        }
+
+    def release(self, book: str) -> int:
+        """
+        Remove every occurrence recorded for a book.
+
+        Called before a book is rebuilt, so it claims its puzzles afresh,
+        and for books that no longer exist, whose claims would otherwise
+        reject puzzles for good.
+
+        Args:
+            book: Book whose occurrences to remove
+
+        Returns:
+            Number of occurrences removed
+        """
+        with self.conn:
+            removed = self.conn.execute(
+                "DELETE FROM fingerprints WHERE book = ?", (book,)
+            ).rowcount
+        self._load_owners()
+        return removed
+
+    def record(
+        self,
+        puzzles: Iterable[Puzzle],
+        book: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> int:
+        """
+        Record every occurrence of a batch of puzzles, duplicates included.
+
+        Used for audits, where repeated fingerprints are the point.
+
+        Args:
+            puzzles: Puzzles to record
+            book: Book the puzzles belong to
+            source: Where the puzzles came from
+
+        Returns:
+            Number of puzzles whose fingerprint was already indexed
+        """
+        rows = []
+        duplicates = 0
+        for puzzle in puzzles:
+            fingerprint = puzzle_fingerprint(puzzle)
+            if fingerprint in self._owners:
+                duplicates += 1
+            self._owners.setdefault(fingerprint, (book, source))
+            rows.append((fingerprint, book, source))
+        with self.conn:
+            self.conn.executemany("INSERT INTO fingerprints VALUES (?, ?, ?)", rows)
+        return duplicates
+
+    def duplicates(self, cross_book_only: bool = False) -> List[DuplicateGroup]:
+        """
+        List fingerprints recorded more than once.
+
+        Args:
+            cross_book_only: Only report puzzles shared by different books
+
+        Returns:
+            Duplicate groups ordered by fingerprint
+        """
+        having = "COUNT(DISTINCT book)" if cross_book_only else "COUNT(*)"
+        sql = (
+            "SELECT f.fingerprint, f.book, f.source FROM fingerprints f "
+            "JOIN (SELECT fingerprint FROM fingerprints GROUP BY fingerprint "
+            f"HAVING {having} > 1) d ON d.fingerprint = f.fingerprint "
+            "ORDER BY f.fingerprint, f.rowid"
+        )
+        groups: List[DuplicateGroup] = []
+        for fingerprint, book, source in self.conn.execute(sql):
+            if not groups or groups[-1].fingerprint != fingerprint:
+                groups.append(DuplicateGroup(fingerprint, []))
+            groups[-1].occurrences.append((book, source))
+        return groups
@@ -7,14 +7,20 @@ and difficulty levels.
 
 import logging
 import random
+import time
 from typing import Optional, Tuple
 
 from .models import Grid, Puzzle, CellType
-from .runs import compute_runs
+from .runs import extract_runs
 from .solver import solve_kakuro
+from .difficulty import DifficultyBand, GenerationStats, score_puzzle
 
 logger = logging.getLogger(__name__)
 
+# Bump when a change to generation alters the puzzles produced for a seed,
+# so stored puzzle streams from older code are not mixed with new ones.
+GENERATOR_VERSION = "1"
+
 
 class PuzzleGenerationError(Exception):
     """Base exception for puzzle generation errors."""
@@ -88,9 +94,10 @@ def generate_puzzle(
         logger.debug(f"Generation attempt {attempt}/{max_attempts}")
 
         try:
-            grid, h_runs, v_runs = _generate_kakuro(
+            puzzle = _generate_kakuro(
                 height, width, black_density, max_run_length, compress_grid
             )
+            grid = puzzle.grid
 
             # Enforce minimum size constraint
             if grid.height < min_size[0] or grid.width < min_size[1]:
@@ -100,11 +107,10 @@ def generate_puzzle(
                 )
                 continue
 
-            puzzle = Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
-
             logger.info(
                 f"Successfully generated {grid.height}x{grid.width} puzzle with "
-                f"{len(h_runs)} horizontal and {len(v_runs)} vertical runs"
+                f"{len(puzzle.horizontal_runs)} horizontal and "
+                f"{len(puzzle.vertical_runs)} vertical runs"
             )
 
             return puzzle
@@ -119,13 +125,106 @@ def generate_puzzle(
     )
 
 
+def generate_puzzle_in_band(
+    height: int,
+    width: int,
+    band: DifficultyBand,
+    seed: Optional[int] = None,
+    max_attempts: int = 200,
+    max_run_length: int = 7,
+    min_size: Optional[Tuple[int, int]] = None,
+    compress_grid: bool = True,
+    stats: Optional[GenerationStats] = None,
+) -> Puzzle:
+    """
+    Generate a puzzle whose difficulty score lands inside a target band.
+
+    Each candidate is scored as soon as it is filled. Scoring aborts as soon
+    as the candidate can no longer land in the band, so rejected candidates
+    cost little beyond the fill itself.
+
+    Args:
+        height: Grid height (minimum 5)
+        width: Grid width (minimum 5)
+        band: Target difficulty band (also supplies the black density)
+        seed: Random seed for reproducibility
+        max_attempts: Maximum candidates to try before giving up
+        max_run_length: Maximum allowed run length
+        min_size: Optional minimum (height, width) after compression.
+            Defaults to the requested size.
+        compress_grid: If True, removes all-black rows/columns
+        stats: Optional statistics object updated with acceptance counts
+            and elapsed time
+
+    Returns:
+        A Puzzle whose score lies within the band
+
+    Raises:
+        InvalidGridError: If grid parameters are invalid
+        PuzzleGenerationError: If no candidate lands in the band
+    """
+    if height < 5 or width < 5:
+        raise InvalidGridError(f"Grid size must be at least 5x5, got {height}x{width}")
+
+    if min_size is None:
+        min_size = (height, width)
+
+    if seed is not None:
+        random.seed(seed)
+        logger.info(f"Using random seed: {seed}")
+
+    stats = stats if stats is not None else GenerationStats()
+    start = time.perf_counter()
+
+    try:
+        for attempt in range(1, max_attempts + 1):
+            try:
+                puzzle = _generate_kakuro(
+                    height, width, band.black_density, max_run_length, compress_grid
+                )
+            except Exception as e:
+                logger.debug(f"Attempt {attempt} failed: {e}")
+                continue
+
+            if puzzle.grid.height < min_size[0] or puzzle.grid.width < min_size[1]:
+                continue
+
+            result = score_puzzle(puzzle, band)
+            stats.candidates += 1
+
+            if result.aborted:
+                stats.aborted += 1
+                continue
+
+            if band.contains(result):
+                stats.accepted += 1
+                grid = puzzle.grid
+                logger.info(
+                    f"Accepted {grid.height}x{grid.width} {band.name} puzzle "
+                    f"(score {result.score:.2f}) after {attempt} attempt(s)"
+                )
+                return puzzle
+
+            logger.debug(
+                f"Rejecting candidate with score {result.score:.2f} "
+                f"outside {band.name} band"
+            )
+    finally:
+        stats.elapsed += time.perf_counter() - start
+
+    raise PuzzleGenerationError(
+        f"Failed to generate {min_size[0]}x{min_size[1]}+ puzzle in "
+        f"{band.name} band after {max_attempts} attempts"
+    )
+
+
 def _generate_kakuro(
     height: int,
     width: int,
     black_density: float,
     max_run_length: int = 7,
     compress_grid: bool = True,
-) -> Tuple[Grid, list, list]:
+) -> Puzzle:
     """
     Generate a single Kakuro puzzle.
 
@@ -145,7 +244,7 @@ def _generate_kakuro(
         compress_grid: If True, removes all-black rows/columns
 
     Returns:
-        Tuple of (grid, horizontal_runs, vertical_runs)
+        Solved puzzle carrying the run layout used to solve it
 
     Raises:
         Exception: If puzzle generation fails or quality check fails
@@ -180,20 +279,27 @@ def _generate_kakuro(
         # Re-check run lengths as compression may have merged runs
         _limit_run_lengths(grid, max_run_length)
 
-    # Compute runs
-    h_runs, v_runs = compute_runs(grid)
+    # Compute runs; the layout is shared by the solver and the puzzle
+    layout = extract_runs(grid)
+    h_runs, v_runs = layout.horizontal_runs, layout.vertical_runs
 
     logger.debug(f"Found {len(h_runs)} horizontal and {len(v_runs)} vertical runs")
 
     # Solve the puzzle to validate and compute clues
     if not solve_kakuro(
-        grid, h_runs, v_runs, randomize=True, use_csp=True, max_backtracks=500000
+        grid,
+        h_runs,
+        v_runs,
+        randomize=True,
+        use_csp=True,
+        max_backtracks=500000,
+        layout=layout,
     ):
         raise Exception(
             "Generated grid is too difficult to solve (exceeded backtrack limit)"
         )
 
-    return grid, h_runs, v_runs
+    return Puzzle.from_layout(grid, layout)
 
 
 def _remove_all_black_lines(grid: Grid) -> Grid:
@@ -338,43 +444,18 @@ def _cleanup_grid(grid: Grid, max_iterations: int = 50) -> None:
     """
     for iteration in range(max_iterations):
         changed = False
-        h_runs, v_runs = compute_runs(grid)
+        layout = extract_runs(grid)
+        across, down = layout.across, layout.down
 
         for i in range(1, grid.height):
+            base = i * grid.width
             for j in range(1, grid.width):
                 if not grid.is_black(i, j):
                     # Check if cell is in both horizontal and vertical runs
-                    in_h_run = _is_in_run(i, j, h_runs, horizontal=True)
-                    in_v_run = _is_in_run(i, j, v_runs, horizontal=False)
-
-                    if not (in_h_run and in_v_run):
+                    if across[base + j] < 0 or down[base + j] < 0:
                         grid.set_cell(i, j, CellType.BLACK.value)
                         changed = True
 
         if not changed:
             logger.debug(f"Grid stabilized after {iteration + 1} iterations")
             break
-
-
-def _is_in_run(row: int, col: int, runs: list, horizontal: bool) -> bool:
-    """
-    Check if a cell is part of any run in the list.
-
-    Args:
-        row: Cell row
-        col: Cell column
-        runs: List of runs to check
-        horizontal: True for horizontal runs, False for vertical
-
-    Returns:
-        True if cell is in a run
-    """
-    for run in runs:
-        if horizontal:
-            if run.row == row and run.col <= col < run.col + run.length:
-                return True
-        else:  # vertical
-            if run.col == col and run.row <= row < run.row + run.length:
-                return True
-
-    return False
@@ -5,9 +5,10 @@ This module defines the core data structures used throughout the puzzle
 generation system.
 """
 
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 
 class CellType(Enum):
@@ -79,6 +80,135 @@ class Grid:
         return Grid(height=self.height, width=self.width, cells=cells_copy)
 
 
+class CompactGrid:
+    """
+    Kakuro grid stored as one flat row-major array of signed bytes.
+
+    Offers the same cell accessors as Grid at a fraction of the memory (one
+    byte per cell instead of a Python list per row), so it can stand in for
+    Grid inside a Puzzle. Cell (row, col) lives at ``row * width + col``.
+
+    The backing buffer may be an ``array('b')`` or any writable or read-only
+    buffer cast to signed bytes, which lets a grid wrap bytes read from disk
+    without copying them.
+
+    Example:
+        >>> compact = CompactGrid.from_grid(grid)
+        >>> compact.get_cell(1, 1) == grid.get_cell(1, 1)
+        True
+    """
+
+    __slots__ = ("height", "width", "data")
+
+    def __init__(
+        self,
+        height: int,
+        width: int,
+        data: Optional[Union[array, memoryview]] = None,
+    ):
+        """
+        Initialize a compact grid.
+
+        Args:
+            height: Number of rows
+            width: Number of columns
+            data: Row-major signed byte buffer (default: all empty cells)
+        """
+        if data is None:
+            data = array("b", bytes(height * width))
+        if len(data) != height * width:
+            raise ValueError(
+                f"Grid of {height}x{width} needs {height * width} cells, "
+                f"got {len(data)}"
+            )
+        self.height = height
+        self.width = width
+        self.data = data
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "CompactGrid":
+        """Pack a list-based Grid into a compact grid."""
+        data = array("b")
+        for row in grid.cells:
+            data.extend(row)
+        return cls(grid.height, grid.width, data)
+
+    @classmethod
+    def from_buffer(cls, height: int, width: int, buffer) -> "CompactGrid":
+        """
+        Wrap an existing byte buffer without copying it.
+
+        Args:
+            height: Number of rows
+            width: Number of columns
+            buffer: Object supporting the buffer protocol (bytes, bytearray,
+                mmap slice, ...) holding ``height * width`` cells
+
+        Returns:
+            CompactGrid viewing the buffer
+        """
+        return cls(height, width, memoryview(buffer).cast("b"))
+
+    def to_grid(self) -> Grid:
+        """Unpack into a list-based Grid."""
+        return Grid(height=self.height, width=self.width, cells=self.cells)
+
+    @property
+    def cells(self) -> List[List[int]]:
+        """Cells as a new 2D list (for serialization and list-based code)."""
+        data, width = self.data, self.width
+        return [
+            list(data[row * width : (row + 1) * width]) for row in range(self.height)
+        ]
+
+    def index(self, row: int, col: int) -> int:
+        """Flat index of a cell."""
+        return row * self.width + col
+
+    def row_view(self, row: int) -> memoryview:
+        """Zero-copy view of one row."""
+        start = row * self.width
+        return memoryview(self.data)[start : start + self.width]
+
+    def get_cell(self, row: int, col: int) -> int:
+        """Get the value of a cell at the given position."""
+        return self.data[row * self.width + col]
+
+    def set_cell(self, row: int, col: int, value: int) -> None:
+        """Set the value of a cell at the given position."""
+        self.data[row * self.width + col] = value
+
+    def is_black(self, row: int, col: int) -> bool:
+        """Check if a cell is a black cell."""
+        return self.data[row * self.width + col] == CellType.BLACK.value
+
+    def is_empty(self, row: int, col: int) -> bool:
+        """Check if a cell is empty."""
+        return self.data[row * self.width + col] == CellType.EMPTY.value
+
+    def copy(self) -> "CompactGrid":
+        """Create a copy backed by its own array."""
+        return CompactGrid(self.height, self.width, array("b", self.data))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactGrid):
+            return (
+                self.height == other.height
+                and self.width == other.width
+                and bytes(self.data) == bytes(other.data)
+            )
+        if isinstance(other, Grid):
+            return (
+                self.height == other.height
+                and self.width == other.width
+                and self.cells == other.cells
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CompactGrid(height={self.height}, width={self.width})"
+
+
 @dataclass
 class Run:
     """
@@ -100,23 +230,61 @@ class Run:
         [(1, 2), (1, 3), (1, 4)]
     """
 
+    # Slots keep Run small; the last two hold lazily built cell caches
+    __slots__ = ("row", "col", "length", "total", "direction", "_cells", "_indices")
+
     row: int
     col: int
     length: int
     total: int
     direction: Direction
 
-    def get_cells(self) -> List[tuple[int, int]]:
+    def __post_init__(self):
+        """Start with empty cell caches."""
+        self._cells = None
+        self._indices = None
+
+    def get_cells(self) -> List[Tuple[int, int]]:
         """
         Get (row, col) coordinates for all cells in this run.
 
         Returns:
             List of (row, col) tuples
         """
-        if self.direction == Direction.HORIZONTAL:
-            return [(self.row, self.col + i) for i in range(self.length)]
-        else:  # VERTICAL
-            return [(self.row + i, self.col) for i in range(self.length)]
+        return list(self.cells)
+
+    @property
+    def cells(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        Cached (row, col) coordinates of the run's cells.
+
+        The cache assumes a run's position and length do not change after it
+        is first used, which holds for runs built by compute_runs.
+        """
+        if self._cells is None:
+            if self.direction == Direction.HORIZONTAL:
+                self._cells = tuple(
+                    (self.row, self.col + i) for i in range(self.length)
+                )
+            else:  # VERTICAL
+                self._cells = tuple(
+                    (self.row + i, self.col) for i in range(self.length)
+                )
+        return self._cells
+
+    def cell_indices(self, width: int) -> Tuple[int, ...]:
+        """
+        Cached row-major flat indices of the run's cells.
+
+        Args:
+            width: Width of the grid the run belongs to
+
+        Returns:
+            Tuple of ``row * width + col`` indices
+        """
+        if self._indices is None or self._indices[0] != width:
+            self._indices = (width, tuple(r * width + c for r, c in self.cells))
+        return self._indices[1]
 
     def __str__(self) -> str:
         """Return string representation of the run."""
@@ -127,6 +295,112 @@ class Run:
         )
 
 
+class RunLayout:
+    """
+    Runs of a grid together with dense per-cell lookup arrays.
+
+    Arrays are flat and row-major, with cell (row, col) at
+    ``row * width + col``. ``across`` and ``down`` hold, for every white
+    cell, the index of the horizontal / vertical run through it (-1 if
+    none). ``across_clue`` and ``down_clue`` hold, for every black cell, the
+    total of the run starting right of / below it (-1 if none).
+
+    Clue arrays are read from the run totals the first time they are used,
+    so a layout built before solving reports the solved clues.
+
+    Example:
+        >>> layout = extract_runs(grid)
+        >>> layout.across_run(1, 2) is layout.horizontal_runs[0]
+        True
+    """
+
+    __slots__ = (
+        "height",
+        "width",
+        "horizontal_runs",
+        "vertical_runs",
+        "across",
+        "down",
+        "_across_clue",
+        "_down_clue",
+    )
+
+    def __init__(
+        self,
+        height: int,
+        width: int,
+        horizontal_runs: List[Run],
+        vertical_runs: List[Run],
+    ):
+        """
+        Index runs by cell.
+
+        Args:
+            height: Grid height
+            width: Grid width
+            horizontal_runs: Horizontal runs of the grid
+            vertical_runs: Vertical runs of the grid
+        """
+        self.height = height
+        self.width = width
+        self.horizontal_runs = horizontal_runs
+        self.vertical_runs = vertical_runs
+        self.across = array("i", [-1]) * (height * width)
+        self.down = array("i", [-1]) * (height * width)
+        self._across_clue: Optional[array] = None
+        self._down_clue: Optional[array] = None
+
+        for run_id, run in enumerate(horizontal_runs):
+            start = run.row * width + run.col
+            self.across[start : start + run.length] = array("i", [run_id]) * run.length
+        for run_id, run in enumerate(vertical_runs):
+            for index in run.cell_indices(width):
+                self.down[index] = run_id
+
+    def across_run(self, row: int, col: int) -> Optional[Run]:
+        """Horizontal run through (row, col), or None."""
+        run_id = self.across[row * self.width + col]
+        return self.horizontal_runs[run_id] if run_id >= 0 else None
+
+    def down_run(self, row: int, col: int) -> Optional[Run]:
+        """Vertical run through (row, col), or None."""
+        run_id = self.down[row * self.width + col]
+        return self.vertical_runs[run_id] if run_id >= 0 else None
+
+    @property
+    def across_clue(self) -> array:
+        """Per-cell total of the horizontal run starting right of the cell."""
+        if self._across_clue is None:
+            self._across_clue = self._clue_array(self.horizontal_runs, 1)
+        return self._across_clue
+
+    @property
+    def down_clue(self) -> array:
+        """Per-cell total of the vertical run starting below the cell."""
+        if self._down_clue is None:
+            self._down_clue = self._clue_array(self.vertical_runs, self.width)
+        return self._down_clue
+
+    def clues(self, row: int, col: int) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Clues shown in the cell at (row, col).
+
+        Returns:
+            (across, down) totals, each None if no run starts there
+        """
+        index = row * self.width + col
+        across = self.across_clue[index]
+        down = self.down_clue[index]
+        return (across if across >= 0 else None, down if down >= 0 else None)
+
+    def _clue_array(self, runs: List[Run], step: int) -> array:
+        """Place each run's total in the cell `step` before its first cell."""
+        clues = array("i", [-1]) * (self.height * self.width)
+        for run in runs:
+            clues[run.row * self.width + run.col - step] = run.total
+        return clues
+
+
 @dataclass
 class Puzzle:
     """
@@ -143,9 +417,48 @@ class Puzzle:
         {...}
     """
 
-    grid: Grid
+    grid: Union[Grid, CompactGrid]
     horizontal_runs: List[Run] = field(default_factory=list)
     vertical_runs: List[Run] = field(default_factory=list)
+    _layout: Optional[RunLayout] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_layout(cls, grid: Union[Grid, CompactGrid], layout: RunLayout) -> "Puzzle":
+        """
+        Build a puzzle from a grid and its extracted run layout.
+
+        Args:
+            grid: The puzzle grid
+            layout: Layout from extract_runs, kept as the puzzle's layout
+
+        Returns:
+            Puzzle sharing the layout's runs
+        """
+        puzzle = cls(
+            grid=grid,
+            horizontal_runs=layout.horizontal_runs,
+            vertical_runs=layout.vertical_runs,
+        )
+        puzzle._layout = layout
+        return puzzle
+
+    @property
+    def layout(self) -> RunLayout:
+        """
+        Per-cell run and clue lookups, built once and cached.
+
+        The cache assumes the runs are not replaced after first use.
+        """
+        if self._layout is None:
+            self._layout = RunLayout(
+                self.grid.height,
+                self.grid.width,
+                self.horizontal_runs,
+                self.vertical_runs,
+            )
+        return self._layout
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -180,13 +493,45 @@ class Puzzle:
             ],
         }
 
+    def compact(self) -> "Puzzle":
+        """
+        Return a copy of the puzzle backed by a CompactGrid.
+
+        Runs and the run layout are shared with this puzzle.
+
+        Returns:
+            Puzzle whose grid is a CompactGrid
+        """
+        grid = self.grid
+        if not isinstance(grid, CompactGrid):
+            grid = CompactGrid.from_grid(grid)
+        puzzle = Puzzle(
+            grid=grid,
+            horizontal_runs=self.horizontal_runs,
+            vertical_runs=self.vertical_runs,
+        )
+        puzzle._layout = self._layout
+        return puzzle
+
+    def fingerprint(self) -> str:
+        """
+        Canonical fingerprint of the puzzle's layout and clues.
+
+        Returns:
+            Hex digest shared by the puzzle and its transpose
+        """
+        from .fingerprint import puzzle_fingerprint
+
+        return puzzle_fingerprint(self)
+
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Puzzle":
+    def from_dict(cls, data: Dict[str, Any], compact: bool = False) -> "Puzzle":
         """
         Deserialize puzzle from dictionary format.
 
         Args:
             data: Dictionary representation of the puzzle
+            compact: Whether to store the grid as a CompactGrid
 
         Returns:
             Puzzle object
@@ -197,6 +542,8 @@ class Puzzle:
             width=grid_data["width"],
             cells=grid_data["cells"],
         )
+        if compact:
+            grid = CompactGrid.from_grid(grid)
 
         horizontal_runs = [
             Run(
@@ -0,0 +1,311 @@
+"""
+Binary packed puzzle files with memory-mapped random access.
+
+File layout (version 1, all integers little-endian):
+
+    header   24 bytes   magic "KKPZ", version u16, reserved u16,
+                        puzzle count u64, index offset u64
+    records  ...        one record per puzzle, back to back
+    index    12 bytes   per puzzle: record offset u64, height u8,
+                        width u8, reserved u16
+
+Each record holds a black-cell bitmap (one bit per cell, row-major, most
+significant bit first) followed by the digits of the white cells packed two
+per byte (high nibble first). Runs and clue totals are not stored; they are
+derived from the grid when a puzzle is loaded.
+
+Readers memory-map the file and decode only the puzzle asked for, so opening
+a file of millions of puzzles costs nothing up front.
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from .corpus import read_puzzle_file
+from .models import CompactGrid, Puzzle
+from .runs import compute_run_totals, extract_runs
+
+MAGIC = b"KKPZ"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQQ")
+_INDEX_ENTRY = struct.Struct("<QBBH")
+
+
+class PackedFormatError(ValueError):
+    """Raised when a file is not a readable packed puzzle file."""
+
+    pass
+
+
+def encode_record(puzzle: Puzzle) -> bytes:
+    """
+    Encode one puzzle as a packed record.
+
+    Args:
+        puzzle: Puzzle to encode (cell values -1 or 0-9)
+
+    Returns:
+        Bitmap bytes followed by nibble-packed digits
+    """
+    grid = puzzle.grid
+    bitmap = bytearray((grid.height * grid.width + 7) // 8)
+    digits: List[int] = []
+    i = 0
+    for row in grid.cells:
+        for value in row:
+            if value == -1:
+                bitmap[i >> 3] |= 0x80 >> (i & 7)
+            else:
+                digits.append(value)
+            i += 1
+
+    if len(digits) % 2:
+        digits.append(0)
+    packed = bytes((digits[j] << 4) | digits[j + 1] for j in range(0, len(digits), 2))
+    return bytes(bitmap) + packed
+
+
+def decode_record(record, height: int, width: int, compact: bool = False) -> Puzzle:
+    """
+    Decode a packed record.
+
+    Args:
+        record: Record bytes (or a memoryview over them)
+        height: Grid height from the index
+        width: Grid width from the index
+        compact: Whether to return the grid as a CompactGrid
+
+    Returns:
+        Puzzle with runs and clue totals recomputed from the grid
+    """
+    size = height * width
+    bitmap_len = (size + 7) // 8
+    data = bytearray(size)
+    digit_pos = bitmap_len * 2  # position in nibbles
+    for i in range(size):
+        if record[i >> 3] & (0x80 >> (i & 7)):
+            data[i] = 0xFF  # -1 as a signed byte
+        else:
+            byte = record[digit_pos >> 1]
+            data[i] = (byte >> 4) if digit_pos % 2 == 0 else (byte & 0x0F)
+            digit_pos += 1
+
+    grid = CompactGrid.from_buffer(height, width, data)
+    if not compact:
+        grid = grid.to_grid()
+    layout = extract_runs(grid)
+    compute_run_totals(grid, layout.horizontal_runs, layout.vertical_runs)
+    return Puzzle.from_layout(grid, layout)
+
+
+class PackedWriter:
+    """
+    Write a packed puzzle file one puzzle at a time.
+
+    Records go to disk as they are added; only the index (12 bytes per
+    puzzle) is held in memory until the file is closed.
+
+    Example:
+        >>> with PackedWriter("solutions.kkpz") as writer:
+        ...     for puzzle in puzzles:
+        ...         writer.add(puzzle)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Create a packed file, replacing any existing one.
+
+        Args:
+            path: Output file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self._index = bytearray()
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0, 0))
+
+    def add(self, puzzle: Puzzle) -> None:
+        """Append one puzzle's record."""
+        if puzzle.grid.height > 255 or puzzle.grid.width > 255:
+            raise PackedFormatError(
+                f"Grid {puzzle.grid.height}x{puzzle.grid.width} exceeds 255x255"
+            )
+        self._index += _INDEX_ENTRY.pack(
+            self._file.tell(), puzzle.grid.height, puzzle.grid.width, 0
+        )
+        self._file.write(encode_record(puzzle))
+        self.count += 1
+
+    def close(self) -> None:
+        """Write the index and header and close the file."""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(self._index)
+        self._file.seek(0)
+        self._file.write(
+            _HEADER.pack(MAGIC, FORMAT_VERSION, 0, self.count, index_offset)
+        )
+        self._file.close()
+
+    def __enter__(self) -> "PackedWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def write_packed(path: Union[str, Path], puzzles: Iterable[Puzzle]) -> int:
+    """
+    Write puzzles to a packed file.
+
+    Records are streamed to disk as they arrive; only the index (12 bytes per
+    puzzle) is held in memory until the end.
+
+    Args:
+        path: Output file
+        puzzles: Puzzles to write, in order
+
+    Returns:
+        Number of puzzles written
+    """
+    with PackedWriter(path) as writer:
+        for puzzle in puzzles:
+            writer.add(puzzle)
+    return writer.count
+
+
+class PackedPuzzleFile:
+    """
+    Read-only, memory-mapped view of a packed puzzle file.
+
+    Example:
+        >>> with PackedPuzzleFile("corpus.kkpz") as packed:
+        ...     puzzle = packed[123456]
+    """
+
+    def __init__(self, path: Union[str, Path], compact: bool = False):
+        """
+        Open a packed puzzle file.
+
+        Args:
+            path: Packed file
+            compact: Whether puzzles are returned with CompactGrid grids
+
+        Raises:
+            PackedFormatError: If the header is missing or not supported
+        """
+        self.path = Path(path)
+        self.compact = compact
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise PackedFormatError(f"{self.path} is empty")
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise PackedFormatError(f"{self.path} is too short for a header")
+        magic, version, _, count, index_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise PackedFormatError(f"{self.path} is not a packed puzzle file")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise PackedFormatError(
+                f"{self.path} has format version {version}, "
+                f"expected {FORMAT_VERSION}"
+            )
+        self._count = count
+        self._index_offset = index_offset
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PackedPuzzleFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def entry(self, n: int) -> Tuple[int, int, int, int]:
+        """
+        Look up a puzzle in the index.
+
+        Args:
+            n: Puzzle number (negative numbers count from the end)
+
+        Returns:
+            (offset, end, height, width) of the record
+        """
+        if n < 0:
+            n += self._count
+        if not 0 <= n < self._count:
+            raise IndexError(f"Puzzle {n} out of range for {self._count} puzzles")
+        offset, height, width, _ = _INDEX_ENTRY.unpack_from(
+            self._map, self._index_offset + n * _INDEX_ENTRY.size
+        )
+        if n + 1 < self._count:
+            end = _INDEX_ENTRY.unpack_from(
+                self._map, self._index_offset + (n + 1) * _INDEX_ENTRY.size
+            )[0]
+        else:
+            end = self._index_offset
+        return offset, end, height, width
+
+    def __getitem__(self, n: int) -> Puzzle:
+        """Decode puzzle n without touching any other record."""
+        offset, end, height, width = self.entry(n)
+        return decode_record(self._map[offset:end], height, width, self.compact)
+
+    def __iter__(self) -> Iterator[Puzzle]:
+        for n in range(self._count):
+            yield self[n]
+
+
+def json_to_packed(sources: Iterable[Union[str, Path]], path: Union[str, Path]) -> int:
+    """
+    Convert JSON caches (or JSONL journals) into one packed file.
+
+    Args:
+        sources: Cache files, converted in order
+        path: Output packed file
+
+    Returns:
+        Number of puzzles written
+    """
+
+    def puzzles() -> Iterator[Puzzle]:
+        for source in sources:
+            yield from read_puzzle_file(source)
+
+    return write_packed(path, puzzles())
+
+
+def packed_to_json(path: Union[str, Path], output: Union[str, Path]) -> int:
+    """
+    Convert a packed file back into a JSON list cache.
+
+    Args:
+        path: Packed file
+        output: JSON file to write in the ``Puzzle.to_dict`` format
+
+    Returns:
+        Number of puzzles written
+    """
+    with PackedPuzzleFile(path) as packed:
+        data = [puzzle.to_dict() for puzzle in packed]
+    with open(output, "w") as f:
+        json.dump(data, f)
+    return len(data)
@@ -0,0 +1,142 @@
+"""
+Lightweight references to puzzles stored in journals.
+
+A PuzzleRef names a puzzle by journal file and byte offset and carries its
+grid size, which is all page layout needs. The grid itself is read only when
+a puzzle is drawn, through a small LRU cache, so a book of any length keeps
+just a handful of decoded puzzles in memory at a time.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Union
+
+from .models import Puzzle
+
+logger = logging.getLogger(__name__)
+
+# Decoded puzzles kept in memory; a puzzle page and its solution are usually
+# drawn far apart, so this only needs to cover one page of solutions
+PUZZLE_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class PuzzleRef:
+    """
+    Reference to one puzzle entry in a JSONL journal.
+
+    Attributes:
+        path: Journal file
+        offset: Byte offset of the entry's line
+        height: Grid height
+        width: Grid width
+    """
+
+    path: str
+    offset: int
+    height: int
+    width: int
+
+    def load(self) -> Puzzle:
+        """Load the referenced puzzle (cached)."""
+        return load_puzzle(self)
+
+
+def read_puzzle(ref: PuzzleRef, compact: bool = False) -> Puzzle:
+    """
+    Read a referenced puzzle from its journal, bypassing the cache.
+
+    Args:
+        ref: Puzzle reference
+        compact: Whether to store the grid as a CompactGrid
+
+    Returns:
+        Puzzle object
+    """
+    with open(ref.path, "rb") as f:
+        f.seek(ref.offset)
+        entry = json.loads(f.readline())
+    return Puzzle.from_dict(entry["puzzle"], compact=compact)
+
+
+@lru_cache(maxsize=PUZZLE_CACHE_SIZE)
+def load_puzzle(ref: PuzzleRef) -> Puzzle:
+    """
+    Load a referenced puzzle through the shared LRU cache.
+
+    Args:
+        ref: Puzzle reference
+
+    Returns:
+        Puzzle backed by a CompactGrid
+    """
+    return read_puzzle(ref, compact=True)
+
+
+def resolve_puzzle(puzzle: Union[Puzzle, PuzzleRef]) -> Puzzle:
+    """Return the puzzle itself, loading it first if given a reference."""
+    if isinstance(puzzle, PuzzleRef):
+        return load_puzzle(puzzle)
+    return puzzle
+
+
+def puzzle_size(puzzle: Union[Puzzle, PuzzleRef]) -> tuple[int, int]:
+    """Return (height, width) of a puzzle or reference without loading it."""
+    if isinstance(puzzle, PuzzleRef):
+        return puzzle.height, puzzle.width
+    return puzzle.grid.height, puzzle.grid.width
+
+
+def puzzle_digest(puzzle: Union[Puzzle, PuzzleRef]) -> str:
+    """
+    Content hash of a puzzle or reference, without decoding a reference.
+
+    A reference hashes its journal entry as stored, a puzzle hashes its
+    dictionary form; either changes whenever the puzzle does.
+
+    Args:
+        puzzle: Puzzle or reference
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    if isinstance(puzzle, PuzzleRef):
+        with open(puzzle.path, "rb") as f:
+            f.seek(puzzle.offset)
+            data = f.readline()
+    else:
+        data = json.dumps(puzzle.to_dict(), sort_keys=True).encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def iter_journal_refs(journal_path: Union[str, Path]) -> Iterator[PuzzleRef]:
+    """
+    Yield references to the puzzles in a journal, in journal order.
+
+    Each entry is parsed once to read its grid size and then dropped, so
+    memory stays flat however long the journal is. Failed positions and an
+    incomplete last line are skipped.
+
+    Args:
+        journal_path: JSONL journal written by iter_puzzles
+
+    Yields:
+        PuzzleRef for every stored puzzle
+    """
+    path = str(journal_path)
+    offset = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            line_offset = offset
+            offset += len(raw)
+            if not raw.endswith(b"\n"):
+                break
+            entry = json.loads(raw)
+            if "puzzle" not in entry:
+                continue
+            grid = entry["puzzle"]["grid"]
+            yield PuzzleRef(path, line_offset, grid["height"], grid["width"])
@@ -2,18 +2,98 @@
 Run computation for Kakuro puzzles.
 
 This module handles the detection and computation of horizontal and vertical
-runs in a Kakuro grid.
+runs in a Kakuro grid, and the per-cell lookups built from them.
 """
 
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
 
-from .models import Grid, Run, Direction
+from .models import CellType, CompactGrid, Direction, Grid, Run, RunLayout
 
 logger = logging.getLogger(__name__)
 
 
-def compute_runs(grid: Grid) -> Tuple[List[Run], List[Run]]:
+def extract_runs(grid: Union[Grid, CompactGrid]) -> RunLayout:
+    """
+    Find all runs of a grid in a single row-major pass.
+
+    A run is a sequence of 2 or more consecutive non-black cells following a
+    black cell. Runs are returned with total=0; use compute_run_totals to
+    fill in the clues of a solved grid.
+
+    Args:
+        grid: The puzzle grid
+
+    Returns:
+        RunLayout with horizontal runs in row-major order, vertical runs in
+        column-major order, and per-cell run and clue lookups
+
+    Example:
+        >>> layout = extract_runs(grid)
+        >>> layout.across_run(1, 1).length
+        3
+    """
+    height, width = grid.height, grid.width
+    if isinstance(grid, CompactGrid):
+        values = grid.data
+    else:
+        values = [value for row in grid.cells for value in row]
+
+    black = CellType.BLACK.value
+    horizontal_runs = []
+    vertical_spans = []  # (col, start_row, end_row)
+    # Row after the last black cell seen in each column (None before any)
+    open_down: List[Optional[int]] = [None] * width
+
+    for row in range(height):
+        base = row * width
+        open_across = None
+        for col in range(width):
+            if values[base + col] != black:
+                continue
+            if open_across is not None and col - open_across >= 2:
+                horizontal_runs.append(_horizontal_run(row, open_across, col))
+            open_across = col + 1
+
+            start = open_down[col]
+            if start is not None and row - start >= 2:
+                vertical_spans.append((col, start, row))
+            open_down[col] = row + 1
+
+        if open_across is not None and width - open_across >= 2:
+            horizontal_runs.append(_horizontal_run(row, open_across, width))
+
+    for col, start in enumerate(open_down):
+        if start is not None and height - start >= 2:
+            vertical_spans.append((col, start, height))
+
+    vertical_spans.sort()
+    vertical_runs = [
+        Run(
+            row=start,
+            col=col,
+            length=end - start,
+            total=0,
+            direction=Direction.VERTICAL,
+        )
+        for col, start, end in vertical_spans
+    ]
+
+    return RunLayout(height, width, horizontal_runs, vertical_runs)
+
+
+def _horizontal_run(row: int, start: int, end: int) -> Run:
+    """Build the horizontal run covering columns start..end-1 of a row."""
+    return Run(
+        row=row,
+        col=start,
+        length=end - start,
+        total=0,
+        direction=Direction.HORIZONTAL,
+    )
+
+
+def compute_runs(grid: Union[Grid, CompactGrid]) -> Tuple[List[Run], List[Run]]:
     """
     Compute all horizontal and vertical runs in a grid.
 
@@ -31,117 +111,44 @@ def compute_runs(grid: Grid) -> Tuple[List[Run], List[Run]]:
         >>> len(h_runs)
         4
     """
-    horizontal_runs = compute_horizontal_runs(grid)
-    vertical_runs = compute_vertical_runs(grid)
+    layout = extract_runs(grid)
 
     logger.debug(
-        f"Computed {len(horizontal_runs)} horizontal and "
-        f"{len(vertical_runs)} vertical runs"
+        f"Computed {len(layout.horizontal_runs)} horizontal and "
+        f"{len(layout.vertical_runs)} vertical runs"
     )
 
-    return horizontal_runs, vertical_runs
+    return layout.horizontal_runs, layout.vertical_runs
 
 
-def compute_horizontal_runs(grid: Grid) -> List[Run]:
+def compute_horizontal_runs(grid: Union[Grid, CompactGrid]) -> List[Run]:
     """
     Compute all horizontal runs in a grid.
 
-    Scans each row from left to right, identifying sequences of
-    consecutive non-black cells of length >= 2.
-
     Args:
         grid: The puzzle grid
 
     Returns:
-        List of horizontal Run objects (total=0 initially)
+        List of horizontal Run objects in row-major order (total=0)
     """
-    runs = []
-
-    for row in range(grid.height):
-        col = 0
-        while col < grid.width:
-            if grid.is_black(row, col):
-                # Found a black cell, check if there's a run after it
-                start_col = col + 1
-                length = 0
-
-                # Count consecutive non-black cells
-                while start_col + length < grid.width and not grid.is_black(
-                    row, start_col + length
-                ):
-                    length += 1
-
-                # Only create run if length >= 2
-                if length >= 2:
-                    run = Run(
-                        row=row,
-                        col=start_col,
-                        length=length,
-                        total=0,  # Will be computed after solving
-                        direction=Direction.HORIZONTAL,
-                    )
-                    runs.append(run)
-                    logger.debug(f"Found horizontal run: {run}")
-
-                # Skip past this run
-                col = start_col + length
-            else:
-                col += 1
-
-    return runs
-
-
-def compute_vertical_runs(grid: Grid) -> List[Run]:
+    return extract_runs(grid).horizontal_runs
+
+
+def compute_vertical_runs(grid: Union[Grid, CompactGrid]) -> List[Run]:
     """
     Compute all vertical runs in a grid.
 
-    Scans each column from top to bottom, identifying sequences of consecutive
-    non-black cells of length >= 2.
-
     Args:
         grid: The puzzle grid
 
     Returns:
-        List of vertical Run objects (total=0 initially)
+        List of vertical Run objects in column-major order (total=0)
     """
-    runs = []
-
-    for col in range(grid.width):
-        row = 0
-        while row < grid.height:
-            if grid.is_black(row, col):
-                # Found a black cell, check if there's a run after it
-                start_row = row + 1
-                length = 0
-
-                # Count consecutive non-black cells
-                while start_row + length < grid.height and not grid.is_black(
-                    start_row + length, col
-                ):
-                    length += 1
-
-                # Only create run if length >= 2
-                if length >= 2:
-                    run = Run(
-                        row=start_row,
-                        col=col,
-                        length=length,
-                        total=0,  # Will be computed after solving
-                        direction=Direction.VERTICAL,
-                    )
-                    runs.append(run)
-                    logger.debug(f"Found vertical run: {run}")
-
-                # Skip past this run
-                row = start_row + length
-            else:
-                row += 1
-
-    return runs
+    return extract_runs(grid).vertical_runs
 
 
 def compute_run_totals(
-    grid: Grid, horizontal_runs: List[Run], vertical_runs: List[Run]
+    grid: Union[Grid, CompactGrid], horizontal_runs: List[Run], vertical_runs: List[Run]
 ) -> None:
     """
     Compute the sum totals for all runs based on filled grid values.
@@ -154,12 +161,9 @@ def compute_run_totals(
         horizontal_runs: List of horizontal runs (modified in place)
         vertical_runs: List of vertical runs (modified in place)
     """
-    for run in horizontal_runs:
-        total = sum(grid.get_cell(run.row, run.col + i) for i in range(run.length))
-        run.total = total
-        logger.debug(f"Horizontal run at r{run.row}c{run.col}: total={total}")
-
-    for run in vertical_runs:
-        total = sum(grid.get_cell(run.row + i, run.col) for i in range(run.length))
-        run.total = total
-        logger.debug(f"Vertical run at r{run.row}c{run.col}: total={total}")
+    for run in horizontal_runs + vertical_runs:
+        run.total = sum(grid.get_cell(r, c) for r, c in run.cells)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        for run in horizontal_runs + vertical_runs:
+            logger.debug(f"Run total: {run}")
@@ -9,7 +9,7 @@ import logging
 import random
 from typing import List, Tuple, Set, Dict, Optional
 
-from .models import Grid, Run, Puzzle, Direction
+from .models import Grid, Run, RunLayout, Puzzle, Direction
 from .runs import compute_run_totals
 
 logger = logging.getLogger(__name__)
@@ -131,6 +131,7 @@ def solve_puzzle(puzzle: Puzzle, randomize: bool = True) -> bool:
         puzzle.horizontal_runs,
         puzzle.vertical_runs,
         randomize=randomize,
+        layout=puzzle.layout,
     )
 
 
@@ -141,6 +142,7 @@ def solve_kakuro(
     randomize: bool = True,
     use_csp: bool = True,
     max_backtracks: int = 2000000,
+    layout: Optional[RunLayout] = None,
 ) -> bool:
     """
     Solve a Kakuro grid using backtracking algorithm with CSP heuristics.
@@ -156,10 +158,14 @@ def solve_kakuro(
         randomize: Whether to randomize digit order for variety
         use_csp: Whether to use CSP heuristics (MRV, forward checking)
         max_backtracks: Maximum number of backtrack steps before giving up
+        layout: Run layout of the grid, built from the runs if not given
 
     Returns:
         True if solution found, False otherwise
     """
+    if layout is None:
+        layout = RunLayout(grid.height, grid.width, horizontal_runs, vertical_runs)
+
     # Find all empty cells
     empty_cells = [
         (i, j)
@@ -185,16 +191,14 @@ def solve_kakuro(
         logger.debug("Using CSP heuristics (MRV + forward checking)")
 
         # Solve using CSP-enhanced backtracking
-        if _backtrack_csp(
-            grid, domains, horizontal_runs, vertical_runs, randomize, backtrack_counter
-        ):
+        if _backtrack_csp(grid, domains, layout, randomize, backtrack_counter):
             compute_run_totals(grid, horizontal_runs, vertical_runs)
             backtracks = backtrack_counter["count"]
             logger.info(f"Puzzle solved with CSP ({backtracks} backtracks)")
             return True
     else:
         # Solve using basic backtracking (legacy)
-        if _backtrack(grid, empty_cells, 0, horizontal_runs, vertical_runs, randomize):
+        if _backtrack(grid, empty_cells, 0, layout, randomize):
             compute_run_totals(grid, horizontal_runs, vertical_runs)
             logger.info("Puzzle solved successfully")
             return True
@@ -273,8 +277,7 @@ def _select_mrv_cell(
 def _backtrack_csp(
     grid: Grid,
     domains: Dict[Tuple[int, int], CellDomain],
-    h_runs: List[Run],
-    v_runs: List[Run],
+    layout: RunLayout,
     randomize: bool,
     backtrack_counter: dict,
 ) -> bool:
@@ -284,8 +287,7 @@ def _backtrack_csp(
     Args:
         grid: The puzzle grid
         domains: Dictionary of cell domains
-        h_runs: Horizontal runs
-        v_runs: Vertical runs
+        layout: Run layout of the grid
         randomize: Whether to randomize digit order
         backtrack_counter: Dict with 'count' and 'max' for limiting search
 
@@ -316,21 +318,26 @@ def _backtrack_csp(
         random.shuffle(values)
 
     for digit in values:
-        if _is_valid_placement(grid, row, col, digit, h_runs, v_runs):
+        if _is_valid_placement(grid, row, col, digit, layout):
             # Place digit
             grid.set_cell(row, col, digit)
 
             # Forward checking: update domains of affected cells
             removed_values = _forward_check(
-                grid, row, col, digit, domains, h_runs, v_runs
+                grid,
+                row,
+                col,
+                digit,
+                domains,
+                layout.horizontal_runs,
+                layout.vertical_runs,
+                layout,
             )
 
             # Check if forward checking created empty domains
             if removed_values is not None:
                 # Recurse
-                if _backtrack_csp(
-                    grid, domains, h_runs, v_runs, randomize, backtrack_counter
-                ):
+                if _backtrack_csp(grid, domains, layout, randomize, backtrack_counter):
                     return True
 
                 # Backtrack: restore forward checked domains
@@ -350,6 +357,7 @@ def _forward_check(
     domains: Dict[Tuple[int, int], CellDomain],
     h_runs: List[Run],
     v_runs: List[Run],
+    layout: Optional[RunLayout] = None,
 ) -> Optional[List[Tuple[Tuple[int, int], int]]]:
     """
     Perform forward checking after placing a digit.
@@ -366,15 +374,18 @@ def _forward_check(
         domains: Dictionary of cell domains
         h_runs: Horizontal runs
         v_runs: Vertical runs
+        layout: Run layout of the runs, built from them if not given
 
     Returns:
         List of ((row, col), value) tuples that were removed, or None if
         forward checking fails (empty domain created)
     """
+    if layout is None:
+        layout = RunLayout(grid.height, grid.width, h_runs, v_runs)
     removed = []
 
     # Get cells in same horizontal run
-    h_cells = _get_run_cells_for_position(row, col, h_runs, Direction.HORIZONTAL)
+    h_cells = _get_run_cells_for_position(row, col, layout, Direction.HORIZONTAL)
     for r, c in h_cells:
         if (r, c) != (row, col) and (r, c) in domains and grid.is_empty(r, c):
             if domains[(r, c)].remove(digit):
@@ -386,7 +397,7 @@ def _forward_check(
                     return None
 
     # Get cells in same vertical run
-    v_cells = _get_run_cells_for_position(row, col, v_runs, Direction.VERTICAL)
+    v_cells = _get_run_cells_for_position(row, col, layout, Direction.VERTICAL)
     for r, c in v_cells:
         if (r, c) != (row, col) and (r, c) in domains and grid.is_empty(r, c):
             if domains[(r, c)].remove(digit):
@@ -421,8 +432,7 @@ def _propagate_constraints(
     row: int,
     col: int,
     domains: Dict[Tuple[int, int], CellDomain],
-    h_runs: List[Run],
-    v_runs: List[Run],
+    layout: RunLayout,
 ) -> Optional[List[Tuple[Tuple[int, int], int]]]:
     """
     Propagate constraints after placing a digit.
@@ -437,8 +447,7 @@ def _propagate_constraints(
         row: Row of placed digit
         col: Column of placed digit
         domains: Dictionary of cell domains
-        h_runs: Horizontal runs
-        v_runs: Vertical runs
+        layout: Run layout of the grid
 
     Returns:
         List of ((row, col), value) tuples that were removed, or None if
@@ -447,9 +456,9 @@ def _propagate_constraints(
     removed = []
 
     # Propagate constraints for horizontal run
-    h_cells = _get_run_cells_for_position(row, col, h_runs, Direction.HORIZONTAL)
+    h_cells = _get_run_cells_for_position(row, col, layout, Direction.HORIZONTAL)
     if h_cells:
-        h_run = _get_run_for_position(row, col, h_runs, Direction.HORIZONTAL)
+        h_run = _get_run_for_position(row, col, layout, Direction.HORIZONTAL)
         if h_run:
             propagated = _propagate_run_constraints(grid, h_cells, h_run, domains)
             if propagated is None:
@@ -458,9 +467,9 @@ def _propagate_constraints(
             removed.extend(propagated)
 
     # Propagate constraints for vertical run
-    v_cells = _get_run_cells_for_position(row, col, v_runs, Direction.VERTICAL)
+    v_cells = _get_run_cells_for_position(row, col, layout, Direction.VERTICAL)
     if v_cells:
-        v_run = _get_run_for_position(row, col, v_runs, Direction.VERTICAL)
+        v_run = _get_run_for_position(row, col, layout, Direction.VERTICAL)
         if v_run:
             propagated = _propagate_run_constraints(grid, v_cells, v_run, domains)
             if propagated is None:
@@ -472,7 +481,7 @@ def _propagate_constraints(
 
 
 def _get_run_for_position(
-    row: int, col: int, runs: List[Run], direction: Direction
+    row: int, col: int, layout: RunLayout, direction: Direction
 ) -> Optional[Run]:
     """
     Get the run that contains the given position.
@@ -480,20 +489,15 @@ def _get_run_for_position(
     Args:
         row: Row index
         col: Column index
-        runs: List of runs to search
+        layout: Run layout of the grid
         direction: Direction of runs to check
 
     Returns:
         The Run object, or None if not in a run
     """
-    for run in runs:
-        if direction == Direction.HORIZONTAL:
-            if run.row == row and run.col <= col < run.col + run.length:
-                return run
-        else:  # VERTICAL
-            if run.col == col and run.row <= row < run.row + run.length:
-                return run
-    return None
+    if direction == Direction.HORIZONTAL:
+        return layout.across_run(row, col)
+    return layout.down_run(row, col)
 
 
 def _propagate_run_constraints(
@@ -609,8 +613,7 @@ def _backtrack(
     grid: Grid,
     cells: List[Tuple[int, int]],
     index: int,
-    h_runs: List[Run],
-    v_runs: List[Run],
+    layout: RunLayout,
     randomize: bool,
 ) -> bool:
     """
@@ -620,8 +623,7 @@ def _backtrack(
         grid: The puzzle grid
         cells: List of empty cell coordinates
         index: Current cell index
-        h_runs: Horizontal runs
-        v_runs: Vertical runs
+        layout: Run layout of the grid
         randomize: Whether to randomize digit order
 
     Returns:
@@ -639,12 +641,12 @@ def _backtrack(
         random.shuffle(digits)
 
     for digit in digits:
-        if _is_valid_placement(grid, row, col, digit, h_runs, v_runs):
+        if _is_valid_placement(grid, row, col, digit, layout):
             # Place digit
             grid.set_cell(row, col, digit)
 
             # Recurse
-            if _backtrack(grid, cells, index + 1, h_runs, v_runs, randomize):
+            if _backtrack(grid, cells, index + 1, layout, randomize):
                 return True
 
             # Backtrack
@@ -658,8 +660,7 @@ def _is_valid_placement(
     row: int,
     col: int,
     digit: int,
-    h_runs: List[Run],
-    v_runs: List[Run],
+    layout: RunLayout,
 ) -> bool:
     """
     Check if placing a digit at (row, col) is valid.
@@ -672,20 +673,19 @@ def _is_valid_placement(
         row: Row index
         col: Column index
         digit: Digit to place (1-9)
-        h_runs: Horizontal runs
-        v_runs: Vertical runs
+        layout: Run layout of the grid
 
     Returns:
         True if placement is valid
     """
     # Check horizontal run
-    h_cells = _get_run_cells_for_position(row, col, h_runs, Direction.HORIZONTAL)
+    h_cells = _get_run_cells_for_position(row, col, layout, Direction.HORIZONTAL)
     for r, c in h_cells:
         if (r, c) != (row, col) and grid.get_cell(r, c) == digit:
             return False
 
     # Check vertical run
-    v_cells = _get_run_cells_for_position(row, col, v_runs, Direction.VERTICAL)
+    v_cells = _get_run_cells_for_position(row, col, layout, Direction.VERTICAL)
     for r, c in v_cells:
         if (r, c) != (row, col) and grid.get_cell(r, c) == digit:
             return False
@@ -694,26 +694,20 @@ def _is_valid_placement(
 
 
 def _get_run_cells_for_position(
-    row: int, col: int, runs: List[Run], direction: Direction
-) -> List[Tuple[int, int]]:
+    row: int, col: int, layout: RunLayout, direction: Direction
+) -> Tuple[Tuple[int, int], ...]:
     """
     Get all cells in the run that contains the given position.
 
     Args:
         row: Row index
         col: Column index
-        runs: List of runs to search
+        layout: Run layout of the grid
         direction: Direction of runs to check
 
     Returns:
-        List of (row, col) tuples in the run, or empty list if not in a run
+        Cached tuple of (row, col) cells in the run, or empty tuple if not in
+        a run
     """
-    for run in runs:
-        if direction == Direction.HORIZONTAL:
-            if run.row == row and run.col <= col < run.col + run.length:
-                return run.get_cells()
-        else:  # VERTICAL
-            if run.col == col and run.row <= row < run.row + run.length:
-                return run.get_cells()
-
-    return []
+    run = _get_run_for_position(row, col, layout, direction)
+    return run.cells if run is not None else ()
@@ -0,0 +1,250 @@
+"""
+Content-addressed puzzle store.
+
+Puzzles are kept in append-only streams, one per generation spec and grid
+size. A stream is identified by a hash of everything that determines its
+puzzles (difficulty, size, density or band, seed stream and generator
+version), never by how many puzzles a book asked for. A book section takes
+the first N puzzles of each stream it uses and only the missing tail is
+generated, so growing a section keeps the puzzles it already had.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import replace
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+from .difficulty import GenerationStats
+from .fingerprint import DuplicateIndex
+from .generator import GENERATOR_VERSION, PuzzleGenerationError
+from .models import Puzzle
+from .refs import PuzzleRef, iter_journal_refs, read_puzzle
+from .stream import GenerationSpec, extend_journal, iter_puzzles, journal_occurrence
+
+logger = logging.getLogger(__name__)
+
+
+class PuzzleStore:
+    """Directory of content-addressed puzzle streams."""
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the stream journals
+        """
+        self.root = Path(root)
+
+    @staticmethod
+    def stream_key(spec: GenerationSpec) -> str:
+        """
+        Compute the content address of a single-size spec.
+
+        Args:
+            spec: Generation spec with exactly one grid size
+
+        Returns:
+            Hex digest identifying the puzzle stream
+        """
+        _check_single_size(spec)
+        payload = dict(spec.to_dict(), generator_version=GENERATOR_VERSION)
+        digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode())
+        return digest.hexdigest()[:16]
+
+    def stream_path(self, spec: GenerationSpec) -> Path:
+        """Journal file backing the stream of a single-size spec."""
+        size = spec.grid_sizes[0]
+        key = self.stream_key(spec)
+        return self.root / f"{spec.difficulty}_{size}x{size}_{key}.jsonl"
+
+    def take(
+        self,
+        spec: GenerationSpec,
+        count: int,
+        start: int = 0,
+        stats: Optional[GenerationStats] = None,
+        duplicates: Optional[DuplicateIndex] = None,
+        book: Optional[str] = None,
+    ) -> List[Puzzle]:
+        """
+        Take puzzles from a stream, generating only the ones not yet stored.
+
+        Positions that failed to generate are skipped, and the stream is
+        extended until enough puzzles exist.
+
+        Args:
+            spec: Generation spec with exactly one grid size
+            count: Number of puzzles to take
+            start: Number of stored puzzles to skip first
+            stats: Optional statistics object for band-targeted generation
+            duplicates: Optional fingerprint index. Stored and newly
+                generated puzzles that another occurrence already holds are
+                skipped; the rest are claimed for their journal entries.
+            book: Book recorded with the claimed occurrences
+
+        Returns:
+            Puzzles start..start+count of the stream
+
+        Raises:
+            PuzzleGenerationError: If a round of generation adds no puzzles
+        """
+        refs = self.take_refs(spec, count, start, stats, duplicates, book)
+        return [read_puzzle(ref) for ref in refs]
+
+    def take_refs(
+        self,
+        spec: GenerationSpec,
+        count: int,
+        start: int = 0,
+        stats: Optional[GenerationStats] = None,
+        duplicates: Optional[DuplicateIndex] = None,
+        book: Optional[str] = None,
+    ) -> List[PuzzleRef]:
+        """
+        Like take, but return lightweight references instead of puzzles.
+
+        Missing puzzles are generated and journaled without being kept in
+        memory, so the cost of a large section is only its references. A
+        stream that already holds enough puzzles is read only as far as the
+        last one taken, and its puzzles are decoded only to check them
+        against duplicates.
+
+        Returns:
+            References to puzzles start..start+count of the stream
+        """
+        _check_single_size(spec)
+        needed = start + count
+        path = self.stream_path(spec)
+
+        if path.exists():
+            refs = _stored_refs(path, needed, duplicates, book)
+            if len(refs) >= needed:
+                return refs[start:]
+
+        positions = needed
+        previous = -1
+        while True:
+            produced = sum(
+                1
+                for _ in iter_puzzles(
+                    replace(spec, count=positions),
+                    path,
+                    stats=stats,
+                    duplicates=duplicates,
+                    book=book,
+                )
+            )
+            if produced >= needed:
+                return _stored_refs(path, needed, duplicates, book)[start:]
+            if produced == previous:
+                raise PuzzleGenerationError(
+                    f"Could not extend puzzle stream {path.name}"
+                )
+
+            shortfall = needed - produced
+            logger.info(
+                f"Stream {path.name} has {produced}/{needed} puzzles, "
+                f"extending by {shortfall}"
+            )
+            previous = produced
+            positions += shortfall
+
+    def add(self, spec: GenerationSpec, puzzles: Iterable[Puzzle]) -> int:
+        """
+        Append already generated puzzles to the end of a stream.
+
+        Args:
+            spec: Generation spec with exactly one grid size
+            puzzles: Puzzles to append
+
+        Returns:
+            Number of puzzles added
+        """
+        _check_single_size(spec)
+        return extend_journal(spec, self.stream_path(spec), puzzles)
+
+    def import_legacy_cache(
+        self, cache_file: Union[str, Path], spec: GenerationSpec
+    ) -> int:
+        """
+        Import a cache written as one JSON list per section.
+
+        Puzzles are split by grid size into the matching streams in their
+        original order, so a section importing its old cache keeps its
+        puzzle numbers. Streams that already hold puzzles are left alone,
+        and the cache is not read at all when every stream exists.
+
+        Args:
+            cache_file: Legacy ``{difficulty}_{count}_{sizes}.json`` file
+            spec: Section spec the cache was generated for
+
+        Returns:
+            Number of puzzles imported
+        """
+        by_size = {
+            size: []
+            for size in spec.grid_sizes
+            if not self.stream_path(replace(spec, grid_sizes=(size,))).exists()
+        }
+        if not by_size:
+            return 0
+
+        with open(cache_file, "r") as f:
+            data = json.load(f)
+
+        for item in data:
+            puzzle = Puzzle.from_dict(item)
+            if puzzle.grid.height in by_size:
+                by_size[puzzle.grid.height].append(puzzle)
+
+        imported = 0
+        for size, puzzles in by_size.items():
+            imported += self.add(replace(spec, grid_sizes=(size,)), puzzles)
+
+        logger.info(f"Imported {imported} puzzles from {cache_file}")
+        return imported
+
+
+def _stored_refs(
+    path: Path,
+    needed: int,
+    duplicates: Optional[DuplicateIndex],
+    book: Optional[str],
+) -> List[PuzzleRef]:
+    """
+    References to the first stored puzzles of a stream, in journal order.
+
+    With a duplicate index, puzzles another occurrence holds are left out
+    (as iter_puzzles skips them) and the rest are claimed.
+
+    Args:
+        path: Stream journal
+        needed: Number of references wanted; reading stops there
+        duplicates: Optional fingerprint index
+        book: Book recorded with the claimed occurrences
+
+    Returns:
+        Up to needed references
+    """
+    refs = iter_journal_refs(path)
+    if duplicates is not None:
+        refs = (
+            ref
+            for ref in refs
+            if duplicates.claim(
+                read_puzzle(ref), book, journal_occurrence(path, ref.offset)
+            )
+        )
+    return list(islice(refs, needed))
+
+
+def _check_single_size(spec: GenerationSpec) -> None:
+    """Reject specs that span several grid sizes."""
+    if len(spec.grid_sizes) != 1:
+        raise ValueError(
+            f"Puzzle streams hold one grid size, got {list(spec.grid_sizes)}"
+        )
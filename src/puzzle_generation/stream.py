@@ -0,0 +1,337 @@
+"""
+Streaming puzzle generation with an on-disk journal.
+
+This module yields puzzles one at a time as they are produced. Each finished
+puzzle is appended to a JSONL journal and flushed to disk immediately, so an
+interrupted run resumes from the last completed puzzle instead of starting
+over.
+
+Journal layout (one JSON object per line):
+    {"spec": {...}}                      header describing the generation spec
+    {"index": 0, "puzzle": {...}}        a finished puzzle
+    {"index": 1, "error": "..."}         a slot that failed to generate
+"""
+
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .difficulty import DifficultyBand, GenerationStats
+from .fingerprint import DuplicateIndex
+from .generator import (
+    PuzzleGenerationError,
+    generate_puzzle,
+    generate_puzzle_in_band,
+)
+from .models import Puzzle
+
+logger = logging.getLogger(__name__)
+
+
+class JournalMismatchError(Exception):
+    """Raised when a journal was written for a different generation spec."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class GenerationSpec:
+    """
+    Description of a batch of puzzles to generate.
+
+    Attributes:
+        difficulty: Difficulty label (beginner, intermediate, expert)
+        count: Number of puzzles in the batch
+        grid_sizes: Square grid sizes, assigned to puzzles round-robin
+        black_density: Black cell density for plain generation
+        band: Optional difficulty band; when set, candidates are scored and
+            only puzzles inside the band are kept
+        seed: Optional base seed; puzzle N is generated with seed + N
+        max_attempts: Maximum generation attempts per puzzle
+        stream: Optional stream name; specs differing only in name are
+            journaled separately, e.g. for book sections with the same
+            difficulty and sizes
+    """
+
+    difficulty: str
+    count: int
+    grid_sizes: Tuple[int, ...]
+    black_density: float = 0.22
+    band: Optional[DifficultyBand] = None
+    seed: Optional[int] = None
+    max_attempts: int = 50
+    stream: Optional[str] = None
+
+    def size_for(self, index: int) -> int:
+        """Grid size of the puzzle at the given position."""
+        return self.grid_sizes[index % len(self.grid_sizes)]
+
+    def seed_for(self, index: int) -> Optional[int]:
+        """Seed of the puzzle at the given position."""
+        return None if self.seed is None else self.seed + index
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the parts of the spec that determine its puzzles."""
+        data = {
+            "difficulty": self.difficulty,
+            "grid_sizes": list(self.grid_sizes),
+            "black_density": self.black_density,
+            "band": (
+                None
+                if self.band is None
+                else {
+                    "name": self.band.name,
+                    "min_score": self.band.min_score,
+                    "max_score": self.band.max_score,
+                    "allow_guessing": self.band.allow_guessing,
+                    "black_density": self.band.black_density,
+                }
+            ),
+            "seed": self.seed,
+        }
+        # Left out when unset so unnamed journals keep their headers
+        if self.stream is not None:
+            data["stream"] = self.stream
+        return data
+
+
+def iter_puzzles(
+    spec: GenerationSpec,
+    journal_path: Optional[Union[str, Path]] = None,
+    stats: Optional[GenerationStats] = None,
+    duplicates: Optional[DuplicateIndex] = None,
+    book: Optional[str] = None,
+) -> Iterator[Puzzle]:
+    """
+    Yield the puzzles of a spec one at a time as they are produced.
+
+    When a journal path is given, puzzles already recorded there are yielded
+    first, then positions that failed earlier are retried and generation
+    resumes at the first missing position. Every new puzzle is appended and
+    flushed before it is yielded, so the journal keeps the yield order.
+
+    Args:
+        spec: Generation spec describing the batch
+        journal_path: Optional JSONL journal used for checkpointing
+        stats: Optional statistics object for band-targeted generation
+        duplicates: Optional fingerprint index. Newly generated puzzles
+            that are already indexed are rejected like failed positions.
+            Journaled puzzles are claimed for their journal entry (see
+            journal_occurrence), and skipped if another occurrence holds
+            them; a new puzzle is claimed only once it is on disk.
+        book: Book recorded with every occurrence in the index
+
+    Yields:
+        Puzzle objects in journal order (failed positions are skipped)
+
+    Raises:
+        JournalMismatchError: If the journal was written for another spec
+    """
+    next_index = 0
+    filled: set = set()
+    failed: set = set()
+    journal = None
+
+    if journal_path is not None:
+        journal_path = Path(journal_path)
+        journal_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if journal_path.exists():
+            for index, offset, puzzle in _read_journal(journal_path, spec):
+                next_index = max(next_index, index + 1)
+                if index in filled:
+                    continue
+                if puzzle is None:
+                    failed.add(index)
+                    continue
+                filled.add(index)
+                failed.discard(index)
+                source = journal_occurrence(journal_path, offset)
+                if duplicates is not None and not duplicates.claim(
+                    puzzle, book, source
+                ):
+                    logger.warning(
+                        f"Skipping puzzle {index + 1} of {journal_path.name}: "
+                        "duplicate of an indexed puzzle"
+                    )
+                    continue
+                yield puzzle
+            if next_index:
+                logger.info(
+                    f"Resumed {len(filled)}/{spec.count} puzzles from "
+                    f"{journal_path}, retrying {len(failed)} failed positions"
+                )
+
+        journal = open(journal_path, "a", encoding="utf-8")
+        if journal.tell() == 0:
+            _append(journal, {"spec": spec.to_dict()})
+
+    try:
+        # A failure may be transient, so failed positions are retried; the
+        # retry is journaled at the end, after the positions already there
+        for index in [*sorted(failed), *range(next_index, spec.count)]:
+            source = None
+            if journal is not None:
+                source = journal_occurrence(journal_path, journal.tell())
+            try:
+                puzzle = _generate_one(spec, index, stats)
+                if duplicates is not None:
+                    if source is None:
+                        accepted = duplicates.add(puzzle, book)
+                    else:
+                        accepted = duplicates.accepts(puzzle, book, source)
+                    if not accepted:
+                        raise PuzzleGenerationError("Duplicate of an indexed puzzle")
+            except Exception as e:
+                logger.warning(f"Failed to generate puzzle {index + 1}: {e}")
+                if journal is not None:
+                    _append(journal, {"index": index, "error": str(e)})
+                continue
+
+            if journal is not None:
+                _append(journal, {"index": index, "puzzle": puzzle.to_dict()})
+                if duplicates is not None:
+                    # Only now, so a crash never indexes a puzzle that is
+                    # not in the journal
+                    duplicates.claim(puzzle, book, source)
+            yield puzzle
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+def extend_journal(
+    spec: GenerationSpec, journal_path: Union[str, Path], puzzles: Iterable[Puzzle]
+) -> int:
+    """
+    Append existing puzzles to the end of a journal.
+
+    Used to seed a journal with puzzles generated elsewhere, such as caches
+    written by earlier versions.
+
+    Args:
+        spec: Generation spec the journal belongs to
+        journal_path: JSONL journal to extend
+        puzzles: Puzzles to append, in order
+
+    Returns:
+        Number of puzzles appended
+
+    Raises:
+        JournalMismatchError: If the journal was written for another spec
+    """
+    journal_path = Path(journal_path)
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+
+    next_index = 0
+    if journal_path.exists():
+        unbounded = replace(spec, count=sys.maxsize)
+        for index, _, _ in _read_journal(journal_path, unbounded):
+            next_index = index + 1
+
+    added = 0
+    with open(journal_path, "a", encoding="utf-8") as journal:
+        if journal.tell() == 0:
+            _append(journal, {"spec": spec.to_dict()})
+        for puzzle in puzzles:
+            _append(journal, {"index": next_index, "puzzle": puzzle.to_dict()})
+            next_index += 1
+            added += 1
+    return added
+
+
+def journal_occurrence(journal_path: Union[str, Path], offset: int) -> str:
+    """
+    Name a journal entry as a DuplicateIndex source.
+
+    Journals are append-only, so an entry keeps its byte offset for good.
+
+    Args:
+        journal_path: JSONL journal
+        offset: Byte offset of the entry's line
+
+    Returns:
+        Source string such as ``beginner_6x6_1c71f9b5f9683e0a.jsonl@512``
+    """
+    return f"{Path(journal_path).name}@{offset}"
+
+
+def _generate_one(
+    spec: GenerationSpec, index: int, stats: Optional[GenerationStats]
+) -> Puzzle:
+    """Generate the puzzle at one position of a spec."""
+    size = spec.size_for(index)
+    if spec.band is not None:
+        return generate_puzzle_in_band(
+            height=size,
+            width=size,
+            band=spec.band,
+            seed=spec.seed_for(index),
+            min_size=(size, size),
+            stats=stats,
+        )
+    return generate_puzzle(
+        height=size,
+        width=size,
+        black_density=spec.black_density,
+        seed=spec.seed_for(index),
+        max_attempts=spec.max_attempts,
+        min_size=(size, size),
+    )
+
+
+def _read_journal(
+    journal_path: Path, spec: GenerationSpec
+) -> Iterator[Tuple[int, int, Optional[Puzzle]]]:
+    """
+    Read the entries for positions below spec.count from a journal.
+
+    A partially written last line (from a crash mid-append) is cut off so
+    that new entries start on a clean line.
+
+    Yields:
+        (index, offset, puzzle) triples in journal order with the entry's
+        byte offset; puzzle is None for failed positions, which a later
+        entry for the same position may fill
+    """
+    good_offset = 0
+    with open(journal_path, "rb") as f:
+        for raw in f:
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                break
+            if not raw.endswith(b"\n"):
+                break
+            offset = good_offset
+            good_offset += len(raw)
+
+            if "spec" in entry:
+                if entry["spec"] != spec.to_dict():
+                    raise JournalMismatchError(
+                        f"Journal {journal_path} was written for a different spec"
+                    )
+                continue
+
+            if entry["index"] >= spec.count:
+                # Belongs to a larger count; kept for the run that asks for
+                # it. Retried positions may still follow.
+                continue
+            puzzle = Puzzle.from_dict(entry["puzzle"]) if "puzzle" in entry else None
+            yield entry["index"], offset, puzzle
+
+    if good_offset != journal_path.stat().st_size:
+        logger.warning(f"Discarding incomplete journal entry in {journal_path}")
+        with open(journal_path, "r+b") as f:
+            f.truncate(good_offset)
+
+
+def _append(journal, entry: Dict[str, Any]) -> None:
+    """Append one entry to the journal and force it to disk."""
+    journal.write(json.dumps(entry) + "\n")
+    journal.flush()
+    os.fsync(journal.fileno())
@@ -0,0 +1 @@
+"""Tests for book builder module."""
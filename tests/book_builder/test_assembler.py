@@ -0,0 +1,50 @@
+"""Tests for puzzle sections in the book assembler."""
+
+import random
+
+import pytest
+
+from src.book_builder.assembler import BookAssembler
+from src.book_builder.config import BookConfig, PuzzleSectionConfig
+
+
+def _section(title, count=2):
+    """A small beginner section of 6x6 puzzles."""
+    return PuzzleSectionConfig(
+        title=title, difficulty="beginner", count=count, grid_sizes=[6]
+    )
+
+
+def _refs(tmp_path, *sections):
+    """References taken by a fresh assembler for each section, in order."""
+    assembler = BookAssembler(BookConfig(metadata={"title": "Test"}), tmp_path)
+    return [
+        assembler.puzzle_refs_for_section(section, tmp_path / "puzzles")
+        for section in sections
+    ]
+
+
+class TestPuzzleSections:
+    """Tests for how sections draw puzzles from the store."""
+
+    @pytest.fixture(autouse=True)
+    def seeded(self):
+        """Make generation reproducible."""
+        random.seed(3)
+
+    def test_renaming_section_keeps_puzzles(self, tmp_path):
+        """A section's streams do not depend on its title."""
+        (before,) = _refs(tmp_path, _section("Warm-up"))
+        (after,) = _refs(tmp_path, _section("First Steps"))
+
+        assert after == before
+
+    def test_alike_sections_have_own_streams(self, tmp_path):
+        """Growing a section leaves an alike later section's puzzles alone."""
+        first, second = _refs(tmp_path, _section("One"), _section("Two"))
+        assert {ref.path for ref in first}.isdisjoint(ref.path for ref in second)
+
+        grown, unchanged = _refs(tmp_path, _section("One", count=3), _section("Two"))
+
+        assert grown[:2] == first
+        assert unchanged == second
@@ -0,0 +1,53 @@
+"""Tests for the duplicate index used by book builds."""
+
+from src.book_builder.config import BookConfig
+from src.book_builder.document import DUPLICATE_INDEX_FILENAME, BookDocument
+from src.puzzle_generation import DuplicateIndex
+from src.puzzle_generation.models import Grid, Puzzle
+from src.puzzle_generation.runs import compute_run_totals, compute_runs
+
+
+def _make_puzzle(cells):
+    """Build a puzzle with run totals from a solved grid."""
+    grid = Grid(height=len(cells), width=len(cells[0]), cells=cells)
+    h_runs, v_runs = compute_runs(grid)
+    compute_run_totals(grid, h_runs, v_runs)
+    return Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
+
+
+def _document(book_dir, **puzzles):
+    """A document for a book directory with the given puzzles settings."""
+    book_dir.mkdir(parents=True, exist_ok=True)
+    config = BookConfig(metadata={"title": "Test"}, puzzles=puzzles)
+    return BookDocument(config, book_dir)
+
+
+class TestDuplicateIndex:
+    """Tests for BookDocument.duplicate_index."""
+
+    def test_book_local_by_default(self, tmp_path):
+        """Without the opt-in, no shared index file is written."""
+        doc = _document(tmp_path / "vol1")
+
+        doc.duplicate_index.claim(_make_puzzle([[-1, -1], [-1, 1]]), "vol1", "a")
+
+        assert not (tmp_path / DUPLICATE_INDEX_FILENAME).exists()
+
+    def test_shared_index_releases_stale_claims(self, tmp_path):
+        """Claims of the rebuilt book and of deleted books are cleared."""
+        puzzles = [
+            _make_puzzle([[-1, -1, -1], [-1, 1, 2], [-1, 3, 4]]),
+            _make_puzzle([[-1, -1, -1], [-1, 9, 6], [-1, 1, 8]]),
+            _make_puzzle([[-1, -1, -1], [-1, 2, 1], [-1, 4, 3]]),
+        ]
+        (tmp_path / "vol2").mkdir()
+        with DuplicateIndex(tmp_path / DUPLICATE_INDEX_FILENAME) as index:
+            index.claim(puzzles[0], "vol1", "a")
+            index.claim(puzzles[1], "vol2", "b")
+            index.claim(puzzles[2], "deleted", "c")
+
+        doc = _document(tmp_path / "vol1", unique_across_books=True)
+
+        assert doc.duplicate_index.books() == {"vol2"}
+        assert doc.duplicate_index.claim(puzzles[2], "vol1", "a")
+        assert not doc.duplicate_index.accepts(puzzles[1], "vol1", "a")
@@ -0,0 +1,137 @@
+"""Tests for flowable streams."""
+
+from io import BytesIO
+
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate
+
+from src.book_builder.flowable_stream import FlowableStream
+
+
+def _paragraph(text, keep_with_next=False):
+    """A body paragraph, optionally kept with the next flowable."""
+    paragraph = Paragraph(text, getSampleStyleSheet()["BodyText"])
+    paragraph.keepWithNext = keep_with_next
+    return paragraph
+
+
+class _Source:
+    """Iterator over flowables that records how many were taken."""
+
+    def __init__(self, flowables):
+        self.flowables = list(flowables)
+        self.taken = 0
+
+    def __iter__(self):
+        for flowable in self.flowables:
+            self.taken += 1
+            yield flowable
+
+
+class TestFlowableStream:
+    """Tests for FlowableStream class."""
+
+    def test_nothing_taken_before_layout(self):
+        """No flowable is produced until the length is asked for."""
+        source = _Source([_paragraph("one")])
+
+        FlowableStream(source)
+
+        assert source.taken == 0
+
+    def test_refill_holds_one_flowable(self):
+        """Without keepWithNext, the buffer holds a single flowable."""
+        source = _Source(_paragraph(str(n)) for n in range(5))
+        stream = FlowableStream(source)
+
+        assert len(stream) == 1
+        assert source.taken == 1
+
+    def test_refill_through_keep_with_next_chain(self):
+        """A keepWithNext chain is buffered with the flowable ending it."""
+        flowables = [
+            _paragraph("heading", keep_with_next=True),
+            _paragraph("subheading", keep_with_next=True),
+            _paragraph("body"),
+            _paragraph("after"),
+        ]
+        stream = FlowableStream(_Source(flowables))
+
+        assert len(stream) == 3
+        assert [f.text for f in stream[:3]] == ["heading", "subheading", "body"]
+
+    def test_refill_after_consuming(self):
+        """Popping from the front refills from the iterator."""
+        flowables = [_paragraph(str(n)) for n in range(3)]
+        stream = FlowableStream(_Source(flowables))
+
+        taken = []
+        while len(stream):
+            taken.append(stream.pop(0).text)
+
+        assert taken == ["0", "1", "2"]
+
+    def test_chain_at_end_of_iterator(self):
+        """A trailing keepWithNext flowable is returned once exhausted."""
+        flowables = [_paragraph("last", keep_with_next=True)]
+        stream = FlowableStream(_Source(flowables))
+
+        assert len(stream) == 1
+        stream.pop(0)
+        assert len(stream) == 0
+
+    def test_buffer_invariant(self):
+        """The buffer never ends in keepWithNext unless exhausted."""
+        pattern = [True, False, True, True, False, False, True, True, True, False]
+        source = _Source(
+            _paragraph(str(n), keep_with_next=keep) for n, keep in enumerate(pattern)
+        )
+        stream = FlowableStream(source)
+
+        while len(stream):
+            exhausted = source.taken == len(pattern)
+            assert exhausted or not stream[-1].getKeepWithNext()
+            stream.pop(0)
+        assert source.taken == len(pattern)
+
+    def test_build_from_generator(self):
+        """A doc template lays out every flowable a generator yields."""
+        drawn = []
+
+        def flowables():
+            for page in range(3):
+                heading = _paragraph(f"Page {page}", keep_with_next=True)
+                heading.drawOn = _recording(heading.drawOn, drawn, heading.text)
+                yield heading
+                body = _paragraph(f"Body {page}")
+                body.drawOn = _recording(body.drawOn, drawn, body.text)
+                yield body
+                yield PageBreak()
+
+        pages = []
+        doc = SimpleDocTemplate(BytesIO())
+        doc.build(
+            FlowableStream(flowables()),
+            onFirstPage=lambda canvas, doc: pages.append(doc.page),
+            onLaterPages=lambda canvas, doc: pages.append(doc.page),
+        )
+
+        assert drawn == [
+            "Page 0",
+            "Body 0",
+            "Page 1",
+            "Body 1",
+            "Page 2",
+            "Body 2",
+        ]
+        assert len(pages) == 3
+
+
+def _recording(draw_on, drawn, label):
+    """Wrap a flowable's drawOn to record the label it draws."""
+
+    def record(*args, **kwargs):
+        drawn.append(label)
+        return draw_on(*args, **kwargs)
+
+    return record
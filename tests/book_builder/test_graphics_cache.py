@@ -0,0 +1,119 @@
+"""Tests for the disk cache of converted figures."""
+
+import pickle
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from pdfrw import PdfArray, PdfDict, PdfName, PdfReader
+from pdfrw.buildxobj import pagexobj
+from pdfrw.toreportlab import makerl
+from reportlab import rl_config
+from reportlab.pdfgen.canvas import Canvas
+
+from src.book_builder.graphics_cache import (
+    GraphicsCache,
+    freeze_pdf_object,
+    thaw_pdf_object,
+)
+
+DIAGRAM = (
+    Path(__file__).parent.parent.parent
+    / "books"
+    / "master-kakuro"
+    / "chapters"
+    / "visuals"
+    / "diagrams"
+    / "chapter1"
+    / "diagram_1.pdf"
+)
+
+
+def _draw_form(xobj) -> bytes:
+    """PDF produced by drawing a form XObject on a page."""
+    output = BytesIO()
+    canvas = Canvas(output, pageCompression=0)
+    canvas.doForm(makerl(canvas, xobj))
+    canvas.showPage()
+    canvas.save()
+    return output.getvalue()
+
+
+@pytest.fixture
+def invariant():
+    """Make ReportLab output reproducible (no timestamps or random IDs)."""
+    previous = rl_config.invariant
+    rl_config.invariant = 1
+    yield
+    rl_config.invariant = previous
+
+
+class TestFreezePdfObject:
+    """Tests for freeze_pdf_object and thaw_pdf_object."""
+
+    def test_pickle_round_trip_draws_identically(self, invariant):
+        """A frozen, pickled and thawed form draws the same PDF bytes."""
+        xobj = pagexobj(PdfReader(str(DIAGRAM)).pages[0])
+
+        nodes = pickle.loads(pickle.dumps(freeze_pdf_object(xobj)))
+        thawed = thaw_pdf_object(nodes)
+
+        assert _draw_form(thawed) == _draw_form(xobj)
+
+    def test_shared_objects_stay_shared(self):
+        """An object referenced twice is thawed as a single object."""
+        shared = PdfDict(Type=PdfName.Shared)
+        root = PdfDict(First=shared, Second=PdfArray([shared]))
+
+        thawed = thaw_pdf_object(freeze_pdf_object(root))
+
+        assert thawed.First is thawed.Second[0]
+
+
+class TestGraphicsCache:
+    """Tests for GraphicsCache class."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """An empty cache."""
+        return GraphicsCache(tmp_path / "cache")
+
+    @pytest.fixture
+    def figure(self, tmp_path):
+        """A figure file."""
+        path = tmp_path / "figure.svg"
+        path.write_text("<svg/>")
+        return path
+
+    def test_miss_then_hit(self, cache, figure):
+        """A stored value is returned for the same content and size."""
+        key = cache.key(figure, "svg", 400, 300)
+
+        assert cache.get(key) is None
+        cache.put(key, ("drawing", 400, 300))
+
+        assert cache.get(cache.key(figure, "svg", 400, 300)) == ("drawing", 400, 300)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_depends_on_size(self, cache, figure):
+        """A figure drawn at another size is a different entry."""
+        cache.put(cache.key(figure, "svg", 400, 300), "large")
+
+        assert cache.get(cache.key(figure, "svg", 200, 150)) is None
+
+    def test_key_depends_on_content(self, cache, figure):
+        """Editing a figure invalidates its entry."""
+        cache.put(cache.key(figure, "svg", 400, 300), "old")
+        figure.write_text("<svg><rect/></svg>")
+
+        assert cache.get(cache.key(figure, "svg", 400, 300)) is None
+
+    def test_unreadable_entry_is_a_miss(self, cache, figure):
+        """A corrupt entry is removed and reported as a miss."""
+        key = cache.key(figure, "svg", 400, 300)
+        cache.put(key, "drawing")
+        cache.path(key).write_bytes(b"truncated")
+
+        assert cache.get(key) is None
+        assert not cache.path(key).exists()
+        assert (cache.hits, cache.misses) == (0, 1)
@@ -0,0 +1,125 @@
+"""Tests for measurements shared between diagram and table flowables."""
+
+import pytest
+
+from src.book_builder import diagram_renderer, reference_table_renderer
+from src.book_builder.diagram_models import (
+    AnnotationBox,
+    CombinationCard,
+    CombinationSection,
+    DiagramDefinition,
+    DiagramGrid,
+    Legend,
+    ReferenceTableDefinition,
+)
+from src.book_builder.diagram_renderer import DiagramFlowable
+from src.book_builder.layout_cache import MeasurementCache
+from src.book_builder.reference_table_renderer import ReferenceTableFlowable
+from src.pdf_generation import fonts
+
+
+def _diagram(annotation="Runs of two cells summing to 3 must be 1 and 2."):
+    """A diagram definition with two side-by-side grids and a legend."""
+    return DiagramDefinition(
+        diagram_id="chapter1_diagram1",
+        title="Two-cell runs",
+        grids=[
+            DiagramGrid(rows=4, cols=12, title="Before"),
+            DiagramGrid(rows=4, cols=12, title="After"),
+        ],
+        annotations=[AnnotationBox(text=annotation, title="Tip")],
+        legend=Legend(items={"yellow": "Run being solved"}),
+        layout="horizontal",
+        caption="Placing the only digits that fit",
+    )
+
+
+def _table():
+    """A reference table definition with one section."""
+    return ReferenceTableDefinition(
+        diagram_id="chapter2_table1",
+        title="Unique combinations",
+        sections=[
+            CombinationSection(
+                title="Two cells",
+                cards=[CombinationCard(3, "1 + 2"), CombinationCard(17, "8 + 9")],
+            )
+        ],
+        footer_note="Memorize these first.",
+    )
+
+
+def _measured(flowable):
+    """The attributes a flowable's measurement set."""
+    return {name: getattr(flowable, name) for name in flowable.MEASURED}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh cache used by both kinds of flowable."""
+    fonts.register_default_fonts()
+    cache = MeasurementCache()
+    monkeypatch.setattr(diagram_renderer, "MEASUREMENTS", cache)
+    monkeypatch.setattr(reference_table_renderer, "MEASUREMENTS", cache)
+    return cache
+
+
+class TestMeasurementCache:
+    """Tests for MeasurementCache."""
+
+    def test_equal_definitions_hit(self, cache):
+        """Flowables of separately loaded, equal definitions share measurements."""
+        first = DiagramFlowable(_diagram(), max_width=400)
+        second = DiagramFlowable(_diagram(), max_width=400)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert _measured(second) == _measured(first)
+        assert second.wrap(400, 600) == first.wrap(400, 600)
+
+    def test_cached_measurements_match_fresh(self, cache):
+        """A hit sets everything a fresh measurement would."""
+        DiagramFlowable(_diagram(), max_width=400)
+        cached = DiagramFlowable(_diagram(), max_width=400)
+        cache.clear()
+        fresh = DiagramFlowable(_diagram(), max_width=400)
+
+        assert cache.hits == 1
+        assert vars(cached).keys() == vars(fresh).keys()
+        assert _measured(cached) == _measured(fresh)
+        assert cached.cell_size < DiagramFlowable.DEFAULT_CELL_SIZE
+
+    def test_hit_does_not_share_lists(self, cache):
+        """Flowables get their own copies of measured lists."""
+        first = DiagramFlowable(_diagram(), max_width=400)
+        second = DiagramFlowable(_diagram(), max_width=400)
+
+        second.grid_heights.append(0)
+
+        assert len(first.grid_heights) == 2
+
+    def test_params_miss(self, cache):
+        """Another width is measured again."""
+        narrow = DiagramFlowable(_diagram(), max_width=300)
+        wide = DiagramFlowable(_diagram(), max_width=500)
+
+        assert (cache.hits, cache.misses) == (0, 2)
+        assert narrow.width != wide.width
+
+    def test_changed_definition_misses(self, cache):
+        """Editing a definition invalidates its measurements."""
+        diagram = _diagram()
+        short = DiagramFlowable(diagram, max_width=400)
+        diagram.annotations[0].text = "A much longer annotation. " * 20
+        long = DiagramFlowable(diagram, max_width=400)
+
+        assert (cache.hits, cache.misses) == (0, 2)
+        assert long.height > short.height
+
+    def test_flowable_kinds_kept_apart(self, cache):
+        """Diagrams and tables are cached separately."""
+        first = ReferenceTableFlowable(_table(), max_width=432)
+        second = ReferenceTableFlowable(_table(), max_width=432)
+        DiagramFlowable(_diagram(), max_width=432)
+
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert _measured(second) == _measured(first)
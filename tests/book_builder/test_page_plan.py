@@ -0,0 +1,84 @@
+"""Tests for planning TOC page numbers in one measuring pass."""
+
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import Frame, PageBreak, PageTemplate, Spacer
+
+from src.book_builder.config import BookConfig
+from src.book_builder.document import BookDocument, TOCNotifyFlowable
+from src.book_builder.page_plan import (
+    PlanningDocTemplate,
+    build_planned,
+    plan_pages,
+)
+
+
+def _chapter_text(paragraphs):
+    """Markdown for a chapter with the given number of paragraphs."""
+    body = "Fill each white cell so every run adds up to its clue. " * 40
+    return "\n\n".join(f"## Part {n}\n\n{body}" for n in range(paragraphs))
+
+
+def _book(book_dir):
+    """A book whose TOC runs over a page, ahead of chapters of mixed length."""
+    chapters = book_dir / "chapters"
+    chapters.mkdir(parents=True, exist_ok=True)
+    doc = BookDocument(BookConfig(metadata={"title": "Test"}), book_dir)
+    doc.add_title_page()
+    doc.add_toc_placeholder()
+    for n in range(30):
+        (chapters / f"{n:02d}.md").write_text(_chapter_text(1 + n % 4))
+        if n % 10 == 0:
+            doc.add_section_header(f"Part {n // 10 + 1}")
+        doc.add_chapter(f"chapters/{n:02d}.md", f"Chapter {n + 1}")
+    doc.finalize_toc()
+    return doc
+
+
+def _simple_doc(output):
+    """A one-frame planning template for a letter page."""
+    doc = PlanningDocTemplate(output, pagesize=letter)
+    doc.addPageTemplates([PageTemplate("main", [Frame(72, 72, 468, 648, id="normal")])])
+    return doc
+
+
+class TestPlannedBuild:
+    """Tests for plan_pages and build_planned."""
+
+    def test_matches_multibuild(self, tmp_path):
+        """A planned build numbers the TOC like a multi-pass build."""
+        planned = _book(tmp_path / "book")
+        planned.save(tmp_path / "planned.pdf")
+
+        reference = _book(tmp_path / "book")
+        doc = reference._create_toc_doc(str(tmp_path / "multibuild.pdf"))
+        doc.multiBuild(list(reference.flowables()))
+
+        expected = [
+            (level, title, page) for level, title, page, *_ in reference._toc._entries
+        ]
+        assert [
+            (entry.level, entry.title, entry.page_number)
+            for entry in planned.toc_entries
+        ] == expected
+        # The TOC runs over two pages and chapters take one to several
+        assert expected[0][2] == 4
+        pages = [page for _, _, page in expected]
+        assert len({after - before for before, after in zip(pages, pages[1:])}) > 2
+
+    def test_toc_drift_raises(self, tmp_path):
+        """A heading that lands elsewhere than planned is an error."""
+        toc = _book(tmp_path / "book")._toc
+
+        def flowables(fillers):
+            yield toc
+            yield PageBreak()
+            for _ in range(fillers):
+                yield Spacer(1, 400)
+            yield TOCNotifyFlowable("Chapter 1")
+
+        plan = plan_pages(_simple_doc, flowables(1), toc, [(0, "Chapter 1")])
+        assert plan.toc_entries == [(0, "Chapter 1", 2)]
+
+        with pytest.raises(RuntimeError, match="Table of contents"):
+            build_planned(_simple_doc, flowables(2), toc, plan, tmp_path / "out.pdf")
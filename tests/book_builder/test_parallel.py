@@ -0,0 +1,223 @@
+"""Tests for building a book in parts."""
+
+import base64
+import re
+import zlib
+from collections import Counter
+
+import pytest
+from pdfrw import PdfReader
+from reportlab import rl_config
+
+from src.book_builder.config import BookConfig, PuzzleSectionConfig
+from src.book_builder.document import BookDocument
+from src.book_builder.parallel import PlacedItem, plan_chunks, share_resources
+from src.puzzle_generation.models import Grid, Puzzle
+from src.puzzle_generation.runs import compute_run_totals, compute_runs
+
+# A 3x3 block of digits with no repeats in any row or column
+LATIN_SQUARE = [[1, 2, 3], [2, 3, 1], [3, 1, 2]]
+
+JOB_FIELDS = dict(
+    page_size=(612, 792),
+    content_width=468,
+    content_height=648,
+    render_mode="cells",
+)
+
+
+def make_puzzle(offset):
+    """A solved 4x4 puzzle; different offsets give different puzzles."""
+    cells = [[-1] * 4] + [[-1] + [d + offset for d in row] for row in LATIN_SQUARE]
+    grid = Grid(height=4, width=4, cells=cells)
+    h_runs, v_runs = compute_runs(grid)
+    compute_run_totals(grid, h_runs, v_runs)
+    return Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
+
+
+def make_document(book_dir, sections, incremental=False):
+    """A book with a TOC, the given puzzle sections and their solutions.
+
+    Args:
+        book_dir: Book directory
+        sections: One list of puzzles per section
+        incremental: Build with a render cache
+    """
+    book_dir.mkdir(parents=True, exist_ok=True)
+    doc = BookDocument(BookConfig(metadata={"title": "Test"}), book_dir, incremental)
+    doc.add_toc_placeholder()
+    for index, puzzles in enumerate(sections):
+        doc.assembler.puzzle_refs_for_section = (
+            lambda section, cache_dir, duplicates, puzzles=puzzles: puzzles
+        )
+        section = PuzzleSectionConfig(
+            title=f"Section {index + 1}", difficulty="beginner", count=len(puzzles)
+        )
+        doc.add_puzzle_section(section)
+    doc.add_solutions()
+    doc.finalize_toc()
+    return doc
+
+
+def _decoded(stream_dict):
+    """Decoded content of a stream."""
+    data = stream_dict.stream.encode("latin-1")
+    filters = stream_dict.Filter or []
+    if not isinstance(filters, list):
+        filters = [filters]
+    for name in filters:
+        if name == "/ASCII85Decode":
+            data = base64.a85decode(data.strip().removesuffix(b"~>"))
+        elif name == "/FlateDecode":
+            data = zlib.decompress(data)
+    return data
+
+
+def _shown_text(resources, *streams):
+    """Strings shown by content streams and the forms they draw."""
+    text = []
+    for stream_dict in streams:
+        text.extend(re.findall(rb"\((.*?)\) Tj", _decoded(stream_dict)))
+    xobjects = (resources or {}).get("/XObject") or {}
+    for xobject in xobjects.values():
+        if xobject.Subtype == "/Form":
+            text.extend(_shown_text(xobject.Resources, xobject))
+    return text
+
+
+def page_texts(path):
+    """Per page, the strings shown on it (in any order)."""
+    texts = []
+    for page in PdfReader(str(path)).pages:
+        contents = page.Contents
+        contents = contents if isinstance(contents, list) else [contents]
+        texts.append(Counter(_shown_text(page.Resources, *contents)))
+    return texts
+
+
+class TestPlanChunks:
+    """Tests for plan_chunks."""
+
+    def test_chunks_cut_at_block_boundaries(self):
+        """Small blocks are packed whole; a large block is split evenly."""
+        blocks = ["a"] * 2 + ["b"] * 3 + ["c"] * 7 + ["d"]
+        items = [
+            PlacedItem("puzzle", None, block, page=page)
+            for page, block in enumerate(blocks, start=1)
+        ]
+
+        jobs = plan_chunks(items, 4, **JOB_FIELDS)
+
+        assert [job.pages for job in jobs] == [
+            [1, 2],
+            [3, 4, 5],
+            [6, 7, 8, 9],
+            [10, 11, 12],
+            [13],
+        ]
+        for job in jobs:
+            assert [item.page for item in job.items] == job.pages
+
+    def test_every_page_in_one_chunk(self):
+        """Pages holding several items land in a single chunk."""
+        items = [
+            PlacedItem("solutions", None, "solutions", page=page)
+            for page in (1, 1, 2, 3, 3, 3)
+        ]
+
+        jobs = plan_chunks(items, 2, **JOB_FIELDS)
+
+        assert [page for job in jobs for page in job.pages] == [1, 2, 3]
+        assert sum(len(job.items) for job in jobs) == len(items)
+
+
+class TestShareResources:
+    """Tests for share_resources."""
+
+    def test_identical_fonts_written_once(self, tmp_path):
+        """Fonts of the same PDF read twice are folded into one object."""
+        doc = make_document(tmp_path / "book", [[make_puzzle(0)]])
+        path = tmp_path / "one.pdf"
+        doc.save(path)
+        pages = PdfReader(str(path)).pages + PdfReader(str(path)).pages
+
+        dropped = share_resources(pages)
+
+        assert dropped > 0
+        fonts = {id(page.Resources.Font) for page in pages}
+        assert len(fonts) == 1
+
+
+class TestSaveInParts:
+    """Tests for building a book with worker processes."""
+
+    def test_workers_match_single_process(self, tmp_path):
+        """-j1 and -jN give the same pages, in the same order."""
+        sections = [
+            [make_puzzle(offset) for offset in range(4)],
+            [make_puzzle(offset) for offset in range(4, 7)],
+        ]
+        single = make_document(tmp_path / "book", sections).save(
+            tmp_path / "single.pdf", workers=1
+        )
+        parallel = make_document(tmp_path / "book", sections).save(
+            tmp_path / "parallel.pdf", workers=2
+        )
+
+        single_texts = page_texts(single)
+        assert page_texts(parallel) == single_texts
+        assert any(b"#7" in text for text in single_texts)
+
+    def test_shared_fonts_not_duplicated(self, tmp_path):
+        """Stamped parts share one copy of each font subset."""
+        sections = [[make_puzzle(offset) for offset in range(6)]]
+        path = make_document(tmp_path / "book", sections).save(
+            tmp_path / "parallel.pdf", workers=3
+        )
+
+        font_files = {}
+        for page in PdfReader(str(path)).pages:
+            for xobject in (page.Resources.XObject or {}).values():
+                for font in xobject.Resources.Font.values():
+                    font_file = font.FontDescriptor.FontFile2
+                    font_files[id(font_file)] = font_file.stream
+        assert len(font_files) == len(set(font_files.values()))
+
+
+class TestIncrementalBuild:
+    """Tests for builds that reuse parts from the render cache."""
+
+    @pytest.fixture(autouse=True)
+    def invariant(self, monkeypatch):
+        """Leave timestamps out of the PDFs so builds can be compared."""
+        monkeypatch.setattr(rl_config, "invariant", 1)
+
+    def test_warm_build_matches_cold_build(self, tmp_path):
+        """A build from the cache is byte-identical to the one that filled it."""
+        sections = [[make_puzzle(offset) for offset in range(3)]]
+        cold_doc = make_document(tmp_path / "book", sections, incremental=True)
+        cold = cold_doc.save(tmp_path / "cold.pdf", workers=2)
+        warm_doc = make_document(tmp_path / "book", sections, incremental=True)
+        warm = warm_doc.save(tmp_path / "warm.pdf")
+
+        assert (cold_doc.render_cache.hits, cold_doc.render_cache.misses) == (0, 2)
+        assert (warm_doc.render_cache.hits, warm_doc.render_cache.misses) == (2, 0)
+        assert warm.read_bytes() == cold.read_bytes()
+
+    def test_stale_parts_rebuilt(self, tmp_path):
+        """Changing a puzzle re-renders its section and the solutions only."""
+        sections = [
+            [make_puzzle(offset) for offset in range(3)],
+            [make_puzzle(offset) for offset in range(3, 5)],
+        ]
+        make_document(tmp_path / "book", sections, incremental=True).save(
+            tmp_path / "first.pdf"
+        )
+
+        sections[1][0] = make_puzzle(6)
+        doc = make_document(tmp_path / "book", sections, incremental=True)
+        rebuilt = doc.save(tmp_path / "rebuilt.pdf")
+        fresh = make_document(tmp_path / "fresh", sections).save(tmp_path / "fresh.pdf")
+
+        assert (doc.render_cache.hits, doc.render_cache.misses) == (1, 2)
+        assert page_texts(rebuilt) == page_texts(fresh)
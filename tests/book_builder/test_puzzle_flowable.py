@@ -0,0 +1,78 @@
+"""Tests for puzzle and solution flowables."""
+
+import pytest
+
+from src.book_builder.puzzle_flowable import SolutionSheetFlowable
+from src.puzzle_generation.refs import PuzzleRef
+
+FRAME_WIDTH = 432
+PAGE_HEIGHT = 300
+
+
+def _entries(*sizes):
+    """Solution entries of the given (height, width), numbered from 1."""
+    return [
+        (i + 1, PuzzleRef("unused.jsonl", i, height, width), "Beginner")
+        for i, (height, width) in enumerate(sizes)
+    ]
+
+
+SIZES = [(6, 6), (9, 9), (12, 15), (7, 7), (15, 12), (8, 8), (10, 10), (6, 6)] * 4
+
+
+class TestSolutionSheetFlowable:
+    """Tests for SolutionSheetFlowable class."""
+
+    @pytest.fixture
+    def sheet(self):
+        """A packed sheet of mixed grid sizes."""
+        sheet = SolutionSheetFlowable(_entries(*SIZES))
+        sheet.wrap(FRAME_WIDTH, PAGE_HEIGHT)
+        return sheet
+
+    def test_shelves_keep_puzzle_order(self, sheet):
+        """Shelves hold consecutive grids, in puzzle order."""
+        next_grid = 0
+        for first, count, _ in sheet.shelves:
+            assert first == next_grid
+            assert count > 0
+            next_grid += count
+
+        assert next_grid == len(SIZES)
+
+    def test_no_shelf_wider_than_frame(self, sheet):
+        """Every shelf, gaps included, fits the frame width."""
+        for first, count, height in sheet.shelves:
+            grids = sheet.grids[first : first + count]
+            width = sum(grid.width for grid in grids) + sheet.gap * (count - 1)
+            assert width <= FRAME_WIDTH + 1e-6
+            assert max(grid.height for grid in grids) == height
+
+    def test_split_parts_reassemble_entries(self, sheet):
+        """The two parts of a split hold the sheet's entries, in order."""
+        first, rest = sheet.split(FRAME_WIDTH, PAGE_HEIGHT)
+
+        assert first.entries + rest.entries == sheet.entries
+        assert first.wrap(FRAME_WIDTH, PAGE_HEIGHT)[1] <= PAGE_HEIGHT
+
+    def test_split_across_pages(self, sheet):
+        """Splitting page by page draws every grid exactly once."""
+        pages = []
+        remaining = sheet
+        while True:
+            parts = remaining.split(FRAME_WIDTH, PAGE_HEIGHT)
+            assert parts, "a shelf must fit on an empty page"
+            pages.append(parts[0])
+            if len(parts) == 1:
+                break
+            remaining = parts[1]
+
+        assert len(pages) > 1
+        numbers = [num for page in pages for num, _, _ in page.entries]
+        assert numbers == list(range(1, len(SIZES) + 1))
+        for page in pages:
+            assert page.wrap(FRAME_WIDTH, PAGE_HEIGHT)[1] <= PAGE_HEIGHT
+
+    def test_split_when_nothing_fits(self, sheet):
+        """A sheet moves whole to the next page if no shelf fits."""
+        assert sheet.split(FRAME_WIDTH, 10) == []
@@ -0,0 +1,147 @@
+"""Tests for the render cache and the keys of cached book parts."""
+
+import pytest
+
+from src.book_builder import render_cache
+from src.book_builder.config import BookConfig
+from src.book_builder.document import BookDocument
+from src.book_builder.parallel import PlacedItem, _block_key
+from src.book_builder.render_cache import RenderCache
+from src.puzzle_generation.models import Grid, Puzzle
+from src.puzzle_generation.runs import compute_run_totals, compute_runs
+
+JOB_FIELDS = dict(
+    page_size=(612, 792),
+    content_width=468,
+    content_height=648,
+    render_mode="cells",
+)
+
+
+def _puzzle(first_digit):
+    """A solved 3x3 puzzle whose top-left digit is first_digit."""
+    cells = [[-1, -1, -1], [-1, first_digit, 2], [-1, 3, 4]]
+    grid = Grid(height=3, width=3, cells=cells)
+    h_runs, v_runs = compute_runs(grid)
+    compute_run_totals(grid, h_runs, v_runs)
+    return Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
+
+
+def _section(puzzles, x=72.0):
+    """Placed items of a puzzle section, one puzzle per page from page 5."""
+    return [
+        PlacedItem(
+            "puzzle",
+            (number, puzzle, "Beginner"),
+            "puzzles-1",
+            page=5 + number,
+            x=x,
+            y=100.0,
+            avail_width=468,
+            avail_height=648,
+        )
+        for number, puzzle in enumerate(puzzles, start=1)
+    ]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """An empty render cache."""
+    return RenderCache(tmp_path / "render_cache", salt="layout")
+
+
+class TestRenderCache:
+    """Tests for RenderCache."""
+
+    def test_miss_then_hit(self, cache, tmp_path):
+        """A key is missing until a part is put under it."""
+        key = cache.key("chapter", "Intro")
+        assert cache.get(key) is None
+
+        part = tmp_path / "intro.part"
+        part.write_bytes(b"%PDF")
+        cache.put(key, part)
+
+        assert cache.get(key) == cache.path(key)
+        assert cache.path(key).read_bytes() == b"%PDF"
+        assert not part.exists()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_depends_on_parts(self, cache):
+        """Different inputs give different keys; the same inputs the same."""
+        assert cache.key("chapter", b"text") == cache.key("chapter", b"text")
+        assert cache.key("chapter", b"text") != cache.key("chapter", b"text!")
+        assert cache.key("ab", "c") != cache.key("a", "bc")
+
+    def test_key_depends_on_salt(self, tmp_path):
+        """Caches salted with different settings do not share keys."""
+        first = RenderCache(tmp_path / "cache", salt="letter")
+        second = RenderCache(tmp_path / "cache", salt="a4")
+
+        assert first.key("chapter") != second.key("chapter")
+
+    def test_key_depends_on_code_version(self, cache, monkeypatch):
+        """Changing the rendering code invalidates every key."""
+        before = cache.key("chapter")
+        monkeypatch.setattr(render_cache, "code_version", lambda: "edited")
+
+        assert cache.key("chapter") != before
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            {"layout": {"solutions_per_page": 4}},
+            {"layout": {"render_mode": "forms"}},
+            {"fonts": {"puzzle": "Helvetica-Bold"}},
+        ],
+    )
+    def test_book_salt_depends_on_layout_and_fonts(self, tmp_path, changes):
+        """A book's cache salt changes with its layout and fonts."""
+        base = BookDocument(BookConfig(metadata={"title": "T"}), tmp_path, True)
+        changed = BookDocument(
+            BookConfig(metadata={"title": "T"}, **changes), tmp_path, True
+        )
+
+        assert base.render_cache.salt != changed.render_cache.salt
+
+
+class TestBlockKey:
+    """Tests for the cache key of a puzzle section or solutions block."""
+
+    def test_same_block_same_key(self, cache):
+        """Rebuilding an unchanged block gives the same key."""
+        puzzles = [_puzzle(1), _puzzle(5)]
+
+        assert _block_key(cache, _section(puzzles), JOB_FIELDS) == _block_key(
+            cache, _section([_puzzle(1), _puzzle(5)]), JOB_FIELDS
+        )
+
+    def test_key_depends_on_puzzles(self, cache):
+        """Changing one puzzle of a section changes the key."""
+        key = _block_key(cache, _section([_puzzle(1), _puzzle(5)]), JOB_FIELDS)
+
+        assert key != _block_key(cache, _section([_puzzle(1), _puzzle(6)]), JOB_FIELDS)
+
+    def test_key_depends_on_placement(self, cache):
+        """Moving the grids on their pages changes the key."""
+        puzzles = [_puzzle(1), _puzzle(5)]
+        key = _block_key(cache, _section(puzzles), JOB_FIELDS)
+
+        assert key != _block_key(cache, _section(puzzles, x=90.0), JOB_FIELDS)
+
+    def test_key_ignores_first_page(self, cache):
+        """A section that only moves to other pages keeps its key."""
+        items = _section([_puzzle(1), _puzzle(5)])
+        key = _block_key(cache, items, JOB_FIELDS)
+        for item in items:
+            item.page += 3
+
+        assert _block_key(cache, items, JOB_FIELDS) == key
+
+    def test_key_depends_on_layout(self, cache):
+        """Content size and render mode are part of the key."""
+        items = _section([_puzzle(1)])
+        key = _block_key(cache, items, JOB_FIELDS)
+
+        assert key != _block_key(cache, items, {**JOB_FIELDS, "content_width": 432})
+        assert key != _block_key(cache, items, {**JOB_FIELDS, "render_mode": "forms"})
@@ -0,0 +1,65 @@
+"""Import checks for the book_builder CLI."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+
+# Modules the CLI must not load before a build is requested
+RENDERING_MODULES = (
+    "reportlab",
+    "PIL",
+    "pdfrw",
+    "svglib",
+    "src.pdf_generation",
+    "src.book_builder.builder",
+    "src.book_builder.document",
+    "src.book_builder.diagrams",
+)
+
+# Modules only validate and build need, not list or --help
+CONFIG_MODULES = (
+    "pydantic",
+    "src.book_builder.config",
+)
+
+
+def _loaded(times: dict[str, int], modules: tuple[str, ...]) -> list[str]:
+    """Names in times that are one of modules or a submodule of one."""
+    return [
+        name
+        for name in times
+        if any(name == module or name.startswith(f"{module}.") for module in modules)
+    ]
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in µs of every module loaded by importing module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestCliStartup:
+    """Tests for the cost of starting the book_builder CLI."""
+
+    def test_no_rendering_modules(self):
+        """Importing the CLI should not load ReportLab or the renderers."""
+        times = _import_times("src.book_builder.__main__")
+        assert _loaded(times, RENDERING_MODULES) == []
+
+    def test_no_config_models(self):
+        """Importing the CLI should not load the configuration models."""
+        times = _import_times("src.book_builder.__main__")
+        assert _loaded(times, CONFIG_MODULES) == []
@@ -0,0 +1,36 @@
+"""Tests for PDF compliance checks."""
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen.canvas import Canvas
+
+from src.pdf_generation.compliance import find_unembedded_fonts
+from src.pdf_generation.fonts import FONTS_DIR
+
+
+def _write_pdf(path, font_name):
+    """Write a one-page PDF whose only font is font_name."""
+    canvas = Canvas(str(path), initialFontName=font_name)
+    canvas.drawString(72, 720, "Kakuro 45")
+    canvas.save()
+
+
+class TestFindUnembeddedFonts:
+    """Tests for find_unembedded_fonts."""
+
+    def test_builtin_font_is_reported(self, tmp_path):
+        """Standard 14 fonts are referenced, not embedded."""
+        path = tmp_path / "builtin.pdf"
+        _write_pdf(path, "Helvetica")
+
+        assert find_unembedded_fonts(path) == ["Helvetica"]
+
+    def test_truetype_font_is_embedded(self, tmp_path):
+        """Registered TrueType fonts are embedded as subsets."""
+        pdfmetrics.registerFont(
+            TTFont("NotoSans-Regular", str(FONTS_DIR / "NotoSans-Regular.ttf"))
+        )
+        path = tmp_path / "embedded.pdf"
+        _write_pdf(path, "NotoSans-Regular")
+
+        assert find_unembedded_fonts(path) == []
@@ -1,8 +1,16 @@
 """Tests for font management and registration."""
 
+import shutil
+from io import BytesIO
 from unittest.mock import patch
 
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen.canvas import Canvas
+
 from src.pdf_generation.fonts import (
+    FONTS_DIR,
+    load_ttf,
+    register_default_fonts,
     register_fonts,
     get_font_name,
     is_font_available,
@@ -54,3 +62,64 @@ class TestFontManagement:
         with patch("src.pdf_generation.fonts.register_fonts") as mock_reg:
             assert is_font_available("GhostFont") is False
             mock_reg.assert_called()
+
+    def test_load_ttf_reuses_cache(self, tmp_path):
+        """A font loaded from the cache should measure and embed like a parsed one."""
+        font_file = tmp_path / "NotoSans-Regular.ttf"
+        shutil.copy(FONTS_DIR / "NotoSans-Regular.ttf", font_file)
+
+        parsed = load_ttf("CacheTestParsed", font_file)
+        assert len(list((tmp_path / ".cache").glob("*.pickle"))) == 1
+        with patch("src.pdf_generation.fonts.TTFont.__init__") as mock_init:
+            cached = load_ttf("CacheTestCached", font_file)
+            mock_init.assert_not_called()
+
+        assert cached.fontName == "CacheTestCached"
+        text = "Kakuro 123 \u00e9"
+        assert cached.stringWidth(text, 12) == parsed.stringWidth(text, 12)
+
+        sizes = []
+        for font in (parsed, cached):
+            pdfmetrics.registerFont(font)
+            output = BytesIO()
+            canvas = Canvas(output)
+            canvas.setFont(font.fontName, 12)
+            canvas.drawString(72, 72, text)
+            canvas.save()
+            sizes.append(len(output.getvalue()))
+        assert sizes[0] == sizes[1]
+
+    def test_load_ttf_ignores_corrupt_cache(self, tmp_path):
+        """An unreadable cache file should be replaced by a fresh parse."""
+        font_file = tmp_path / "NotoSans-Regular.ttf"
+        shutil.copy(FONTS_DIR / "NotoSans-Regular.ttf", font_file)
+        load_ttf("CorruptCacheParsed", font_file)
+        (cache_path,) = (tmp_path / ".cache").glob("*.pickle")
+        cache_path.write_bytes(b"not a pickle")
+
+        font = load_ttf("CorruptCacheReparsed", font_file)
+
+        assert font.fontName == "CorruptCacheReparsed"
+        assert font.stringWidth("Kakuro", 12) > 0
+        assert cache_path.read_bytes() != b"not a pickle"
+
+    @patch("src.pdf_generation.fonts.pdfmetrics.registerFont")
+    def test_register_default_fonts_skips_failures(self, mock_register, tmp_path):
+        """A font that fails to load should not stop the others registering."""
+        for name in ("BrokenFont", "GoodFont"):
+            (tmp_path / f"{name}.ttf").write_bytes(b"")
+
+        def load(font_name, font_file):
+            if font_name == "BrokenFont":
+                raise ValueError("bad font file")
+            return font_name
+
+        with (
+            patch("src.pdf_generation.fonts.FONTS_DIR", tmp_path),
+            patch("src.pdf_generation.fonts.load_ttf", side_effect=load),
+            patch("src.pdf_generation.fonts._registered_fonts", set()),
+        ):
+            registered = register_default_fonts("BrokenFont", "GoodFont")
+
+        assert registered == ["GoodFont"]
+        mock_register.assert_called_once_with("GoodFont")
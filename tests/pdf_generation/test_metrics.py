@@ -0,0 +1,30 @@
+"""Tests for cached text metrics."""
+
+from reportlab.pdfbase import pdfmetrics
+
+from src.pdf_generation.metrics import centered_offset, string_width
+
+
+class TestMetrics:
+    """Tests for string_width and centered_offset."""
+
+    def test_string_width_matches_reportlab(self):
+        """Cached widths should equal ReportLab's own measurement."""
+        for text in ("7", "45", "Sum: 12"):
+            assert string_width(text, "Helvetica", 8) == pdfmetrics.stringWidth(
+                text, "Helvetica", 8
+            )
+
+    def test_string_width_is_cached(self):
+        """Measuring the same label twice should hit the cache."""
+        string_width.cache_clear()
+        string_width("23", "Helvetica", 9)
+        string_width("23", "Helvetica", 9)
+        assert string_width.cache_info().hits == 1
+
+    def test_centered_offset(self):
+        """The offset should centre the text on the anchor."""
+        width = pdfmetrics.stringWidth("8", "Helvetica", 14)
+        dx, dy = centered_offset("8", "Helvetica", 14, 15, 15)
+        assert dx == 15 - width / 2
+        assert dy == 15 - 7
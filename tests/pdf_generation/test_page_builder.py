@@ -6,9 +6,19 @@ from unittest.mock import MagicMock, patch
 from src.pdf_generation.page_builder import (
     build_puzzle_page,
     build_solution_page,
+    pack_puzzle_page,
     _draw_puzzle_number,
 )
 from src.pdf_generation.models import PageLayout, RenderConfig
+from src.puzzle_generation.refs import PuzzleRef
+
+
+def _refs(*sizes):
+    """Puzzle references of the given (height, width), numbered from 1."""
+    return [
+        (i + 1, PuzzleRef("unused.jsonl", i, height, width))
+        for i, (height, width) in enumerate(sizes)
+    ]
 
 
 class TestPageBuilder:
@@ -42,6 +52,52 @@ class TestPageBuilder:
         # Should call render_grid twice
         assert mock_render.call_count == 2
 
+    @patch("src.pdf_generation.page_builder.render_grid")
+    def test_build_puzzle_page_many(self, mock_render, mock_canvas, sample_puzzles):
+        """build_puzzle_page should draw every puzzle, not just the first two."""
+        layout = PageLayout.compact(puzzles_per_page=4)
+        puzzles = list(enumerate(sample_puzzles, start=1))
+        build_puzzle_page(mock_canvas, puzzles, layout)
+
+        assert mock_render.call_count == 4
+        # Every grid is drawn at the same cell size
+        cell_sizes = {call.args[4].cell_size for call in mock_render.call_args_list}
+        assert len(cell_sizes) == 1
+
+    @pytest.mark.parametrize("count", [2, 4, 6])
+    def test_pack_puzzle_page_fits_content(self, count):
+        """Packed grids should fit the content area without overlapping."""
+        layout = PageLayout.compact(puzzles_per_page=count)
+        sizes = [(7, 7), (10, 10), (6, 8), (12, 9), (8, 8), (9, 11)][:count]
+        packing = pack_puzzle_page(_refs(*sizes), layout)
+
+        assert [slot.number for slot in packing.slots] == list(range(1, count + 1))
+        assert packing.cell_size <= layout.render_config.cell_size
+        left = layout.margins.left
+        right = layout.page_size.width - layout.margins.right
+        bottom = layout.margins.bottom
+        for slot in packing.slots:
+            assert left - 1e-6 <= slot.x
+            assert slot.x + slot.width <= right + 1e-6
+            assert slot.y - slot.height >= bottom - 1e-6
+        for a in packing.slots:
+            for b in packing.slots:
+                if a is b:
+                    continue
+                apart = (
+                    a.x + a.width <= b.x + 1e-6
+                    or b.x + b.width <= a.x + 1e-6
+                    or a.y - a.height >= b.y - 1e-6
+                    or b.y - b.height >= a.y - 1e-6
+                )
+                assert apart
+
+    def test_pack_puzzle_page_picks_largest_cells(self):
+        """Wide grids should stack, narrow grids should sit side by side."""
+        layout = PageLayout.compact(puzzles_per_page=2)
+        assert pack_puzzle_page(_refs((4, 20), (4, 20)), layout).columns == 1
+        assert pack_puzzle_page(_refs((20, 4), (20, 4)), layout).columns == 2
+
     def test_draw_puzzle_number(self, mock_canvas):
         """_draw_puzzle_number should center text above the grid."""
         config = RenderConfig()
@@ -1,9 +1,12 @@
 """Tests for grid rendering components."""
 
+import io
+
 import pytest
 from unittest.mock import MagicMock
 
 from reportlab.lib.colors import black, white
+from reportlab.pdfgen.canvas import Canvas
 from src.pdf_generation.renderer import (
     render_grid,
     _draw_black_cell,
@@ -38,7 +41,7 @@ class TestRenderer:
 
     def test_render_grid_dimensions(self, mock_canvas, simple_puzzle):
         """render_grid should return correct total dimensions."""
-        config = RenderConfig(cell_size=20)
+        config = RenderConfig(cell_size=20, font_name="Helvetica")
         width, height = render_grid(mock_canvas, simple_puzzle, 100, 500, config)
         assert width == 40  # 2 * 20
         assert height == 40  # 2 * 20
@@ -46,21 +49,21 @@ class TestRenderer:
 
     def test_draw_black_cell(self, mock_canvas):
         """_draw_black_cell should draw a filled black rectangle."""
-        config = RenderConfig(cell_size=20)
+        config = RenderConfig(cell_size=20, font_name="Helvetica")
         _draw_black_cell(mock_canvas, 10, 10, config)
         mock_canvas.rect.assert_called_with(10, 10, 20, 20, stroke=1, fill=1)
         mock_canvas.setFillColor.assert_called_with(black)
 
     def test_draw_white_cell_empty(self, mock_canvas):
         """_draw_white_cell should draw a filled white rectangle."""
-        config = RenderConfig(cell_size=20)
+        config = RenderConfig(cell_size=20, font_name="Helvetica")
         _draw_white_cell(mock_canvas, 10, 10, None, config)
         mock_canvas.rect.assert_called_with(10, 10, 20, 20, stroke=1, fill=1)
         mock_canvas.setFillColor.assert_any_call(white)
 
     def test_draw_white_cell_with_value(self, mock_canvas):
         """_draw_white_cell should draw a value if provided."""
-        config = RenderConfig(cell_size=20, show_solution=True)
+        config = RenderConfig(cell_size=20, font_name="Helvetica", show_solution=True)
         _draw_white_cell(mock_canvas, 10, 10, 5, config)
         mock_canvas.drawString.assert_called()
         # Verify black color set for text
@@ -68,7 +71,7 @@ class TestRenderer:
 
     def test_draw_clue_cell(self, mock_canvas):
         """_draw_clue_cell should draw a diagonal line and clue numbers."""
-        config = RenderConfig(cell_size=20)
+        config = RenderConfig(cell_size=20, font_name="Helvetica")
         _draw_clue_cell(mock_canvas, 10, 10, 5, 3, config)
         # Diagonal line
         mock_canvas.line.assert_called_with(10, 10 + 20, 10 + 20, 10)
@@ -88,3 +91,47 @@ class TestRenderer:
         clue = _get_vertical_clue(simple_puzzle, 0, 1)
         assert clue == 3
         assert _get_vertical_clue(simple_puzzle, 0, 0) is None
+
+    def test_render_mode_validated(self):
+        """RenderConfig should reject unknown render modes."""
+        with pytest.raises(ValueError):
+            RenderConfig(render_mode="sketch")
+
+    def test_forms_mode_places_shared_forms(self, mock_canvas, simple_puzzle):
+        """Forms mode should draw cells by placing forms, not rectangles."""
+        config = RenderConfig(cell_size=20, font_name="Helvetica", render_mode="forms")
+        render_grid(mock_canvas, simple_puzzle, 100, 500, config)
+
+        assert mock_canvas.doForm.call_count == 4
+        # Only the outer border is drawn as a rectangle
+        assert mock_canvas.rect.call_count == 1
+        # Clue (0, 1) has a down clue
+        mock_canvas.drawString.assert_called_once()
+
+    def test_forms_defined_once_per_document(self, simple_puzzle):
+        """Each cell form should be defined once and reused across grids."""
+        canvas = Canvas(io.BytesIO())
+        config = RenderConfig(cell_size=20, font_name="Helvetica", render_mode="forms")
+
+        render_grid(canvas, simple_puzzle, 100, 500, config)
+        render_grid(canvas, simple_puzzle, 100, 300, config)
+        canvas.save()
+
+        forms = [name for name in canvas._doc.idToObject if "FormXob" in name]
+        assert len(forms) == 3  # black, clue and white
+
+    def test_batched_mode_draws_shared_paths(self, mock_canvas, simple_puzzle):
+        """Batched mode should fill and stroke whole paths, not single cells."""
+        config = RenderConfig(
+            cell_size=20, font_name="Helvetica", render_mode="batched"
+        )
+        render_grid(mock_canvas, simple_puzzle, 100, 500, config)
+
+        # White, black and clue fills, the grid lattice and the diagonals
+        assert mock_canvas.drawPath.call_count == 5
+        # Only the outer border is drawn as a rectangle
+        assert mock_canvas.rect.call_count == 1
+        # All numbers go through one text object
+        mock_canvas.drawText.assert_called_once()
+        mock_canvas.drawString.assert_not_called()
+        mock_canvas.beginText.return_value.textOut.assert_called_once_with("3")
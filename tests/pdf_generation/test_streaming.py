@@ -0,0 +1,90 @@
+"""Tests for the streaming PDF document."""
+
+import re
+
+from pdfrw import PdfReader
+from reportlab.pdfgen.canvas import Canvas
+
+from src.pdf_generation import (
+    BookConfig,
+    PageLayout,
+    StreamingPDFDocument,
+)
+from src.pdf_generation import document
+from src.pdf_generation.document import join_pdfs
+
+
+def _write_pdf(path, title, labels):
+    """Write an uncompressed PDF with one labelled page per label."""
+    canvas = Canvas(str(path), pageCompression=0)
+    canvas.setTitle(title)
+    for label in labels:
+        canvas.drawString(72, 72, label)
+        canvas.showPage()
+    canvas.save()
+    return path
+
+
+class TestStreamingPDFDocument:
+    """Tests for StreamingPDFDocument."""
+
+    def test_pages_written_while_adding(self, tmp_path, sample_puzzle, monkeypatch):
+        """Full parts should reach the spool before save() is called."""
+        monkeypatch.setattr(document, "PAGES_PER_PART", 2)
+        config = BookConfig(include_solutions=False, layout=PageLayout.large_print())
+        doc = StreamingPDFDocument(tmp_path / "book.pdf", config, is_compliant=False)
+
+        doc.add_puzzles(sample_puzzle for _ in range(5))
+        spool = list(tmp_path.glob(".book-*"))[0]
+        saved = [part for part in spool.glob("part-*.pdf") if part.stat().st_size]
+        assert len(saved) == 2
+
+        result = doc.save()
+        assert len(PdfReader(str(result)).pages) == 5
+        assert not spool.exists()
+
+    def test_solutions_from_spool(self, tmp_path, sample_puzzles, monkeypatch):
+        """The solutions section should follow the puzzles, four to a page."""
+        monkeypatch.setattr(document, "PAGES_PER_PART", 2)
+        config = BookConfig(title="Streamed", author="Test Author")
+        doc = StreamingPDFDocument(tmp_path / "book.pdf", config, is_compliant=False)
+
+        doc.add_puzzles(iter(sample_puzzles + sample_puzzles[:1]))
+        result = doc.save()
+
+        # 3 puzzle pages, a section header and 2 solution pages
+        pdf = PdfReader(str(result))
+        assert len(pdf.pages) == 6
+        assert pdf.Info.Title == "(Streamed)"
+
+
+class TestJoinPdfs:
+    """Tests for join_pdfs function."""
+
+    def test_pages_and_info_kept(self, tmp_path):
+        """Pages keep their order and the first part's info is used."""
+        parts = [
+            _write_pdf(tmp_path / "a.pdf", "First", ["page 1", "page 2"]),
+            _write_pdf(tmp_path / "b.pdf", "Second", ["page 3"]),
+        ]
+
+        join_pdfs(parts, tmp_path / "joined.pdf")
+
+        pdf = PdfReader(str(tmp_path / "joined.pdf"))
+        labels = [page.Contents.stream for page in pdf.pages]
+        assert all(f"page {n}" in label for n, label in enumerate(labels, 1))
+        assert len(labels) == 3
+        assert pdf.Info.Title == "(First)"
+
+    def test_cross_reference_table(self, tmp_path):
+        """Every xref entry points at the header of its object."""
+        parts = [_write_pdf(tmp_path / f"{n}.pdf", "Book", [str(n)]) for n in range(3)]
+        join_pdfs(parts, tmp_path / "joined.pdf")
+
+        data = (tmp_path / "joined.pdf").read_bytes()
+        xref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+        table = data[xref:].split(b"trailer")[0].split(b"\r\n")[1:-1]
+        assert table
+        for number, entry in enumerate(table, 1):
+            offset = int(entry.split()[0])
+            assert data[offset:].startswith(f"{number} 0 obj".encode())
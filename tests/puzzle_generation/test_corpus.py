@@ -0,0 +1,154 @@
+"""Tests for the SQLite puzzle corpus."""
+
+import json
+
+import pytest
+
+from src.puzzle_generation.corpus import (
+    PuzzleCorpus,
+    decode_puzzle,
+    encode_puzzle,
+)
+from src.puzzle_generation.models import Grid, Puzzle
+from src.puzzle_generation.runs import compute_runs, compute_run_totals
+
+
+def _make_puzzle(cells):
+    """Build a puzzle with run totals from a solved grid."""
+    grid = Grid(height=len(cells), width=len(cells[0]), cells=cells)
+    h_runs, v_runs = compute_runs(grid)
+    compute_run_totals(grid, h_runs, v_runs)
+    return Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
+
+
+@pytest.fixture
+def unique_puzzle():
+    """A 2x2 block solved by logic alone."""
+    return _make_puzzle([[-1, -1, -1], [-1, 1, 2], [-1, 3, 4]])
+
+
+@pytest.fixture
+def ambiguous_puzzle():
+    """A 2x2 block with two solutions."""
+    return _make_puzzle([[-1, -1, -1], [-1, 9, 6], [-1, 1, 8]])
+
+
+@pytest.fixture
+def wide_puzzle():
+    """A 3x4 grid, to exercise the size index."""
+    return _make_puzzle([[-1, -1, -1, -1], [-1, 1, 2, 4], [-1, 3, 1, 2]])
+
+
+@pytest.fixture
+def corpus(unique_puzzle, ambiguous_puzzle, wide_puzzle):
+    """An in-memory corpus with three puzzles."""
+    corpus = PuzzleCorpus(":memory:")
+    corpus.add_puzzles([unique_puzzle, ambiguous_puzzle], difficulty="beginner")
+    corpus.add_puzzles([wide_puzzle], difficulty="expert")
+    yield corpus
+    corpus.close()
+
+
+class TestEncoding:
+    """Tests for the compact blob format."""
+
+    def test_round_trip(self, wide_puzzle):
+        """Decoding restores the grid and recomputes the clue totals."""
+        blob = encode_puzzle(wide_puzzle)
+        decoded = decode_puzzle(blob)
+
+        assert len(blob) == 2 + 3 * 4
+        assert decoded.to_dict() == wide_puzzle.to_dict()
+
+
+class TestPuzzleCorpus:
+    """Tests for PuzzleCorpus class."""
+
+    def test_duplicates_are_ignored(self, corpus, unique_puzzle):
+        """Inserting a stored puzzle again adds nothing."""
+        assert corpus.add_puzzles([unique_puzzle]) == 0
+        assert corpus.count() == 3
+
+    def test_indexed_columns(self, corpus):
+        """Score, technique profile and logic solvability are stored."""
+        entries = list(corpus.query(difficulty="beginner"))
+
+        assert [e.logic_solvable for e in entries] == [True, False]
+        assert entries[0].score == pytest.approx(1.0)
+        assert entries[0].techniques["combination"] == 4
+        assert entries[1].techniques["guess"] == 1
+
+    def test_query_filters(self, corpus):
+        """Queries filter by size, score and logic solvability."""
+        assert corpus.count(size=(3, 4)) == 1
+        assert corpus.count(logic_solvable=True) == 2
+        assert corpus.count(max_score=1.0) == 2
+        assert [e.difficulty for e in corpus.query(size=(3, 4))] == ["expert"]
+
+    def test_select_for_book_takes_unused_puzzles(self, corpus):
+        """Selected puzzles are recorded and not handed to another book."""
+        first = corpus.select_for_book("vol1", 1, difficulty="beginner")
+        second = corpus.select_for_book("vol2", 1, difficulty="beginner")
+
+        assert first[0].id != second[0].id
+        assert [e.id for e in corpus.query(book="vol1")] == [first[0].id]
+        with pytest.raises(ValueError):
+            corpus.select_for_book("vol3", 1, difficulty="beginner")
+
+    def test_summary(self, corpus):
+        """The summary groups puzzles by difficulty and size."""
+        summary = corpus.summary()
+
+        assert [
+            (g["difficulty"], g["count"], g["logic_solvable"]) for g in summary
+        ] == [
+            ("beginner", 2, 1),
+            ("expert", 1, 1),
+        ]
+
+    def test_import_json_and_journal(self, tmp_path, unique_puzzle, ambiguous_puzzle):
+        """Legacy list caches and JSONL journals are both imported."""
+        cache = tmp_path / "beginner_1_3.json"
+        cache.write_text(json.dumps([unique_puzzle.to_dict()]))
+        journal = tmp_path / "intermediate_3x3_abc.jsonl"
+        journal.write_text(
+            json.dumps({"spec": {}})
+            + "\n"
+            + json.dumps({"index": 0, "puzzle": ambiguous_puzzle.to_dict()})
+            + "\n"
+        )
+
+        with PuzzleCorpus(tmp_path / "corpus.db") as corpus:
+            assert corpus.import_json(cache) == 1
+            assert corpus.import_json(journal) == 1
+            assert corpus.count(difficulty="intermediate") == 1
+
+    def test_import_records_book(self, tmp_path, unique_puzzle, ambiguous_puzzle):
+        """Imported puzzles are listed for their book once, in file order."""
+        cache = tmp_path / "beginner_2_3.json"
+        cache.write_text(
+            json.dumps([ambiguous_puzzle.to_dict(), unique_puzzle.to_dict()])
+        )
+
+        with PuzzleCorpus(":memory:") as corpus:
+            corpus.add_puzzles([unique_puzzle])
+            assert corpus.import_json(cache, book="vol1") == 1
+            assert corpus.import_json(cache, book="vol1") == 0
+
+            listed = [e.puzzle.to_dict() for e in corpus.query(book="vol1")]
+            assert listed == [ambiguous_puzzle.to_dict(), unique_puzzle.to_dict()]
+            assert corpus.count() == 2
+            assert list(corpus.query(unused=True)) == []
+
+    def test_is_unique_column_renamed(self, tmp_path, unique_puzzle):
+        """Corpus files with the old is_unique column keep their values."""
+        path = tmp_path / "corpus.db"
+        with PuzzleCorpus(path) as corpus:
+            corpus.add_puzzles([unique_puzzle])
+            with corpus.conn:
+                corpus.conn.execute(
+                    "ALTER TABLE puzzles RENAME COLUMN logic_solvable TO is_unique"
+                )
+
+        with PuzzleCorpus(path) as corpus:
+            assert [e.logic_solvable for e in corpus.query()] == [True]
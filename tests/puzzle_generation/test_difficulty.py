@@ -0,0 +1,159 @@
+"""Tests for difficulty scoring and band-targeted generation."""
+
+import pytest
+
+from src.puzzle_generation.difficulty import (
+    DEFAULT_BANDS,
+    DifficultyBand,
+    DifficultyScore,
+    GenerationStats,
+    _LogicalScorer,
+    score_puzzle,
+)
+from src.puzzle_generation.generator import (
+    generate_puzzle_in_band,
+    PuzzleGenerationError,
+)
+from src.puzzle_generation.models import Grid, Puzzle
+from src.puzzle_generation.runs import compute_runs, compute_run_totals
+
+
+def _make_puzzle(cells):
+    """Build a puzzle with run totals from a solved grid."""
+    grid = Grid(height=len(cells), width=len(cells[0]), cells=cells)
+    h_runs, v_runs = compute_runs(grid)
+    compute_run_totals(grid, h_runs, v_runs)
+    return Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
+
+
+@pytest.fixture
+def unique_puzzle():
+    """A 2x2 block that logic alone solves (3 = 1+2, 4 = 1+3)."""
+    return _make_puzzle([[-1, -1, -1], [-1, 1, 2], [-1, 3, 4]])
+
+
+@pytest.fixture
+def ambiguous_puzzle():
+    """A 2x2 block with two solutions (9,6/1,8 and 7,8/3,6)."""
+    return _make_puzzle([[-1, -1, -1], [-1, 9, 6], [-1, 1, 8]])
+
+
+class TestScorePuzzle:
+    """Tests for score_puzzle function."""
+
+    def test_logic_only_puzzle_scores_minimum(self, unique_puzzle):
+        """A puzzle solved by combinations alone scores 1.0."""
+        result = score_puzzle(unique_puzzle)
+
+        assert result.score == pytest.approx(1.0)
+        assert not result.requires_guessing
+        assert result.is_logically_unique
+        assert result.techniques["combination"] == 4
+
+    def test_ambiguous_puzzle_requires_guessing(self, ambiguous_puzzle):
+        """A puzzle with two solutions needs a guess and scores higher."""
+        result = score_puzzle(ambiguous_puzzle)
+
+        assert result.requires_guessing
+        assert not result.is_logically_unique
+        assert result.techniques["guess"] == 1
+        assert result.score == pytest.approx((10.0 + 3 * 1.0) / 4)
+
+    def test_band_without_guessing_aborts_early(self, ambiguous_puzzle):
+        """Scoring stops once a guess is needed and the band forbids it."""
+        band = DifficultyBand("strict", 1.0, 10.0, allow_guessing=False)
+        result = score_puzzle(ambiguous_puzzle, band)
+
+        assert result.aborted
+        assert not band.contains(result)
+
+    def test_band_too_easy_aborts(self, unique_puzzle):
+        """Scoring stops once the score can no longer reach the band minimum."""
+        band = DifficultyBand("hard", 5.0, 10.0, allow_guessing=False)
+        result = score_puzzle(unique_puzzle, band)
+
+        assert result.aborted
+
+    def test_band_contains(self):
+        """Band membership respects bounds and guessing policy."""
+        band = DifficultyBand("mid", 2.0, 4.0, allow_guessing=False)
+
+        assert band.contains(DifficultyScore(score=3.0))
+        assert not band.contains(DifficultyScore(score=5.0))
+        assert not band.contains(DifficultyScore(score=3.0, requires_guessing=True))
+        assert not band.contains(DifficultyScore(score=3.0, aborted=True))
+
+    def test_exhausted_runs_tracked_per_run(self, unique_puzzle):
+        """A run is memoized as exhausted even after another run progressed."""
+        scorer = _LogicalScorer(unique_puzzle, None)
+        first, second = scorer.runs[0][0], scorer.runs[1][0]
+        # The first row (1+2) can still be narrowed; the second (3+4) cannot
+        for idx in second:
+            scorer.cand[idx] = 1 << 3 | 1 << 4
+        masks = tuple(scorer.cand[idx] for idx in second)
+
+        assert scorer._apply_permutations()
+        assert (second, masks) in scorer._exhausted
+        assert all(key[0] != first for key in scorer._exhausted)
+
+
+class TestGenerationStats:
+    """Tests for GenerationStats."""
+
+    def test_rates(self):
+        """Acceptance rate and time per accepted puzzle are derived."""
+        stats = GenerationStats(candidates=8, accepted=2, aborted=5, elapsed=3.0)
+
+        assert stats.acceptance_rate == pytest.approx(0.25)
+        assert stats.seconds_per_accepted == pytest.approx(1.5)
+        assert stats.to_dict()["acceptance_rate"] == pytest.approx(0.25)
+
+    def test_empty_stats(self):
+        """Empty statistics report no rate instead of dividing by zero."""
+        stats = GenerationStats()
+
+        assert stats.acceptance_rate == 0.0
+        assert stats.seconds_per_accepted is None
+
+
+class TestGeneratePuzzleInBand:
+    """Tests for generate_puzzle_in_band function."""
+
+    def test_accepts_puzzle_within_band(self):
+        """A wide band accepts a candidate and records statistics."""
+        band = DifficultyBand("any", 0.0, 10.0, black_density=0.3)
+        stats = GenerationStats()
+
+        puzzle = generate_puzzle_in_band(6, 6, band, seed=42, stats=stats)
+
+        assert isinstance(puzzle, Puzzle)
+        assert band.contains(score_puzzle(puzzle))
+        assert stats.accepted == 1
+        assert stats.candidates >= 1
+        assert stats.elapsed > 0
+
+    def test_unreachable_band_raises(self):
+        """A band no candidate can reach exhausts the attempts."""
+        band = DifficultyBand("impossible", 20.0, 30.0, black_density=0.3)
+        stats = GenerationStats()
+
+        with pytest.raises(PuzzleGenerationError, match="impossible band"):
+            generate_puzzle_in_band(6, 6, band, seed=1, max_attempts=5, stats=stats)
+        assert stats.accepted == 0
+        assert stats.aborted == stats.candidates
+
+    @pytest.mark.parametrize(
+        "difficulty,size", [("beginner", 6), ("intermediate", 9), ("expert", 12)]
+    )
+    def test_default_bands_reachable(self, difficulty, size):
+        """Most candidates of a level's smallest size land in its default band."""
+        band = DEFAULT_BANDS[difficulty]
+        stats = GenerationStats()
+
+        for seed in range(8):
+            puzzle = generate_puzzle_in_band(
+                size, size, band, seed=seed, max_attempts=20, stats=stats
+            )
+            assert band.contains(score_puzzle(puzzle))
+
+        assert stats.acceptance_rate >= 0.5
@@ -0,0 +1,169 @@
+"""Tests for canonical puzzle fingerprints and the duplicate index."""
+
+import json
+
+import pytest
+
+from src.puzzle_generation.fingerprint import DuplicateIndex, puzzle_fingerprint
+from src.puzzle_generation.models import Grid, Puzzle
+from src.puzzle_generation.runs import compute_runs, compute_run_totals
+from src.puzzle_generation.store import PuzzleStore
+from src.puzzle_generation.stream import (
+    GenerationSpec,
+    iter_puzzles,
+    journal_occurrence,
+)
+
+
+def _make_puzzle(cells):
+    """Build a puzzle with run totals from a solved grid."""
+    grid = Grid(height=len(cells), width=len(cells[0]), cells=cells)
+    h_runs, v_runs = compute_runs(grid)
+    compute_run_totals(grid, h_runs, v_runs)
+    return Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
+
+
+CELLS = [[-1, -1, -1, -1], [-1, 1, 2, 4], [-1, 3, 1, 2]]
+
+
+@pytest.fixture
+def spec():
+    """A small seeded single-size spec."""
+    return GenerationSpec(
+        difficulty="beginner",
+        count=2,
+        grid_sizes=(5,),
+        black_density=0.3,
+        seed=3,
+    )
+
+
+class TestPuzzleFingerprint:
+    """Tests for puzzle_fingerprint function."""
+
+    def test_transpose_shares_fingerprint(self):
+        """A grid and its transpose are the same puzzle."""
+        transposed = [list(col) for col in zip(*CELLS)]
+
+        assert puzzle_fingerprint(_make_puzzle(CELLS)) == puzzle_fingerprint(
+            _make_puzzle(transposed)
+        )
+
+    def test_different_clues_differ(self):
+        """Changing a clue total changes the fingerprint."""
+        other = [[-1, -1, -1, -1], [-1, 1, 2, 5], [-1, 3, 1, 2]]
+
+        assert puzzle_fingerprint(_make_puzzle(CELLS)) != puzzle_fingerprint(
+            _make_puzzle(other)
+        )
+
+    def test_same_clues_with_other_solution_match(self):
+        """Fingerprints cover layout and clues, not the solution digits."""
+        first = _make_puzzle([[-1, -1, -1], [-1, 9, 6], [-1, 1, 8]])
+        second = _make_puzzle([[-1, -1, -1], [-1, 7, 8], [-1, 3, 6]])
+
+        assert first.fingerprint() == second.fingerprint()
+
+
+class TestDuplicateIndex:
+    """Tests for DuplicateIndex class."""
+
+    def test_add_rejects_duplicates(self):
+        """Adding a puzzle or its transpose twice is rejected."""
+        index = DuplicateIndex()
+        transposed = [list(col) for col in zip(*CELLS)]
+
+        assert index.add(_make_puzzle(CELLS))
+        assert not index.add(_make_puzzle(transposed))
+        assert _make_puzzle(CELLS) in index
+        assert len(index) == 1
+
+    def test_index_persists(self, tmp_path):
+        """Fingerprints survive reopening the index file."""
+        path = tmp_path / "index.db"
+        with DuplicateIndex(path) as index:
+            index.add(_make_puzzle(CELLS))
+
+        with DuplicateIndex(path) as index:
+            assert _make_puzzle(CELLS) in index
+
+    def test_cross_book_audit(self):
+        """Audits group occurrences of a puzzle shared between books."""
+        index = DuplicateIndex()
+        index.record([_make_puzzle(CELLS)], book="vol1", source="a.json")
+        index.record([_make_puzzle(CELLS)], book="vol1", source="b.json")
+
+        assert index.duplicates(cross_book_only=True) == []
+        index.record([_make_puzzle(CELLS)], book="vol2", source="c.json")
+
+        groups = index.duplicates(cross_book_only=True)
+        assert len(groups) == 1
+        assert [book for book, _ in groups[0].occurrences] == ["vol1", "vol1", "vol2"]
+
+    def test_claim_accepts_same_occurrence(self):
+        """An occurrence can claim its puzzle again; others cannot."""
+        index = DuplicateIndex()
+        puzzle = _make_puzzle(CELLS)
+
+        assert index.claim(puzzle, "vol1", "a.jsonl@10")
+        assert index.claim(puzzle, "vol1", "a.jsonl@10")
+        assert not index.claim(puzzle, "vol2", "a.jsonl@10")
+        assert not index.accepts(puzzle, "vol1", "a.jsonl@99")
+        assert len(index.duplicates()) == 0
+
+    def test_release_frees_a_books_puzzles(self, tmp_path):
+        """Released puzzles can be claimed by another book."""
+        puzzle = _make_puzzle(CELLS)
+        with DuplicateIndex(tmp_path / "index.db") as index:
+            index.claim(puzzle, "vol1", "a.jsonl@10")
+            assert index.books() == {"vol1"}
+
+            assert index.release("vol1") == 1
+
+            assert index.books() == set()
+            assert index.claim(puzzle, "vol2", "b.jsonl@10")
+        with DuplicateIndex(tmp_path / "index.db") as reopened:
+            assert not reopened.accepts(puzzle, "vol1", "a.jsonl@10")
+
+    def test_generation_skips_indexed_puzzles(self, spec):
+        """A stream rejects puzzles that the index already holds."""
+        index = DuplicateIndex()
+        first = list(iter_puzzles(spec, duplicates=index))
+
+        again = list(iter_puzzles(spec, duplicates=index))
+
+        assert len(first) == 2
+        assert again == []
+
+    def test_resumed_journal_is_not_its_own_duplicate(self, spec, tmp_path):
+        """A position indexed before its journal entry was written is reused."""
+        journal = tmp_path / "puzzles.jsonl"
+        expected = list(iter_puzzles(spec))
+        header = json.dumps({"spec": spec.to_dict()}) + "\n"
+        index = DuplicateIndex()
+        # As left by a crash between indexing a puzzle and journaling it
+        index.claim(expected[0], "vol1", journal_occurrence(journal, len(header)))
+        journal.write_text(header)
+
+        puzzles = list(iter_puzzles(spec, journal, duplicates=index, book="vol1"))
+
+        assert [p.to_dict() for p in puzzles] == [p.to_dict() for p in expected]
+
+    def test_stored_puzzles_checked_across_books(self, spec, tmp_path):
+        """Puzzles already stored for one book are replaced in another."""
+        index = DuplicateIndex(tmp_path / "index.db")
+        first = PuzzleStore(tmp_path / "vol1")
+        second = PuzzleStore(tmp_path / "vol2")
+        # Both books stored the same seeded puzzles before sharing an index
+        second.take(spec, 2)
+
+        kept = first.take(spec, 2, duplicates=index, book="vol1")
+        replaced = second.take(spec, 2, duplicates=index, book="vol2")
+
+        kept_keys = {p.fingerprint() for p in kept}
+        assert len(replaced) == 2
+        assert kept_keys.isdisjoint(p.fingerprint() for p in replaced)
+        again = first.take(spec, 2, duplicates=index, book="vol1")
+        assert [p.to_dict() for p in again] == [p.to_dict() for p in kept]
+        with DuplicateIndex(tmp_path / "index.db") as reopened:
+            assert reopened.duplicates() == []
@@ -1,7 +1,7 @@
 """Tests for puzzle generation data models."""
 
 import pytest
-from src.puzzle_generation.models import Grid, Run, Puzzle, Direction
+from src.puzzle_generation.models import CompactGrid, Grid, Run, Puzzle, Direction
 
 
 class TestGrid:
@@ -103,6 +103,74 @@ class TestRun:
         assert "len=3" in s
         assert "sum=15" in s
 
+    def test_cells_cached(self):
+        """Test cell coordinates are built once and reused."""
+        run = Run(row=1, col=1, length=3, total=6, direction=Direction.VERTICAL)
+
+        assert run.cells == ((1, 1), (2, 1), (3, 1))
+        assert run.cells is run.cells
+        assert run.get_cells() == list(run.cells)
+
+    def test_cell_indices(self):
+        """Test flat row-major indices of run cells."""
+        run = Run(row=1, col=2, length=2, total=3, direction=Direction.HORIZONTAL)
+
+        assert run.cell_indices(5) == (7, 8)
+        assert run.cell_indices(4) == (6, 7)
+
+    def test_run_has_no_instance_dict(self):
+        """Test runs use slots instead of a per-instance __dict__."""
+        run = Run(row=0, col=0, length=1, total=1, direction=Direction.HORIZONTAL)
+
+        assert not hasattr(run, "__dict__")
+
+
+class TestCompactGrid:
+    """Tests for CompactGrid class."""
+
+    def test_from_grid_round_trip(self):
+        """Test packing and unpacking preserves every cell."""
+        grid = Grid(height=2, width=3, cells=[[-1, 5, 0], [-1, 9, 1]])
+        compact = CompactGrid.from_grid(grid)
+
+        assert compact.get_cell(1, 1) == 9
+        assert compact.is_black(0, 0)
+        assert compact.is_empty(0, 2)
+        assert compact.to_grid() == grid
+        assert compact == grid
+
+    def test_set_cell_and_copy(self):
+        """Test writes go to the flat array and copies are independent."""
+        compact = CompactGrid(2, 2)
+        compact.set_cell(1, 0, 7)
+        clone = compact.copy()
+        clone.set_cell(1, 0, 3)
+
+        assert compact.data[compact.index(1, 0)] == 7
+        assert clone.get_cell(1, 0) == 3
+
+    def test_row_view_is_zero_copy(self):
+        """Test row views share memory with the grid."""
+        compact = CompactGrid(2, 2)
+        view = compact.row_view(1)
+        view[1] = 4
+
+        assert compact.get_cell(1, 1) == 4
+
+    def test_from_buffer_wraps_bytes(self):
+        """Test wrapping an existing buffer without copying."""
+        buffer = bytearray([255, 1, 2, 3])
+        compact = CompactGrid.from_buffer(2, 2, buffer)
+        buffer[3] = 8
+
+        assert compact.is_black(0, 0)
+        assert compact.get_cell(1, 1) == 8
+
+    def test_size_mismatch(self):
+        """Test the buffer must hold exactly height * width cells."""
+        with pytest.raises(ValueError):
+            CompactGrid.from_buffer(2, 2, bytes(3))
+
 
 class TestPuzzle:
     """Tests for Puzzle class."""
@@ -167,3 +235,34 @@ class TestPuzzle:
         assert restored.grid.cells == original.grid.cells
         assert len(restored.horizontal_runs) == len(original.horizontal_runs)
         assert restored.horizontal_runs[0].total == original.horizontal_runs[0].total
+
+    def test_compact_round_trip(self):
+        """Test a compact puzzle serializes like the list-based one."""
+        cells = [[-1, -1, -1], [-1, 1, 2], [-1, 3, 4]]
+        grid = Grid(height=3, width=3, cells=cells)
+        h_runs = [Run(1, 1, 2, 3, Direction.HORIZONTAL)]
+        v_runs = [Run(1, 1, 2, 4, Direction.VERTICAL)]
+        original = Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
+
+        compact = original.compact()
+        restored = Puzzle.from_dict(original.to_dict(), compact=True)
+
+        assert isinstance(compact.grid, CompactGrid)
+        assert compact.to_dict() == original.to_dict()
+        assert isinstance(restored.grid, CompactGrid)
+        assert restored.to_dict() == original.to_dict()
+
+    def test_layout_is_cached(self):
+        """Test the run layout is built once and ignored by equality."""
+        cells = [[-1, -1, -1], [-1, 1, 2], [-1, 3, 4]]
+        grid = Grid(height=3, width=3, cells=cells)
+        h_runs = [Run(1, 1, 2, 3, Direction.HORIZONTAL)]
+        v_runs = [Run(1, 1, 2, 4, Direction.VERTICAL)]
+        puzzle = Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
+
+        layout = puzzle.layout
+
+        assert puzzle.layout is layout
+        assert layout.across_run(1, 2) is h_runs[0]
+        assert layout.clues(0, 1) == (None, 4)
+        assert puzzle == Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
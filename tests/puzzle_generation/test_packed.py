@@ -0,0 +1,100 @@
+"""Tests for the packed binary puzzle format."""
+
+import json
+
+import pytest
+
+from src.puzzle_generation.models import CompactGrid, Grid, Puzzle
+from src.puzzle_generation.packed import (
+    PackedFormatError,
+    PackedPuzzleFile,
+    PackedWriter,
+    encode_record,
+    json_to_packed,
+    packed_to_json,
+    write_packed,
+)
+from src.puzzle_generation.runs import compute_runs, compute_run_totals
+
+
+def _make_puzzle(cells):
+    """Build a puzzle with run totals from a solved grid."""
+    grid = Grid(height=len(cells), width=len(cells[0]), cells=cells)
+    h_runs, v_runs = compute_runs(grid)
+    compute_run_totals(grid, h_runs, v_runs)
+    return Puzzle(grid=grid, horizontal_runs=h_runs, vertical_runs=v_runs)
+
+
+@pytest.fixture
+def puzzles():
+    """Puzzles of different sizes and white cell parity."""
+    return [
+        _make_puzzle([[-1, -1, -1], [-1, 1, 2], [-1, 3, 4]]),
+        _make_puzzle([[-1, -1, -1, -1], [-1, 9, 8, 7], [-1, 1, -1, -1]]),
+        _make_puzzle([[-1, -1], [-1, 5]]),
+    ]
+
+
+class TestPackedFormat:
+    """Tests for writing and reading packed files."""
+
+    def test_record_size(self, puzzles):
+        """A record is a bitmap plus one nibble per white cell."""
+        record = encode_record(puzzles[1])
+
+        # 12 cells -> 2 bitmap bytes, 4 white cells -> 2 digit bytes
+        assert len(record) == 4
+
+    def test_round_trip(self, puzzles, tmp_path):
+        """Every puzzle reads back with identical grid and clues."""
+        path = tmp_path / "puzzles.kkpz"
+        assert write_packed(path, puzzles) == 3
+
+        with PackedPuzzleFile(path) as packed:
+            assert len(packed) == 3
+            assert [p.to_dict() for p in packed] == [p.to_dict() for p in puzzles]
+
+    def test_incremental_writer(self, puzzles, tmp_path):
+        """PackedWriter writes the same file as write_packed, one puzzle at a time."""
+        path = tmp_path / "incremental.kkpz"
+        with PackedWriter(path) as writer:
+            for puzzle in puzzles:
+                writer.add(puzzle)
+            assert writer.count == 3
+
+        write_packed(tmp_path / "batch.kkpz", puzzles)
+        assert path.read_bytes() == (tmp_path / "batch.kkpz").read_bytes()
+
+    def test_random_access(self, puzzles, tmp_path):
+        """Puzzles are decoded on demand by position."""
+        path = tmp_path / "puzzles.kkpz"
+        write_packed(path, puzzles)
+
+        with PackedPuzzleFile(path, compact=True) as packed:
+            last = packed[-1]
+            middle = packed[1]
+
+            assert isinstance(last.grid, CompactGrid)
+            assert last.to_dict() == puzzles[2].to_dict()
+            assert middle.to_dict() == puzzles[1].to_dict()
+            with pytest.raises(IndexError):
+                packed[3]
+
+    def test_rejects_other_files(self, tmp_path):
+        """Files without the packed header are refused."""
+        path = tmp_path / "not_packed.kkpz"
+        path.write_bytes(b"{" * 64)
+
+        with pytest.raises(PackedFormatError):
+            PackedPuzzleFile(path)
+
+    def test_json_converters(self, puzzles, tmp_path):
+        """JSON caches convert to a packed file and back."""
+        cache = tmp_path / "beginner_3_3.json"
+        cache.write_text(json.dumps([p.to_dict() for p in puzzles]))
+        packed = tmp_path / "puzzles.kkpz"
+        output = tmp_path / "restored.json"
+
+        assert json_to_packed([cache], packed) == 3
+        assert packed_to_json(packed, output) == 3
+        assert json.loads(output.read_text()) == json.loads(cache.read_text())
@@ -0,0 +1,76 @@
+"""Tests for lazy puzzle references."""
+
+import pytest
+
+from src.puzzle_generation.models import CompactGrid
+from src.puzzle_generation.refs import (
+    iter_journal_refs,
+    load_puzzle,
+    puzzle_digest,
+    puzzle_size,
+    read_puzzle,
+    resolve_puzzle,
+)
+from src.puzzle_generation.store import PuzzleStore
+from src.puzzle_generation.stream import GenerationSpec
+
+
+@pytest.fixture
+def spec():
+    """A small seeded single-size spec."""
+    return GenerationSpec(
+        difficulty="beginner",
+        count=0,
+        grid_sizes=(5,),
+        black_density=0.3,
+        seed=11,
+    )
+
+
+class TestPuzzleRefs:
+    """Tests for PuzzleRef and its loaders."""
+
+    def test_refs_match_stored_puzzles(self, spec, tmp_path):
+        """References load the same puzzles the store hands out."""
+        store = PuzzleStore(tmp_path)
+        puzzles = store.take(spec, 3)
+
+        refs = store.take_refs(spec, 3)
+
+        assert [read_puzzle(ref).to_dict() for ref in refs] == [
+            p.to_dict() for p in puzzles
+        ]
+        assert refs == list(iter_journal_refs(store.stream_path(spec)))
+
+    def test_size_known_without_loading(self, spec, tmp_path):
+        """A reference carries its grid size."""
+        store = PuzzleStore(tmp_path)
+        ref = store.take_refs(spec, 1)[0]
+
+        assert puzzle_size(ref) == (ref.height, ref.width)
+        assert (ref.height, ref.width) == (
+            read_puzzle(ref).grid.height,
+            read_puzzle(ref).grid.width,
+        )
+
+    def test_load_is_cached_and_compact(self, spec, tmp_path):
+        """Loading through the cache returns one shared compact puzzle."""
+        store = PuzzleStore(tmp_path)
+        ref = store.take_refs(spec, 1, start=1)[0]
+
+        puzzle = ref.load()
+
+        assert isinstance(puzzle.grid, CompactGrid)
+        assert load_puzzle(ref) is puzzle
+        assert resolve_puzzle(ref) is puzzle
+        assert resolve_puzzle(puzzle) is puzzle
+
+    def test_digest_tracks_content(self, spec, tmp_path):
+        """Digests are stable per puzzle and differ between puzzles."""
+        store = PuzzleStore(tmp_path)
+        first, second = store.take_refs(spec, 2)
+
+        assert puzzle_digest(first) == puzzle_digest(first)
+        assert puzzle_digest(first) != puzzle_digest(second)
+        puzzle = read_puzzle(first)
+        assert puzzle_digest(puzzle) == puzzle_digest(read_puzzle(first))
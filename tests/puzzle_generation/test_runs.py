@@ -1,7 +1,8 @@
 """Tests for run computation module."""
 
-from src.puzzle_generation.models import Grid, Direction
+from src.puzzle_generation.models import CompactGrid, Direction, Grid, Run
 from src.puzzle_generation.runs import (
+    extract_runs,
     compute_runs,
     compute_horizontal_runs,
     compute_vertical_runs,
@@ -186,3 +187,67 @@ class TestComputeRunTotals:
         assert len(h_runs) == 2
         assert h_runs[0].total == 6  # 1 + 2 + 3
         assert h_runs[1].total == 15  # 4 + 5 + 6
+
+
+class TestExtractRuns:
+    """Tests for single-pass run extraction and its lookups."""
+
+    def test_matches_compute_runs(self, sample_grid_9x9):
+        """Extraction finds the same runs, in the same order."""
+        grid = Grid(height=9, width=9, cells=sample_grid_9x9)
+        layout = extract_runs(grid)
+        h_runs, v_runs = compute_runs(grid)
+
+        assert layout.horizontal_runs == h_runs
+        assert layout.vertical_runs == v_runs
+        assert [(r.col, r.row) for r in v_runs] == sorted(
+            (r.col, r.row) for r in v_runs
+        )
+
+    def test_cell_lookups(self, sample_grid_5x5):
+        """Each white cell maps to the runs through it."""
+        grid = Grid(height=5, width=5, cells=sample_grid_5x5)
+        layout = extract_runs(grid)
+
+        assert layout.across_run(1, 2) == Run(1, 1, 2, 0, Direction.HORIZONTAL)
+        assert layout.down_run(2, 4) == Run(1, 4, 4, 0, Direction.VERTICAL)
+        assert layout.across_run(1, 4) is None  # single-cell segment
+        assert layout.across[0] == layout.down[0] == -1
+
+    def test_filled_cells_leave_totals_unset(self):
+        """Extraction ignores cell values; totals stay 0 until computed."""
+        cells = [
+            [-1, -1, -1],
+            [-1, 1, 0],
+            [-1, 0, 4],
+        ]
+        grid = Grid(height=3, width=3, cells=cells)
+        layout = extract_runs(grid)
+
+        assert all(r.total == 0 for r in layout.horizontal_runs)
+        assert all(r.total == 0 for r in layout.vertical_runs)
+
+    def test_totals_and_clues_from_solved_grid(self):
+        """Computed totals are placed as clues."""
+        cells = [
+            [-1, -1, -1],
+            [-1, 1, 2],
+            [-1, 3, 4],
+        ]
+        grid = Grid(height=3, width=3, cells=cells)
+        layout = extract_runs(grid)
+        compute_run_totals(grid, layout.horizontal_runs, layout.vertical_runs)
+
+        assert [r.total for r in layout.horizontal_runs] == [3, 7]
+        assert [r.total for r in layout.vertical_runs] == [4, 6]
+        assert layout.clues(1, 0) == (3, None)
+        assert layout.clues(0, 2) == (None, 6)
+        assert layout.clues(0, 0) == (None, None)
+
+    def test_compact_grid(self, sample_grid_9x9):
+        """A CompactGrid gives the same layout as a list grid."""
+        grid = Grid(height=9, width=9, cells=sample_grid_9x9)
+        compact = CompactGrid.from_grid(grid)
+
+        assert extract_runs(compact).across == extract_runs(grid).across
+        assert extract_runs(compact).down == extract_runs(grid).down
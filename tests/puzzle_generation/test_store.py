@@ -0,0 +1,136 @@
+"""Tests for the content-addressed puzzle store."""
+
+import json
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+from src.puzzle_generation import store as store_module
+from src.puzzle_generation.models import Puzzle
+from src.puzzle_generation.store import PuzzleStore
+from src.puzzle_generation.stream import GenerationSpec, iter_puzzles
+
+
+@pytest.fixture
+def spec():
+    """A small seeded single-size spec."""
+    return GenerationSpec(
+        difficulty="beginner",
+        count=0,
+        grid_sizes=(5,),
+        black_density=0.3,
+        seed=7,
+    )
+
+
+class TestPuzzleStore:
+    """Tests for PuzzleStore class."""
+
+    def test_key_ignores_count(self, spec):
+        """Streams are addressed by what they contain, not how many."""
+        assert PuzzleStore.stream_key(spec) == PuzzleStore.stream_key(
+            replace(spec, count=30)
+        )
+
+    def test_key_depends_on_generation_inputs(self, spec):
+        """Size, density and seed stream select different streams."""
+        key = PuzzleStore.stream_key(spec)
+
+        assert key != PuzzleStore.stream_key(replace(spec, grid_sizes=(6,)))
+        assert key != PuzzleStore.stream_key(replace(spec, black_density=0.2))
+        assert key != PuzzleStore.stream_key(replace(spec, seed=8))
+        assert key != PuzzleStore.stream_key(replace(spec, stream="Warm-up"))
+
+    def test_unnamed_stream_header_unchanged(self, spec):
+        """Journals written before streams had names still match."""
+        assert "stream" not in spec.to_dict()
+        assert replace(spec, stream="Warm-up").to_dict()["stream"] == "Warm-up"
+
+    def test_multi_size_spec_rejected(self, spec):
+        """A stream holds a single grid size."""
+        with pytest.raises(ValueError):
+            PuzzleStore.stream_key(replace(spec, grid_sizes=(5, 6)))
+
+    def test_growing_count_keeps_existing_puzzles(self, spec, tmp_path):
+        """Taking more puzzles reuses the stored ones and appends the rest."""
+        store = PuzzleStore(tmp_path)
+
+        first = store.take(spec, 2)
+        grown = store.take(spec, 4)
+
+        assert [p.to_dict() for p in grown[:2]] == [p.to_dict() for p in first]
+        assert len(grown) == 4
+        assert len(list(tmp_path.glob("*.jsonl"))) == 1
+
+    def test_take_with_start_offset(self, spec, tmp_path):
+        """Consecutive takes hand out disjoint puzzles."""
+        store = PuzzleStore(tmp_path)
+
+        all_puzzles = store.take(spec, 3)
+        tail = store.take(spec, 2, start=1)
+
+        assert [p.to_dict() for p in tail] == [p.to_dict() for p in all_puzzles[1:]]
+
+    def test_shrinking_count_keeps_stream(self, spec, tmp_path):
+        """Taking fewer puzzles does not truncate the stored stream."""
+        store = PuzzleStore(tmp_path)
+        store.take(spec, 3)
+
+        store.take(spec, 1)
+
+        path = store.stream_path(spec)
+        assert len(list(iter_puzzles(replace(spec, count=3), path))) == 3
+
+    def test_stored_stream_not_decoded(self, spec, tmp_path):
+        """Taking from a stream that holds enough puzzles generates nothing."""
+        store = PuzzleStore(tmp_path)
+        refs = store.take_refs(spec, 3)
+
+        with (
+            patch.object(store_module, "iter_puzzles") as mock_iter,
+            patch.object(Puzzle, "from_dict") as mock_decode,
+        ):
+            again = store.take_refs(spec, 2, start=1)
+
+        mock_iter.assert_not_called()
+        mock_decode.assert_not_called()
+        assert again == refs[1:]
+
+    def test_import_legacy_cache(self, spec, tmp_path):
+        """A count-keyed cache is split into per-size streams in order."""
+        six = replace(spec, grid_sizes=(6,))
+        puzzles = [
+            p
+            for pair in zip(
+                iter_puzzles(replace(spec, count=2)),
+                iter_puzzles(replace(six, count=2)),
+            )
+            for p in pair
+        ]
+        cache_file = tmp_path / "beginner_4_5_6.json"
+        cache_file.write_text(json.dumps([p.to_dict() for p in puzzles]))
+        store = PuzzleStore(tmp_path / "store")
+
+        imported = store.import_legacy_cache(
+            cache_file, replace(spec, grid_sizes=(5, 6))
+        )
+
+        assert imported == 4
+        assert [p.to_dict() for p in store.take(six, 2)] == [
+            puzzles[1].to_dict(),
+            puzzles[3].to_dict(),
+        ]
+
+    def test_legacy_cache_not_read_once_imported(self, spec, tmp_path):
+        """A cache whose streams exist is skipped without being parsed."""
+        cache_file = tmp_path / "beginner_2_5.json"
+        puzzles = list(iter_puzzles(replace(spec, count=2)))
+        cache_file.write_text(json.dumps([p.to_dict() for p in puzzles]))
+        store = PuzzleStore(tmp_path / "store")
+        assert store.import_legacy_cache(cache_file, spec) == 2
+
+        with patch.object(store_module.json, "load") as mock_load:
+            assert store.import_legacy_cache(cache_file, spec) == 0
+
+        mock_load.assert_not_called()
@@ -0,0 +1,142 @@
+"""Tests for streaming puzzle generation with a journal."""
+
+import json
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+from src.puzzle_generation.models import Puzzle
+from src.puzzle_generation import stream
+from src.puzzle_generation.stream import (
+    GenerationSpec,
+    JournalMismatchError,
+    iter_puzzles,
+)
+
+
+@pytest.fixture
+def spec():
+    """A small seeded spec that generates quickly."""
+    return GenerationSpec(
+        difficulty="beginner",
+        count=3,
+        grid_sizes=(5, 6),
+        black_density=0.3,
+        seed=100,
+    )
+
+
+class TestGenerationSpec:
+    """Tests for GenerationSpec."""
+
+    def test_sizes_and_seeds_per_index(self, spec):
+        """Sizes rotate through grid_sizes and seeds are offset by index."""
+        assert [spec.size_for(i) for i in range(3)] == [5, 6, 5]
+        assert [spec.seed_for(i) for i in range(3)] == [100, 101, 102]
+
+    def test_unseeded_spec(self):
+        """Without a base seed every position is unseeded."""
+        spec = GenerationSpec(difficulty="beginner", count=2, grid_sizes=(5,))
+
+        assert spec.seed_for(1) is None
+
+
+class TestIterPuzzles:
+    """Tests for iter_puzzles function."""
+
+    def test_yields_puzzles_without_journal(self, spec):
+        """Puzzles are yielded one at a time."""
+        puzzles = list(iter_puzzles(spec))
+
+        assert len(puzzles) == 3
+        assert all(isinstance(p, Puzzle) for p in puzzles)
+
+    def test_journal_written_as_puzzles_are_yielded(self, spec, tmp_path):
+        """Each puzzle is on disk before the next one is generated."""
+        journal = tmp_path / "puzzles.jsonl"
+        stream = iter_puzzles(spec, journal)
+
+        first = next(stream)
+        lines = journal.read_text().splitlines()
+
+        assert len(lines) == 2
+        assert json.loads(lines[0])["spec"] == spec.to_dict()
+        assert json.loads(lines[1])["puzzle"] == first.to_dict()
+        stream.close()
+
+    def test_resume_after_interruption(self, spec, tmp_path):
+        """A rerun yields journaled puzzles and only generates the rest."""
+        journal = tmp_path / "puzzles.jsonl"
+        stream = iter_puzzles(spec, journal)
+        first = next(stream)
+        stream.close()
+
+        resumed = list(iter_puzzles(spec, journal))
+        full = list(iter_puzzles(spec))
+
+        assert len(resumed) == 3
+        assert resumed[0].to_dict() == first.to_dict()
+        assert [p.to_dict() for p in resumed] == [p.to_dict() for p in full]
+        assert len(journal.read_text().splitlines()) == 4
+
+    def test_truncated_last_line_is_discarded(self, spec, tmp_path):
+        """A partial entry from a crash mid-write is dropped and regenerated."""
+        journal = tmp_path / "puzzles.jsonl"
+        stream = iter_puzzles(spec, journal)
+        next(stream)
+        stream.close()
+        with open(journal, "a") as f:
+            f.write('{"index": 1, "puzz')
+
+        puzzles = list(iter_puzzles(spec, journal))
+
+        assert len(puzzles) == 3
+        for line in journal.read_text().splitlines():
+            json.loads(line)
+
+    def test_smaller_count_keeps_later_puzzles(self, spec, tmp_path):
+        """Shrinking the count and growing it again reuses every puzzle."""
+        journal = tmp_path / "puzzles.jsonl"
+        full = list(iter_puzzles(spec, journal))
+        lines = journal.read_text()
+
+        shrunk = list(iter_puzzles(replace(spec, count=1), journal))
+        assert [p.to_dict() for p in shrunk] == [full[0].to_dict()]
+        assert journal.read_text() == lines
+
+        regrown = list(iter_puzzles(spec, journal))
+        assert [p.to_dict() for p in regrown] == [p.to_dict() for p in full]
+        assert journal.read_text() == lines
+
+    def test_failed_position_retried_on_resume(self, spec, tmp_path):
+        """A position that failed is generated again by the next run."""
+        journal = tmp_path / "puzzles.jsonl"
+        generate = stream._generate_one
+
+        def fail_second(spec, index, stats):
+            if index == 1:
+                raise RuntimeError("transient failure")
+            return generate(spec, index, stats)
+
+        with patch.object(stream, "_generate_one", side_effect=fail_second):
+            assert len(list(iter_puzzles(spec, journal))) == 2
+
+        resumed = list(iter_puzzles(spec, journal))
+
+        assert len(resumed) == 3
+        entries = [json.loads(line) for line in journal.read_text().splitlines()]
+        assert [e["index"] for e in entries[1:]] == [0, 1, 2, 1]
+        assert "error" in entries[2] and "puzzle" in entries[4]
+        with patch.object(stream, "_generate_one", side_effect=AssertionError):
+            again = list(iter_puzzles(spec, journal))
+        assert [p.to_dict() for p in again] == [p.to_dict() for p in resumed]
+
+    def test_mismatched_spec_raises(self, spec, tmp_path):
+        """A journal from a different spec is not silently reused."""
+        journal = tmp_path / "puzzles.jsonl"
+        list(iter_puzzles(spec, journal))
+
+        other = GenerationSpec(difficulty="expert", count=3, grid_sizes=(5, 6))
+        with pytest.raises(JournalMismatchError):
+            list(iter_puzzles(other, journal))